@@ -0,0 +1,132 @@
+# File: analytics.py
+# Sessions averaged by the rolling score line
+ROLLING_WINDOW = 5
+# A gap longer than this between two answers is a break, not time spent on a question
+MAX_ANSWER_SECONDS = 600
+# Questions answered fewer times than this are left out of the miss-rate ranking
+MIN_ATTEMPTS = 3
+TOP_MISSED = 10
+UNTAGGED = '(no topic)'
+
+
+def rolling_mean(values, window=ROLLING_WINDOW):
+    """Mean of each value and the window - 1 before it (shorter at the start)."""
+    import numpy as np
+    values = np.asarray(values, dtype=np.float64)
+    if not values.size:
+        return values
+    sums = np.cumsum(values)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts = np.minimum(np.arange(1, values.size + 1), window)
+    return sums / counts
+
+
+def compute(rows, scores, topics_by_id=None):
+    """
+    Statistics over the whole answer history, vectorized with NumPy.
+    `rows` are (session_id, ts, correct, question_id) tuples
+    (ProgressRepository.attempt_rows), `scores` the finished sessions' scores,
+    oldest first, and `topics_by_id` maps question ids to topics. Returns a dict
+    of plain Python values: attempts, accuracy, scores, rolling,
+    seconds_per_question, topics (topic, attempts, accuracy, mean seconds;
+    weakest first) and missed (question id, attempts, miss rate; worst first).
+    """
+    import numpy as np
+    topics_by_id = topics_by_id or {}
+    n = len(rows)
+    score_values = np.asarray(scores, dtype=np.float64)
+    stats = {'attempts': n, 'scores': score_values.tolist(),
+             'rolling': rolling_mean(score_values).round(1).tolist(),
+             'accuracy': 0.0, 'seconds_per_question': None, 'topics': [], 'missed': []}
+    if not n:
+        return stats
+
+    sessions, times, outcomes, qids = zip(*rows)
+    # Dictionary-encode question ids to small ints (much faster than np.unique on strings)
+    question_codes = {}
+    question_idx = np.fromiter((question_codes.setdefault(q, len(question_codes)) for q in qids), dtype=np.int64, count=n)
+    question_ids = list(question_codes)
+    topic_codes = {}
+    question_topic = np.fromiter((topic_codes.setdefault(topics_by_id.get(q) or UNTAGGED, len(topic_codes))
+                                  for q in question_ids), dtype=np.int64, count=len(question_ids))
+    topics = list(topic_codes)
+
+    session = np.array([-1 if sid is None else sid for sid in sessions], dtype=np.int64)
+    ts = np.array(times, dtype=np.float64)
+    order = np.lexsort((ts, session))
+    session, ts, question_idx = session[order], ts[order], question_idx[order]
+    correct = np.array(outcomes, dtype=np.float64)[order]
+    topic_idx = question_topic[question_idx]
+    stats['accuracy'] = round(float(correct.mean()) * 100, 1)
+
+    # Time spent on an answer: the gap since the previous answer of the same session
+    seconds = np.full(n, np.nan)
+    gaps = np.diff(ts)
+    timed = (session[1:] == session[:-1]) & (gaps > 0) & (gaps <= MAX_ANSWER_SECONDS)
+    seconds[1:][timed] = gaps[timed]
+    has_time = ~np.isnan(seconds)
+    if has_time.any():
+        stats['seconds_per_question'] = round(float(np.median(seconds[has_time])), 1)
+
+    n_topics = len(topics)
+    topic_attempts = np.bincount(topic_idx, minlength=n_topics)
+    topic_correct = np.bincount(topic_idx, weights=correct, minlength=n_topics)
+    timed_count = np.bincount(topic_idx[has_time], minlength=n_topics)
+    timed_sum = np.bincount(topic_idx[has_time], weights=seconds[has_time], minlength=n_topics)
+    accuracy = topic_correct / topic_attempts * 100
+    for t in np.argsort(accuracy, kind='stable'):
+        mean_s = round(float(timed_sum[t] / timed_count[t]), 1) if timed_count[t] else None
+        stats['topics'].append((topics[t], int(topic_attempts[t]), round(float(accuracy[t]), 1), mean_s))
+
+    q_attempts = np.bincount(question_idx, minlength=len(question_ids))
+    q_misses = q_attempts - np.bincount(question_idx, weights=correct, minlength=len(question_ids))
+    miss_rate = np.where(q_attempts >= MIN_ATTEMPTS, q_misses / np.maximum(q_attempts, 1), -1.0)
+    ranked = np.lexsort((-q_attempts, -miss_rate))[:TOP_MISSED]
+    stats['missed'] = [(question_ids[q], int(q_attempts[q]), round(float(miss_rate[q]) * 100, 1))
+                       for q in ranked if miss_rate[q] > 0]
+    return stats
+
+
+def render_chart(stats, width, height, dpi=100):
+    """
+    Draws the score trend and per-topic accuracy off-screen with Matplotlib's Agg
+    canvas (no pyplot, so it is safe on a worker thread). Returns (width, height,
+    RGBA bytes) with the first row at the top, or None without Matplotlib or data.
+    """
+    if not stats['scores'] and not stats['topics']:
+        return None
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+    except ImportError:
+        return None
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi, facecolor='#1e1e1e')
+    canvas = FigureCanvasAgg(fig)
+    top, bottom = fig.subplots(2, 1, gridspec_kw={'height_ratios': [1, 1.3]})
+    for ax in (top, bottom):
+        ax.set_facecolor('#1e1e1e')
+        ax.tick_params(colors='#cccccc', labelsize=8)
+        for spine in ax.spines.values():
+            spine.set_color('#555555')
+
+    x = range(1, len(stats['scores']) + 1)
+    top.plot(x, stats['scores'], 'o', color='#6cb4ff', markersize=3, alpha=0.6, label='score')
+    top.plot(x, stats['rolling'], '-', color='#ffd479', linewidth=2, label=f'{ROLLING_WINDOW}-quiz average')
+    top.axhline(70, color='#66bb6a', linestyle='--', linewidth=1)
+    top.set_ylim(0, 100)
+    top.set_title('Score per quiz', color='white', fontsize=10)
+    top.legend(fontsize=8, facecolor='#1e1e1e', labelcolor='white', loc='lower right')
+
+    shown = stats['topics'][:12]
+    names = [name if len(name) <= 24 else name[:23] + '…' for name, _, _, _ in shown]
+    values = [acc for _, _, acc, _ in shown]
+    bottom.barh(range(len(shown)), values, color=['#66bb6a' if v >= 70 else '#ef5350' for v in values])
+    bottom.set_yticks(range(len(shown)), names)
+    bottom.invert_yaxis()
+    bottom.set_xlim(0, 100)
+    bottom.set_title('Accuracy by topic (weakest first)', color='white', fontsize=10)
+    fig.tight_layout()
+
+    canvas.draw()
+    w, h = canvas.get_width_height()
+    return w, h, bytes(canvas.buffer_rgba())
@@ -0,0 +1,152 @@
+# File: analytics_screen.py
+import threading
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.image import Image as KivyImage
+from kivy.uix.scrollview import ScrollView
+from kivy.graphics.texture import Texture
+from kivy.core.window import Window
+from kivy.clock import mainthread
+from progress_db import get_repository
+from explanation_markup import escape
+import analytics
+
+# Widest chart rendered, in pixels
+MAX_CHART_WIDTH = 1400
+
+# Last computed statistics and chart, reused until new answers or sessions are stored
+_cache = {}
+
+
+class AnalyticsScreen(Screen):
+    """
+    Trends over the whole answer history: score per quiz with a rolling average,
+    accuracy and answer time per topic, and the most missed questions.
+    The last result is shown at once; a worker thread then checks the repository's
+    analytics_version() and recomputes the statistics and the chart only when it changed.
+    """
+    _loading = False
+
+    def on_enter(self):
+        self._build()
+        if _cache:
+            self._show()
+        else:
+            self.summary_label.text = "Crunching your answer history..."
+        if not self._loading:
+            self._loading = True
+            threading.Thread(target=self._compute, args=(get_repository(), self._chart_size()),
+                             name='analytics', daemon=True).start()
+
+    @staticmethod
+    def _chart_size():
+        width = int(min(Window.width - 40, MAX_CHART_WIDTH))
+        return width, int(width * 0.9)
+
+    def _build(self):
+        self.clear_widgets()
+        layout = BoxLayout(orientation='vertical', spacing=8, padding=[16, 16, 16, 12])
+        layout.add_widget(Label(text="Analytics", font_size=22, size_hint_y=None, height=40))
+        scroll = ScrollView(size_hint=(1, 1), bar_width=8)
+        self.body = BoxLayout(orientation='vertical', spacing=12, size_hint_y=None)
+        self.body.bind(minimum_height=self.body.setter('height'))
+        self.summary_label = self._text_label()
+        self.body.add_widget(self.summary_label)
+        self.chart = KivyImage(size_hint=(1, None), height=0)
+        self.body.add_widget(self.chart)
+        self.topics_label = self._text_label()
+        self.body.add_widget(self.topics_label)
+        self.missed_label = self._text_label()
+        self.body.add_widget(self.missed_label)
+        scroll.add_widget(self.body)
+        layout.add_widget(scroll)
+
+        btn_back = Button(text="Back to History", size_hint=(1, None), height=56)
+        btn_back.bind(on_press=self.goto_history)
+        layout.add_widget(btn_back)
+        self.add_widget(layout)
+
+    @staticmethod
+    def _text_label():
+        label = Label(font_size=16, markup=True, halign='left', valign='top', size_hint_y=None)
+        label.bind(width=lambda inst, w: setattr(inst, 'text_size', (w, None)),
+                   texture_size=lambda inst, size: setattr(inst, 'height', size[1]))
+        return label
+
+    def _compute(self, repo, size):
+        try:
+            version = repo.analytics_version()
+            if _cache.get('version') == version and _cache.get('size') == size:
+                self._ready(None)
+                return
+            stats = analytics.compute(repo.attempt_rows(), repo.session_scores(), repo.question_topics())
+            texts = repo.question_texts(qid for qid, _, _ in stats['missed'])
+            chart = analytics.render_chart(stats, *size)
+        except ImportError:
+            self._failed("Analytics need NumPy (pip install numpy).")
+            return
+        except Exception as e:
+            print(f"Error computing analytics: {e}")
+            self._failed("Analytics are not available right now.")
+            return
+        self._ready(dict(version=version, size=size, stats=stats, texts=texts, chart=chart))
+
+    @mainthread
+    def _failed(self, message):
+        self._loading = False
+        if not _cache:
+            self.summary_label.text = message
+
+    @mainthread
+    def _ready(self, result):
+        """Stores a new result (None = the cached one is current) and shows it."""
+        self._loading = False
+        if result is None:
+            return
+        texture = None
+        chart = result.pop('chart')
+        if chart is not None:
+            w, h, pixels = chart
+            texture = Texture.create(size=(w, h), colorfmt='rgba')
+            texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+            texture.flip_vertical()  # Matplotlib's first row is the top one
+        _cache.clear()
+        _cache.update(result, texture=texture)
+        if self.manager is not None and self.manager.current == self.name:
+            self._show()
+
+    def _show(self):
+        stats, texts, texture = _cache['stats'], _cache['texts'], _cache['texture']
+        if not stats['attempts']:
+            self.summary_label.text = "No answers recorded yet. Complete a quiz to see your trends."
+            return
+        lines = [f"[b]{stats['attempts']}[/b] answers, [b]{stats['accuracy']}%[/b] correct "
+                 f"over [b]{len(stats['scores'])}[/b] finished quizzes"]
+        if stats['rolling']:
+            lines.append(f"Average of the last {analytics.ROLLING_WINDOW} quizzes: [b]{stats['rolling'][-1]}%[/b]")
+        if stats['seconds_per_question'] is not None:
+            lines.append(f"Median time per question: [b]{stats['seconds_per_question']} s[/b]")
+        self.summary_label.text = '\n'.join(lines)
+
+        if texture is not None:
+            self.chart.texture = texture
+            self.chart.height = texture.height * self.chart.width / max(texture.width, 1) if self.chart.width > 1 else texture.height
+
+        topic_lines = ["[b]Topics (weakest first)[/b]"]
+        for name, attempts, accuracy, seconds in stats['topics']:
+            timing = f", {seconds} s each" if seconds is not None else ""
+            topic_lines.append(f"{escape(name)}: {accuracy}% of {attempts}{timing}")
+        self.topics_label.text = '\n'.join(topic_lines)
+
+        missed_lines = ["[b]Most missed questions[/b]"] if stats['missed'] else []
+        for qid, attempts, rate in stats['missed']:
+            text = ' '.join(str(texts.get(qid) or qid).split())
+            if len(text) > 90:
+                text = text[:89] + '…'
+            missed_lines.append(f"{rate}% of {attempts}: {escape(text)}")
+        self.missed_label.text = '\n'.join(missed_lines)
+
+    def goto_history(self, instance):
+        self.manager.current = 'history_screen'
@@ -0,0 +1,115 @@
+# File: answer_keys.py
+from array import array
+from collections import namedtuple
+from utils import normalize_mc_answer_to_letters, format_correct_answer
+
+# kind: MULTIPLE_CHOICE or YES_NO
+# code: integer the user's selection code must equal (-1 = no selection can match)
+# groups: number of Yes/No groups (0 for multiple choice)
+# display: the "Correct answer(s)" text shown after a wrong answer
+AnswerKey = namedtuple('AnswerKey', 'kind code groups display')
+
+MULTIPLE_CHOICE = 0
+YES_NO = 1
+
+
+def _correct_list(q):
+    correct = q.get('answer') or q.get('answers')
+    return correct if isinstance(correct, list) else [correct]
+
+
+def is_yes_no_multi(options, correct):
+    """True when the options are just Yes/No and several positions are expected."""
+    options_lower = [str(o).strip().lower() for o in options]
+    return len(options_lower) == 2 and sorted(options_lower) == ['no', 'yes'] and len(correct) > 1
+
+
+def _letters_mask(letters):
+    mask = 0
+    for L in letters:
+        mask |= 1 << (ord(L) - 65)
+    return mask
+
+
+def compile_answer_key(q):
+    """
+    Normalizes a question's answer once into an AnswerKey.
+    Multiple choice: a bitmask of correct letters (bit 0 = A).
+    Yes/No multi: for n groups, (answered bits << n) | yes bits, so an unanswered
+    group can never match.
+    """
+    options = q.get('options', [])
+    correct = _correct_list(q)
+
+    if is_yes_no_multi(options, correct):
+        n = len(correct)
+        norm = [str(c).strip().lower() for c in correct]
+        if all(c in ('yes', 'no') for c in norm):
+            yes = sum(1 << i for i, c in enumerate(norm) if c == 'yes')
+            code = (((1 << n) - 1) << n) | yes
+        else:
+            code = -1
+        return AnswerKey(YES_NO, code, n, ', '.join(str(c) for c in correct))
+
+    letters = normalize_mc_answer_to_letters(options, correct)
+    if letters:
+        return AnswerKey(MULTIPLE_CHOICE, _letters_mask(letters), 0, format_correct_answer(options, letters))
+
+    # Fallback (same as is_mc_selection_correct): compare by exact option text
+    correct_set = set(correct)
+    text_to_letter = {opt: chr(65 + i) for i, opt in enumerate(options)}
+    if correct_set and all(c in text_to_letter for c in correct_set):
+        code = _letters_mask(text_to_letter[c] for c in correct_set)
+    else:
+        code = -1
+    tmp_letters = normalize_mc_answer_to_letters(options, list(correct_set))
+    display = format_correct_answer(options, tmp_letters) if tmp_letters else ", ".join(str(c) for c in correct_set)
+    return AnswerKey(MULTIPLE_CHOICE, code, 0, display)
+
+
+def selection_code(key, selection):
+    """
+    Encodes a user's selection the same way as the key: a set of letters for
+    multiple choice, or the list of chosen 'Yes'/'No' texts ('' = none) per group.
+    """
+    if key.kind == YES_NO:
+        n = key.groups
+        answered = yes = 0
+        for i, choice in enumerate(list(selection)[:n]):
+            choice = str(choice).strip().lower()
+            if choice in ('yes', 'no'):
+                answered |= 1 << i
+                if choice == 'yes':
+                    yes |= 1 << i
+        return (answered << n) | yes
+    return _letters_mask(selection)
+
+
+def grade(key, code):
+    """Grades one encoded selection: a single integer compare."""
+    return key.code == code
+
+
+def key_code_array(keys):
+    """Packs the codes of `keys`, in order, into an int64 array (built once per bank for grade_many)."""
+    return array('q', (key.code for key in keys))
+
+
+def grade_many(key_codes, rows, codes):
+    """
+    Grades a whole session at once. `key_codes` is a bank's int64 code array,
+    `rows` the positions of the session's questions in it and `codes` the encoded
+    selections in the same order. Uses one vectorized NumPy compare (a plain loop
+    without NumPy); returns a list of booleans.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return [key_codes[row] == code for row, code in zip(rows, codes)]
+    expected = np.frombuffer(key_codes, dtype=np.int64)[np.asarray(rows, dtype=np.intp)]
+    return (expected == np.asarray(codes, dtype=np.int64)).tolist()
+
+
+def compile_answer_keys(questions):
+    """Returns {question id: AnswerKey} for a list of id-stamped questions."""
+    return {q['id']: compile_answer_key(q) for q in questions}
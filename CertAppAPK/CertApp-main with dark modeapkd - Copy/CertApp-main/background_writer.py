@@ -0,0 +1,83 @@
+# File: background_writer.py
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class BackgroundWriter:
+    """
+    Runs save jobs on one daemon thread so the UI never waits on flash I/O.
+    Jobs are keyed (usually by file path): submitting a key that is still queued
+    replaces the queued job, so a burst of saves to the same file is written once,
+    with the latest data.
+    """
+
+    def __init__(self, name='background-writer'):
+        self.name = name
+        self._jobs = OrderedDict()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._thread = None
+
+    def submit(self, key, job):
+        """Queues `job()` under `key`, replacing a queued job with the same key."""
+        with self._cond:
+            self._jobs.pop(key, None)
+            self._jobs[key] = job
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def save_json(self, path, data):
+        """
+        Writes `data` to `path` atomically in the background. The object is
+        serialized on the writer thread, so pass data the caller will not mutate.
+        """
+        from utils import save_json
+        self.submit(('json', os.path.abspath(path)), lambda: save_json(path, data))
+
+    def pending(self):
+        with self._cond:
+            return len(self._jobs) + (1 if self._busy else 0)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._jobs:
+                    self._cond.wait()
+                key, job = self._jobs.popitem(last=False)
+                self._busy = True
+            try:
+                job()
+            except Exception as e:
+                print(f"Error in background write {key!r}: {e}")
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Waits until every queued job has run. Returns False if `timeout` seconds
+        passed first (the remaining jobs keep running in the background).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._jobs or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+
+_writer = None
+
+
+def get_writer():
+    """Returns the app-wide background writer."""
+    global _writer
+    if _writer is None:
+        _writer = BackgroundWriter()
+    return _writer
@@ -0,0 +1,137 @@
+# File: bank_catalog.py
+import json
+import os
+from utils import get_storage_path, scan_topics
+from question_bank import file_digest
+from background_writer import get_writer
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Folders searched for question banks, in order of preference for duplicate copies
+BANK_DIRS = (os.path.join(APP_DIR, 'data'), os.path.join(APP_DIR, 'questions'))
+MANIFEST_FILE = 'bank_manifest.json'
+# Bump whenever the entry layout changes so old manifests are rebuilt.
+MANIFEST_VERSION = 2
+
+
+def _bank_title(path):
+    return os.path.splitext(os.path.basename(path))[0].upper()
+
+
+def build_entry(path, st=None, digest=None):
+    """
+    Scans one bank file into a manifest entry: title, question count, SHA-1 and
+    its topics as {'name', 'count'}.
+    """
+    st = st or os.stat(path)
+    topics = scan_topics(path)
+    return {
+        'path': path,
+        'title': _bank_title(path),
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha1': digest or file_digest(path),
+        'count': sum(count for _, count in topics),
+        'topics': [{'name': name, 'count': count} for name, count in topics],
+    }
+
+
+class BankCatalog:
+    """
+    Index of the question banks found in BANK_DIRS, kept in a small JSON manifest.
+    refresh() only stats the files: an entry is rebuilt when its file's size or
+    mtime changed (and only rescanned when its content hash changed too), so
+    listing banks never reads their questions. Identical copies of a bank are
+    listed once, and a bank's id is its content SHA-1: progress and checkpoints
+    are keyed by it, so same-named files in different folders stay apart.
+    """
+
+    def __init__(self, dirs=BANK_DIRS, manifest_path=None):
+        self.dirs = tuple(dirs)
+        self.manifest_path = manifest_path or get_storage_path(MANIFEST_FILE)
+        self._entries = self._load_manifest()
+        self.banks = []
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Ignoring unreadable bank manifest '{self.manifest_path}': {e}")
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('banks', {})
+
+    def _bank_files(self):
+        for d in self.dirs:
+            try:
+                names = sorted(os.listdir(d))
+            except OSError:
+                continue
+            for name in names:
+                if name.lower().endswith('.json'):
+                    yield os.path.join(d, name)
+
+    def refresh(self):
+        """Brings the manifest up to date and returns the bank list (sorted by title)."""
+        entries = {}
+        changed = False
+        for path in self._bank_files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entry = self._entries.get(path)
+            if entry is None or entry['size'] != st.st_size or entry['mtime_ns'] != st.st_mtime_ns:
+                changed = True
+                try:
+                    digest = file_digest(path)
+                    if entry is not None and entry['sha1'] == digest:
+                        entry = dict(entry, size=st.st_size, mtime_ns=st.st_mtime_ns)  # touched, not changed
+                    else:
+                        entry = build_entry(path, st, digest)
+                except Exception as e:
+                    print(f"Error indexing question bank '{path}': {e}")
+                    continue
+            entries[path] = entry
+        changed = changed or entries.keys() != self._entries.keys()
+        self._entries = entries
+        if changed:
+            get_writer().save_json(self.manifest_path, {'version': MANIFEST_VERSION, 'banks': dict(entries)})
+
+        banks, seen = [], set()
+        for path, entry in entries.items():
+            if entry['sha1'] in seen or not entry['count']:
+                continue
+            seen.add(entry['sha1'])
+            banks.append(dict(entry, id=entry['sha1']))
+        banks.sort(key=lambda b: b['title'])
+        self.banks = banks
+        return banks
+
+    def get(self, bank_id):
+        for bank in self.banks:
+            if bank['id'] == bank_id:
+                return bank
+        return None
+
+    def bank_id(self, path):
+        """The id of a bank file: its SHA-1 from the manifest while the file is unchanged, else hashed."""
+        entry = self._entries.get(path)
+        st = os.stat(path)
+        if entry is not None and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry['sha1']
+        return file_digest(path)
+
+
+_catalog = None
+
+
+def get_catalog():
+    """Returns the app-wide catalog (refresh() it before listing banks)."""
+    global _catalog
+    if _catalog is None:
+        _catalog = BankCatalog()
+    return _catalog
@@ -0,0 +1,49 @@
+# File: bank_picker_screen.py
+from functools import partial
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from bank_catalog import get_catalog
+
+
+class BankPickerScreen(Screen):
+    """
+    Lists the exams found by the bank catalog (title, question and topic counts
+    come from its manifest, so no bank is opened here). Picking one starts a quiz on it.
+    """
+
+    def on_enter(self):
+        banks = get_catalog().refresh()
+
+        self.clear_widgets()
+        layout = BoxLayout(orientation='vertical', spacing=10, padding=20)
+        layout.add_widget(Label(text="Choose an Exam", font_size=22, size_hint_y=None, height=48))
+
+        if not banks:
+            layout.add_widget(Label(text="No question banks found in data/ or questions/.", font_size=18))
+        else:
+            rv = RecycleView(size_hint=(1, 1), bar_width=8)
+            rv.viewclass = 'Button'
+            box = RecycleBoxLayout(orientation='vertical', default_size=(None, 64), default_size_hint=(1, None), size_hint_y=None, spacing=8)
+            box.bind(minimum_height=box.setter('height'))
+            rv.add_widget(box)
+            rv.data = [{'text': f"{b['title']}  -  {b['count']} questions, {len(b['topics'])} topic(s)",
+                        'font_size': 18, 'on_release': partial(self.pick, b)} for b in banks]
+            layout.add_widget(rv)
+
+        btn_back = Button(text="Back to Quiz", size_hint=(1, None), height=56)
+        btn_back.bind(on_press=self.goto_quiz)
+        layout.add_widget(btn_back)
+        self.add_widget(layout)
+
+    def pick(self, bank, *args):
+        """Starts the quiz screen on the chosen bank."""
+        quiz = self.manager.get_screen('quiz_screen')
+        quiz.bank_path = bank['path']
+        self.manager.current = 'quiz_screen'
+
+    def goto_quiz(self, instance):
+        self.manager.current = 'quiz_screen'
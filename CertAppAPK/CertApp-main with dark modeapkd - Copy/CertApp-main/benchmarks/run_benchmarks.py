@@ -0,0 +1,252 @@
+# File: benchmarks/run_benchmarks.py
+"""
+Times the app's hot paths on synthetic banks and writes the results as JSON.
+
+    python benchmarks/run_benchmarks.py                       # 1k and 10k questions
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --history 5000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<older>.json
+
+Everything runs inside a temporary directory, so the app's real storage is never
+touched. Widget benchmarks use Kivy's mock GL backend; pass --no-render to skip them.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# get_storage_path imports kivy.app, so Kivy must be configured before anything loads it
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from benchmarks.synthetic import write_bank, fill_history, legacy_history  # noqa: E402
+
+RESULTS_DIR = os.path.join(APP_DIR, 'benchmarks', 'results')
+
+
+def timeit(fn, repeat=5):
+    """Runs fn() once to warm up, then `repeat` times; returns (best, median) wall seconds."""
+    fn()
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return min(runs), statistics.median(runs)
+
+
+class Suite:
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = []
+
+    def bench(self, name, n, fn, repeat=None):
+        best, median = timeit(fn, repeat or self.repeat)
+        self.results.append({"name": name, "n": n, "best_s": round(best, 6), "median_s": round(median, 6)})
+        print(f"  {name:<28} n={n:<7} best {best * 1000:9.2f} ms   median {median * 1000:9.2f} ms")
+
+
+def bench_bank(suite, n, workdir):
+    from utils import load_json, normalize_mc_answer_to_letters, save_json
+    from question_bank import compile_bank, cached_bank, clear_memory_cache
+    from answer_keys import compile_answer_keys, grade, grade_many
+    from scheduler import Scheduler
+
+    path = write_bank(os.path.join(workdir, f'bank-{n}.json'), n)
+    suite.bench('load_json', n, lambda: load_json(path))
+    suite.bench('compile_bank', n, lambda: compile_bank(path))
+
+    def cold_cache():
+        clear_memory_cache()
+        cached_bank(path)
+    suite.bench('cached_bank (disk)', n, cold_cache)
+
+    questions = load_json(path)
+    suite.bench('normalize_mc_answer', n,
+                lambda: [normalize_mc_answer_to_letters(q['options'], q['answer']) for q in questions])
+    keys = compile_answer_keys(questions)
+    suite.bench('compile_answer_keys', n, lambda: compile_answer_keys(questions))
+    pairs = [(keys[q['id']], keys[q['id']].code) for q in questions]
+    suite.bench('grade', n, lambda: [grade(key, code) for key, code in pairs])
+    bank = cached_bank(path)
+    rows, codes = list(range(len(bank))), list(bank.key_codes)
+    suite.bench('grade_many', n, lambda: grade_many(bank.key_codes, rows, codes))
+    suite.bench('scheduler next_batch(50)', n, lambda: Scheduler(questions).next_batch(50))
+    from search_index import SearchIndex
+    index = SearchIndex.build(questions)
+    suite.bench('search index build', n, lambda: SearchIndex.build(questions), repeat=1)
+    suite.bench('search "sentinel autom"', n, lambda: index.search('sentinel autom'))
+    # JSON-era persistence: rewriting asked_questions.json after every answer
+    suite.bench('save_json asked_questions', n, lambda: save_json(os.path.join(workdir, 'asked.json'), questions))
+    return questions
+
+
+def bench_persistence(suite, questions, sessions, workdir):
+    from progress_db import ProgressRepository
+    from quiz_session import QuizSession
+    from scheduler import Scheduler
+    from utils import save_json
+
+    repo = ProgressRepository(os.path.join(workdir, f'progress-{len(questions)}.db'))
+    t0 = time.perf_counter()
+    fill_history(repo, questions, sessions)
+    print(f"  (filled {sessions} past sessions in {time.perf_counter() - t0:.2f} s)")
+    n = len(questions)
+    suite.bench('question_stats', n, repo.question_stats)
+    suite.bench('recent_sessions(10)', sessions, lambda: repo.recent_sessions(10))
+
+    def play_session():
+        session = QuizSession(Scheduler(questions, repo.question_stats()), limit=50, repo=repo, bank_name='synthetic')
+        while not session.finished:
+            session.submit(session.answer_key().code)
+            session.advance()
+        session.finish()
+    suite.bench('quiz session (50, persisted)', n, play_session, repeat=3)
+
+    # JSON-era show_result: rewriting the whole score history per finished quiz
+    history = legacy_history(sessions)
+    suite.bench('score history rewrite', sessions, lambda: save_json(os.path.join(workdir, 'history.json'), history))
+    bench_analytics(suite, repo)
+    repo.close()
+
+
+def bench_analytics(suite, repo):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("  (analytics benchmarks skipped: NumPy is not installed)")
+        return
+    import analytics
+    rows = repo.attempt_rows()
+    scores, topics = repo.session_scores(), repo.question_topics()
+    # Opening the analytics screen with a warm cache costs only this query
+    suite.bench('analytics_version', len(rows), repo.analytics_version)
+    suite.bench('analytics fetch', len(rows), repo.attempt_rows, repeat=3)
+    suite.bench('analytics compute', len(rows), lambda: analytics.compute(rows, scores, topics), repeat=3)
+
+
+def bench_render(suite, questions):
+    try:
+        from kivy.core.window import Window  # noqa: F401  (creates the mock window)
+        from question_view import QuestionView, ResultView
+        from answer_keys import compile_answer_key, YES_NO
+    except Exception as e:
+        print(f"  (render benchmarks skipped: {e})")
+        return
+    noop = lambda *a: None
+    sample = questions[:200]
+    keys = [compile_answer_key(q) for q in sample]
+    suite.bench('QuestionView build', 1, lambda: QuestionView(on_submit=noop, on_exit=noop))
+    view = QuestionView(on_submit=noop, on_exit=noop)
+
+    def show_all():
+        for i, (q, key) in enumerate(zip(sample, keys)):
+            view.show(q, i, len(sample), key.kind == YES_NO, key.groups)
+    suite.bench('QuestionView.show', len(sample), show_all)
+    suite.bench('ResultView build', 1, lambda: ResultView(on_history=noop, on_restart=noop, on_exit=noop))
+
+
+def bench_resources(suite, workdir, n=200):
+    try:
+        from PIL import Image as PILImage
+    except ImportError:
+        print("  (resource benchmarks skipped: Pillow is not installed)")
+        return
+    import zipfile
+    from resource_bundle import ResourceBundle, build
+    src = os.path.join(workdir, 'Images')
+    os.makedirs(src, exist_ok=True)
+    names = [f"q{i}.png" for i in range(n)]
+    for i, name in enumerate(names):
+        PILImage.new('RGB', (400, 300), ((i * 37) % 256, 80, 160)).save(os.path.join(src, name))
+    zip_path = os.path.join(workdir, 'Images.zip')
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        for name in names:
+            zf.write(os.path.join(src, name), name)
+    build(src, workdir, display_size=(720, 360))
+    bundle = ResourceBundle(os.path.join(workdir, 'Images.bundle'))
+
+    def read_zip():
+        for name in names:  # what a lookup per image costs: open the archive, find the member
+            with zipfile.ZipFile(zip_path) as zf:
+                zf.read(name)
+
+    def read_bundle():
+        for name in names:
+            bundle.read(bundle.resolve(name))
+    suite.bench('image read (zip)', n, read_zip)
+    suite.bench('image read (bundle)', n, read_bundle)
+    bundle.close()
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=APP_DIR, capture_output=True, text=True)
+        return out.stdout.strip() or 'unknown'
+    except OSError:
+        return 'unknown'
+
+
+def compare(old_path, results):
+    """Prints the best-run ratio new/old for every benchmark present in both runs."""
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = {(r['name'], r['n']): r for r in json.load(f)['results']}
+    print(f"\nCompared with {os.path.basename(old_path)} (ratio > 1 = slower):")
+    for r in results:
+        before = old.get((r['name'], r['n']))
+        if before and before['best_s'] > 0:
+            ratio = r['best_s'] / before['best_s']
+            flag = '  <-- regression' if ratio > 1.2 else ''
+            print(f"  {r['name']:<28} n={r['n']:<7} x{ratio:5.2f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='bank sizes (questions)')
+    parser.add_argument('--history', type=int, default=1000, help='past sessions to store')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-render', action='store_true', help='skip the Kivy widget benchmarks')
+    parser.add_argument('--out', help='result file (default: benchmarks/results/<date>-<commit>.json)')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    args = parser.parse_args(argv)
+
+    suite = Suite(args.repeat)
+    questions = []
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)  # get_storage_path falls back to ./storage without a running App
+        try:
+            for n in args.sizes:
+                print(f"Bank of {n} questions:")
+                questions = bench_bank(suite, n, workdir)
+                bench_persistence(suite, questions, args.history, workdir)
+            print("Resources:")
+            bench_resources(suite, workdir)
+            if not args.no_render and questions:
+                print("Widgets:")
+                bench_render(suite, questions)
+        finally:
+            os.chdir(cwd)
+
+    commit = git_commit()
+    report = {"commit": commit, "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+              "python": platform.python_version(), "platform": platform.platform(),
+              "sizes": args.sizes, "history": args.history, "results": suite.results}
+    out = args.out or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {out}")
+    if args.compare:
+        compare(args.compare, suite.results)
+
+
+if __name__ == '__main__':
+    main()
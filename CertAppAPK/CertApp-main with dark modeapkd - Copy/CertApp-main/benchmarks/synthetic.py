@@ -0,0 +1,101 @@
+# File: benchmarks/synthetic.py
+import json
+import os
+import random
+
+# Mix of item kinds found in real banks (weights sum to 1)
+KIND_WEIGHTS = (
+    ('multiple_choice', 0.55),
+    ('drag_and_drop', 0.20),
+    ('yes_no', 0.15),
+    ('image', 0.10),
+)
+IMAGE_PATH = 'Images/hotspot131.png'
+WORDS = ("alert incident workspace query table rule entity device analytics sentinel defender "
+         "playbook connector watchlist hunting signin identity policy automation endpoint").split()
+
+
+def _sentence(rng, n_words):
+    return ' '.join(rng.choice(WORDS) for _ in range(n_words)).capitalize()
+
+
+def _letters(indices):
+    return [chr(65 + i) for i in sorted(indices)]
+
+
+def make_question(rng, i, kind):
+    """One synthetic item of the given kind; `i` keeps question texts unique."""
+    stem = f"Q{i}: {_sentence(rng, rng.randint(12, 40))}?"
+    explanation = f"{_sentence(rng, rng.randint(20, 80))}.\nReference: https://example.com/docs/{i}"
+    if kind == 'yes_no':
+        n = rng.randint(2, 4)
+        return {"type": "multiple_choice", "question": stem, "options": ["Yes", "No"],
+                "answer": [rng.choice(("Yes", "No")) for _ in range(n)], "explanation": explanation}
+    if kind == 'drag_and_drop':
+        options = [f"| {_sentence(rng, rng.randint(2, 6)).lower()} {i}_{k}" for k in range(rng.randint(6, 10))]
+        # Drag and drop items give their answers as full option texts
+        answer = rng.sample(options, rng.randint(1, 3))
+        return {"type": "drag_and_drop", "question": stem, "options": options,
+                "answer": answer, "explanation": explanation}
+    n_opts = rng.randint(3, 6)
+    options = [_sentence(rng, rng.randint(3, 12)) for _ in range(n_opts)]
+    answer = _letters(rng.sample(range(n_opts), rng.randint(1, 2)))
+    if rng.random() < 0.3:
+        answer = [f"{a}:" for a in answer]  # letter+punctuation form
+    q = {"type": "multiple_choice", "question": stem, "options": options,
+         "answer": answer, "explanation": explanation}
+    if kind == 'image':
+        q["image"] = IMAGE_PATH
+    return q
+
+
+def generate_bank(n, seed=0, topics=10):
+    """Returns {topic: [questions]} with `n` questions in the KIND_WEIGHTS mix."""
+    rng = random.Random(seed)
+    kinds = [k for k, _ in KIND_WEIGHTS]
+    weights = [w for _, w in KIND_WEIGHTS]
+    bank = {f"Topic {t + 1}": [] for t in range(topics)}
+    names = list(bank)
+    for i in range(n):
+        bank[names[i % topics]].append(make_question(rng, i, rng.choices(kinds, weights)[0]))
+    return bank
+
+
+def write_bank(path, n, seed=0):
+    """Writes a synthetic bank to `path` and returns the path."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(generate_bank(n, seed), f, indent=2, ensure_ascii=False)
+    return path
+
+
+def fill_history(repo, questions, sessions, per_session=20, seed=0, start=1.6e9):
+    """
+    Plays `sessions` past quizzes into a ProgressRepository: random answers,
+    one session a day, so stats and the score history have a long tail.
+    """
+    rng = random.Random(seed)
+    ts = start
+    for _ in range(sessions):
+        sid = repo.start_session('synthetic', started=ts)
+        correct = 0
+        for q in rng.sample(questions, min(per_session, len(questions))):
+            ok = rng.random() < 0.7
+            correct += ok
+            ts += 30
+            repo.record_answer(sid, q, {"A"}, ok, ts=ts)
+        repo.finish_session(sid, correct, min(per_session, len(questions)), finished=ts)
+        ts += 86400
+    repo.flush()
+
+
+def legacy_history(entries, seed=0):
+    """A JSON-era score history list, as score_history.json stored it."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(entries):
+        total = rng.randint(5, 60)
+        correct = rng.randint(0, total)
+        rows.append({"date": f"2024-01-01 00:{i // 60 % 60:02d}:{i % 60:02d}",
+                     "correct": correct, "total": total, "score": int(correct / total * 100)})
+    return rows
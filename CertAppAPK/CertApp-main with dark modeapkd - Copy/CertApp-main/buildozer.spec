@@ -3,9 +3,10 @@ title = CertApp
 package.name = certapp
 package.domain = org.example
 source.dir = .
-source.include_exts = py,png,jpg,kv,json,zip
+source.include_exts = py,png,jpg,kv,json,zip,atlas,bundle
+source.exclude_dirs = tests, benchmarks
 version = 0.1
-requirements = python3==3.11.*,kivy
+requirements = python3==3.11.*,kivy,numpy,matplotlib
 orientation = portrait
 
 [buildozer]
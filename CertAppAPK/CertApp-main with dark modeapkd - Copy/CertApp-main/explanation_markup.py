@@ -0,0 +1,107 @@
+# File: explanation_markup.py
+import hashlib
+import re
+
+# Markup chunks are about this long so each Label texture stays small
+CHUNK_CHARS = 1500
+CODE_FONT = 'RobotoMono-Regular'
+CODE_COLOR = 'ffd479'
+LINK_COLOR = '6cb4ff'
+
+_URL_RE = re.compile(r'https?://[^\s<>\[\]]+')
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*|__(.+?)__')
+_ITALIC_RE = re.compile(r'(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])')
+_BULLET_RE = re.compile(r'^(\s*)[-*+]\s+')
+_NUMBERED_RE = re.compile(r'^(\s*)(\d+)[.)]\s+')
+_HEADING_RE = re.compile(r'^\s*#{1,6}\s+(.*)$')
+_CODE_RE = re.compile(r'`([^`]*)`')
+_PLACEHOLDER_RE = re.compile('\x00(\\d+)\x00')
+
+
+def escape(text):
+    """Escapes Kivy markup characters (same as kivy.utils.escape_markup)."""
+    return text.replace('&', '&amp;').replace('[', '&bl;').replace(']', '&br;')
+
+
+def _link(m):
+    url = m.group(0).rstrip('.,;:)')
+    rest = m.group(0)[len(url):]
+    return f"[ref={url}][color={LINK_COLOR}][u]{escape(url)}[/u][/color][/ref]{escape(rest)}"
+
+
+def _code(m):
+    return f"[font={CODE_FONT}][color={CODE_COLOR}]{escape(m.group(1))}[/color][/font]"
+
+
+def _emphasis(text):
+    text = _BOLD_RE.sub(lambda m: f"[b]{m.group(1) or m.group(2)}[/b]", text)
+    return _ITALIC_RE.sub(lambda m: f"[i]{m.group(1)}[/i]", text)
+
+
+def _line_markup(line):
+    heading = _HEADING_RE.match(line)
+    if heading:
+        return f"[b]{_line_markup(heading.group(1))}[/b]"
+    prefix = ''
+    m = _BULLET_RE.match(line)
+    if m:
+        prefix, line = f"{m.group(1)}  • ", line[m.end():]
+    else:
+        m = _NUMBERED_RE.match(line)
+        if m:
+            prefix, line = f"{m.group(1)}  {m.group(2)}. ", line[m.end():]
+    # Code spans and links are swapped for placeholders first, so their text is
+    # never read as emphasis, while ** around them still works.
+    spans = []
+
+    def keep(markup):
+        spans.append(markup)
+        return f"\x00{len(spans) - 1}\x00"
+    line = _CODE_RE.sub(lambda m: keep(_code(m)), line)
+    line = _URL_RE.sub(lambda m: keep(_link(m)), line)
+    line = _emphasis(escape(line))
+    return prefix + _PLACEHOLDER_RE.sub(lambda m: spans[int(m.group(1))], line)
+
+
+def to_markup(text):
+    """
+    Converts an explanation's Markdown subset (bold, italic, `code`, bullet and
+    numbered lists, headings) and bare URLs to Kivy markup. Every tag opened on a
+    line is closed on the same line, so the result can be split between lines.
+    """
+    return '\n'.join(_line_markup(line) for line in str(text or '').replace('\r\n', '\n').split('\n'))
+
+
+def split_chunks(markup, max_chars=CHUNK_CHARS):
+    """Splits markup into pieces of about max_chars, only between lines."""
+    chunks, current, size = [], [], 0
+    for line in markup.split('\n'):
+        if current and size + len(line) > max_chars:
+            chunks.append('\n'.join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+def content_key(text):
+    """Cache key of an explanation: a short hash of its text."""
+    return hashlib.sha1(str(text or '').encode('utf-8')).hexdigest()[:16]
+
+
+def compile_explanation(text):
+    """Prepared markup chunks of one explanation."""
+    return tuple(split_chunks(to_markup(text)))
+
+
+def compile_explanations(questions):
+    """{content key: markup chunks} for every distinct explanation in a bank."""
+    compiled = {}
+    for q in questions:
+        text = q.get('explanation') or ''
+        key = content_key(text)
+        if key not in compiled:
+            compiled[key] = compile_explanation(text)
+    return compiled
@@ -6,25 +6,20 @@ from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.popup import Popup
 import os
-from utils import load_json, get_storage_path
+from utils import get_storage_path
+from progress_db import get_repository
 
 class HistoryScreen(Screen):
     """
     Screen to display the user's quiz attempt history.
-    Loads from score_history.json and displays the last 10 valid attempts.
+    Reads the progress database and displays the last 10 valid attempts.
     """
 
     def on_enter(self):
         """
-        Loads history from JSON and displays recent attempts.
+        Queries the newest finished sessions and displays them.
         """
-        history = load_json(get_storage_path('score_history.json'))
-        if not isinstance(history, list):
-            history = []
-
-        # Filter out bogus zero-attempts, show most recent first
-        valid_history = [h for h in history if h.get('total', 0) > 0]
-        recent = valid_history[-10:][::-1]  # Last 10, newest first
+        recent = get_repository().recent_sessions(10)  # Last 10 valid attempts, newest first
 
         self.clear_widgets()
         layout = BoxLayout(orientation='vertical', spacing=10, padding=20)
@@ -42,6 +37,14 @@ class HistoryScreen(Screen):
         btn_reset.bind(on_press=self.reset_learned_questions)
         layout.add_widget(btn_reset)
 
+        btn_stats = Button(text="Analytics", size_hint=(1, 0.15))
+        btn_stats.bind(on_press=self.goto_analytics)
+        layout.add_widget(btn_stats)
+
+        btn_perf = Button(text="Performance", size_hint=(1, 0.15))
+        btn_perf.bind(on_press=self.goto_performance)
+        layout.add_widget(btn_perf)
+
         btn_quiz = Button(text="Back to Quiz", size_hint=(1, 0.15))
         btn_quiz.bind(on_press=self.goto_quiz)
         layout.add_widget(btn_quiz)
@@ -54,9 +57,25 @@ class HistoryScreen(Screen):
         """
         self.manager.current = 'quiz_screen'
 
+    def goto_analytics(self, instance):
+        """
+        Opens the analytics screen (trends over the whole history).
+        """
+        self.manager.current = 'analytics_screen'
+
+    def goto_performance(self, instance):
+        """
+        Opens the performance overlay (trace latencies).
+        """
+        self.manager.current = 'perf_screen'
+
     def reset_learned_questions(self, instance):
-        """Delete files tracking learned questions and show confirmation."""
+        """Clear learned-question progress (and any leftover legacy file) and show confirmation."""
         removed = []
+        if get_repository().reset_learned():
+            removed.append("question progress")
+        # Rebuild the quiz's review schedule from the now-empty stats on next entry
+        self.manager.get_screen('quiz_screen').scheduler = None
         for fname in ['correct_questions.json', 'asked_questions.json']:
             path = get_storage_path(fname)
             if os.path.exists(path):
@@ -0,0 +1,173 @@
+# File: image_cache.py
+import hashlib
+import io
+import os
+import queue
+import threading
+from collections import OrderedDict
+from kivy.clock import Clock
+from kivy.core.image import Image as CoreImage, ImageLoader
+from utils import get_storage_path
+from resource_bundle import BUNDLE_SCHEME, get_bundle
+import perf_trace
+
+try:
+    from PIL import Image as PILImage
+except ImportError:  # Pillow is optional; without it sources are used at full size
+    PILImage = None
+
+DISK_CACHE_DIR = 'image_cache'
+# Question/result images are shown 180 px high; keep 2x for high-density screens.
+DISPLAY_SIZE = (720, 360)
+MEMORY_BUDGET = 48 * 1024 * 1024
+
+
+def scaled_source(path, display_size=DISPLAY_SIZE):
+    """
+    Returns a path to an image no larger than `display_size`. Oversized sources are
+    downscaled once and kept under the storage dir, keyed by path, size and mtime.
+    Safe to call from a worker thread.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return path
+    key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{display_size[0]}x{display_size[1]}"
+    ext = os.path.splitext(path)[1].lower()
+    ext = ext if ext in ('.png', '.jpg', '.jpeg') else '.png'
+    cached = get_storage_path(os.path.join(DISK_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest()[:20] + ext))
+    if os.path.exists(cached):
+        return cached
+    if PILImage is None:
+        return path
+    try:
+        with PILImage.open(path) as img:
+            if img.width <= display_size[0] and img.height <= display_size[1]:
+                return path
+            img.thumbnail(display_size)
+            os.makedirs(os.path.dirname(cached) or '.', exist_ok=True)
+            tmp = cached + '.tmp'
+            if ext == '.png':
+                img.save(tmp, format='PNG', optimize=True)
+            else:
+                img.convert('RGB').save(tmp, format='JPEG', quality=90)
+            os.replace(tmp, cached)
+            return cached
+    except Exception as e:
+        print(f"Could not downscale image '{path}': {e}")
+        return path
+
+
+def load_image(source, display_size=DISPLAY_SIZE):
+    """
+    Decodes a file path (downscaled by scaled_source) or a bundle:// member
+    without creating a texture, so it can run on a worker thread. Bundled images
+    were downscaled when the bundle was built.
+    """
+    if source.startswith(BUNDLE_SCHEME):
+        data = get_bundle().read(source)
+        ext = os.path.splitext(source)[1].lstrip('.').lower()
+        loaders = [loader for loader in ImageLoader.loaders if loader.can_load_memory() and ext in loader.extensions()]
+        if not loaders:
+            raise ValueError(f"no loader for in-memory .{ext} images")
+        return loaders[0](source, ext=ext, rawdata=io.BytesIO(data), inline=True)
+    return ImageLoader.load(scaled_source(source, display_size))
+
+
+class ImageCache:
+    """
+    LRU cache of decoded textures bounded by an approximate GPU memory budget
+    (width * height * 4 bytes per texture). Sources are file paths, bundle://
+    members or atlas:// regions (see resource_bundle.resolve_image).
+    `prefetch()` decodes on a worker thread and only creates the texture on the
+    main thread (GL calls must stay there); `texture()` returns a cached texture
+    or decodes synchronously on a miss. Atlas regions come from a page that is
+    uploaded as a whole, so they are always loaded on the main thread.
+    """
+
+    def __init__(self, budget_bytes=MEMORY_BUDGET, display_size=DISPLAY_SIZE):
+        self.budget_bytes = budget_bytes
+        self.display_size = display_size
+        self._textures = OrderedDict()
+        self._used = 0
+        self._inflight = set()
+        self._queue = queue.Queue()
+        self._worker = None
+
+    def _store(self, path, texture):
+        if path in self._textures:
+            self._used -= self._textures.pop(path)[1]
+        nbytes = texture.width * texture.height * 4
+        self._textures[path] = (texture, nbytes)
+        self._used += nbytes
+        while self._used > self.budget_bytes and len(self._textures) > 1:
+            _, (_, freed) = self._textures.popitem(last=False)
+            self._used -= freed
+
+    def texture(self, path):
+        """Returns the texture for `path`, decoding it now if it is not cached yet."""
+        if not path:
+            return None
+        hit = self._textures.get(path)
+        if hit is not None:
+            self._textures.move_to_end(path)
+            return hit[0]
+        try:
+            with perf_trace.span('image_load'):
+                if path.startswith('atlas://'):
+                    texture = CoreImage(path).texture
+                else:
+                    texture = load_image(path, self.display_size).texture
+        except Exception as e:
+            print(f"Could not load image '{path}': {e}")
+            return None
+        self._store(path, texture)
+        return texture
+
+    def prefetch(self, path):
+        """Queues `path` for background decoding; no-op if cached or already queued."""
+        if not path or path in self._textures or path in self._inflight:
+            return
+        self._inflight.add(path)
+        if path.startswith('atlas://'):
+            Clock.schedule_once(lambda dt: (self._inflight.discard(path), self.texture(path)))
+            return
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name='image-prefetch', daemon=True)
+            self._worker.start()
+        self._queue.put(path)
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            try:
+                with perf_trace.span('image_prefetch'):
+                    loaded = load_image(path, self.display_size)
+            except Exception as e:
+                print(f"Could not prefetch image '{path}': {e}")
+                loaded = None
+            Clock.schedule_once(lambda dt, p=path, img=loaded: self._finish(p, img))
+
+    def _finish(self, path, loaded):
+        self._inflight.discard(path)
+        if loaded is None or path in self._textures:
+            return
+        try:
+            self._store(path, loaded.texture)
+        except Exception as e:
+            print(f"Could not upload image '{path}': {e}")
+
+    def clear(self):
+        self._textures.clear()
+        self._used = 0
+
+
+_cache = None
+
+
+def get_image_cache():
+    """Returns the app-wide image cache."""
+    global _cache
+    if _cache is None:
+        _cache = ImageCache()
+    return _cache
@@ -1,13 +1,16 @@
 # main.py
 
+import startup_profiler  # first, so its clock starts before the heavy imports
+import perf_trace
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.uix.screenmanager import ScreenManager
-from quiz_screen import QuizScreen
-from history_screen import HistoryScreen
 from kivy.resources import resource_add_path
+import importlib
 import os
 
-# Add images path or fallback to zip archive
+# Add images path or fallback to zip archive. Images.bundle (see resource_bundle.py)
+# is looked up before these when it has been built.
 images_dir = os.path.abspath("Images")
 if os.path.isdir(images_dir):
     resource_add_path(images_dir)
@@ -15,17 +18,73 @@ else:
     zip_path = os.path.abspath("Images.zip")
     if os.path.exists(zip_path):
         resource_add_path(zip_path)
+
+startup_profiler.mark('imports')
+
+# Longest the app waits for pending progress writes when paused or stopped
+FLUSH_TIMEOUT = 2.0
+
+# Screen name -> (module, class). Modules are imported when the screen is first shown.
+SCREENS = {
+    'quiz_screen': ('quiz_screen', 'QuizScreen'),
+    'history_screen': ('history_screen', 'HistoryScreen'),
+    'bank_picker': ('bank_picker_screen', 'BankPickerScreen'),
+    'search_screen': ('search_screen', 'SearchScreen'),
+    'perf_screen': ('perf_screen', 'PerfScreen'),
+    'analytics_screen': ('analytics_screen', 'AnalyticsScreen'),
+}
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that imports and builds a registered screen on first navigation."""
+
+    def __init__(self, factories, **kwargs):
+        super().__init__(**kwargs)
+        self._factories = dict(factories)
+
+    def has_screen(self, name):
+        return name in self._factories or super().has_screen(name)
+
+    def get_screen(self, name):
+        factory = self._factories.pop(name, None)
+        if factory is not None:
+            module_name, class_name = factory
+            screen_cls = getattr(importlib.import_module(module_name), class_name)
+            self.add_widget(screen_cls(name=name))
+        return super().get_screen(name)
+
+
 class QuizApp(App):
     """
     Main application class.
-    Manages navigation between the quiz and history screens.
+    Manages navigation between the quiz, history, bank picker, search, performance and analytics screens.
     """
     def build(self):
-        sm = ScreenManager()
-        sm.add_widget(QuizScreen(name='quiz_screen'))
-        sm.add_widget(HistoryScreen(name='history_screen'))
+        sm = LazyScreenManager(SCREENS)
         sm.current = 'quiz_screen'
+        startup_profiler.mark('build')
+        # Runs after the first frame has been drawn
+        Clock.schedule_once(lambda dt: startup_profiler.mark('first_frame'))
+        if perf_trace.enabled():
+            perf_trace.start_frame_sampling()
         return sm
 
+    def on_pause(self):
+        # Android may kill a paused app without calling on_stop
+        from progress_db import flush_all
+        from session_checkpoint import get_checkpoint
+        get_checkpoint().sync()
+        perf_trace.flush()
+        flush_all(timeout=FLUSH_TIMEOUT)
+        return True
+
+    def on_stop(self):
+        from progress_db import flush_all
+        from session_checkpoint import get_checkpoint
+        get_checkpoint().close()
+        perf_trace.flush()
+        flush_all(timeout=FLUSH_TIMEOUT)
+        startup_profiler.write_report()
+
 if __name__ == '__main__':
     QuizApp().run()
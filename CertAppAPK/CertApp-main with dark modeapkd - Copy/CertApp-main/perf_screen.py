@@ -0,0 +1,90 @@
+# File: perf_screen.py
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.clock import Clock
+from progress_db import get_repository
+import perf_trace
+
+# Seconds between refreshes of the table while the screen is shown
+REFRESH_INTERVAL = 1.0
+
+
+class PerfScreen(Screen):
+    """
+    On-device view of the performance trace: p50/p95/max latency of every traced
+    phase (question display, submit, results, bank and image loads, progress
+    flushes, frame times) over its recent samples. Tracing is switched on here
+    or with CERTAPP_TRACE=1; the setting is kept in the progress database.
+    """
+    _refresh_ev = None
+
+    def on_enter(self):
+        self.clear_widgets()
+        layout = BoxLayout(orientation='vertical', spacing=8, padding=[16, 16, 16, 12])
+        layout.add_widget(Label(text="Performance", font_size=22, size_hint_y=None, height=40))
+        self.header = Label(text=self._row("phase", "n", "p50 ms", "p95 ms", "max ms"), font_size=15, bold=True,
+                            font_name='RobotoMono-Regular', size_hint_y=None, height=28, halign='left', valign='middle')
+        self.header.bind(size=lambda inst, size: setattr(inst, 'text_size', size))
+        layout.add_widget(self.header)
+
+        self.table = RecycleView(size_hint=(1, 1), bar_width=8)
+        self.table.viewclass = 'Label'
+        box = RecycleBoxLayout(orientation='vertical', default_size=(None, 32), default_size_hint=(1, None), size_hint_y=None)
+        box.bind(minimum_height=box.setter('height'))
+        self.table.add_widget(box)
+        layout.add_widget(self.table)
+
+        footer = BoxLayout(size_hint_y=None, height=56, spacing=10)
+        self.toggle_btn = Button()
+        self.toggle_btn.bind(on_press=self.toggle_tracing)
+        btn_clear = Button(text="Clear")
+        btn_clear.bind(on_press=self.clear_samples)
+        btn_back = Button(text="Back")
+        btn_back.bind(on_press=self.goto_history)
+        footer.add_widget(self.toggle_btn)
+        footer.add_widget(btn_clear)
+        footer.add_widget(btn_back)
+        layout.add_widget(footer)
+        self.add_widget(layout)
+
+        self.refresh()
+        self._refresh_ev = Clock.schedule_interval(self.refresh, REFRESH_INTERVAL)
+
+    def on_leave(self):
+        if self._refresh_ev is not None:
+            self._refresh_ev.cancel()
+            self._refresh_ev = None
+
+    @staticmethod
+    def _row(name, n, p50, p95, worst):
+        return f"{name:<18}{n:>6}{p50:>10}{p95:>10}{worst:>10}"
+
+    def refresh(self, *args):
+        stats = perf_trace.summary()
+        if stats:
+            rows = [self._row(name, s['n'], f"{s['p50']:.1f}", f"{s['p95']:.1f}", f"{s['max']:.1f}")
+                    for name, s in stats.items()]
+        elif perf_trace.enabled():
+            rows = ["No samples yet. Use the app and come back."]
+        else:
+            rows = ["Tracing is off."]
+        self.table.data = [{'text': row, 'font_size': 15, 'font_name': 'RobotoMono-Regular', 'halign': 'left',
+                            'valign': 'middle', 'text_size': (self.width - 48, 32)} for row in rows]
+        self.toggle_btn.text = "Tracing: On" if perf_trace.enabled() else "Tracing: Off"
+
+    def toggle_tracing(self, instance):
+        flag = not perf_trace.enabled()
+        perf_trace.set_enabled(flag)
+        get_repository().set_meta('trace_enabled', '1' if flag else '0')
+        self.refresh()
+
+    def clear_samples(self, instance):
+        perf_trace.reset()
+        self.refresh()
+
+    def goto_history(self, instance):
+        self.manager.current = 'history_screen'
@@ -0,0 +1,191 @@
+# File: perf_trace.py
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+TRACE_FILE = 'perf_trace.jsonl'
+# Set to 1 to trace from launch; the performance screen can also switch tracing on.
+ENV_FLAG = 'CERTAPP_TRACE'
+# The trace file is rotated to perf_trace.jsonl.1 past this size
+MAX_FILE_BYTES = 512 * 1024
+# Buffered records are handed to the background writer in batches of this many
+FLUSH_EVERY = 50
+# Recent samples kept per phase for the overlay's percentiles
+RECENT_SAMPLES = 200
+# Frame times are written as one summary per window of this many seconds
+FRAME_WINDOW = 1.0
+
+_enabled = os.environ.get(ENV_FLAG, '').strip().lower() in ('1', 'true', 'yes', 'on')
+_recent = {}
+_buffer = []
+_lock = threading.Lock()
+_frames = []
+_frame_start = None
+_frame_event = None
+
+
+def enabled():
+    return _enabled
+
+
+def set_enabled(flag):
+    """Switches tracing on or off; frame sampling follows when Kivy is running."""
+    global _enabled
+    _enabled = bool(flag)
+    if _enabled:
+        start_frame_sampling()
+    else:
+        stop_frame_sampling()
+        flush()
+
+
+def record(name, ms, blocks=None, **extra):
+    """Adds one sample for `name` (duration in ms, net allocated memory blocks)."""
+    rec = {'t': round(time.time(), 3), 'name': name, 'ms': round(ms, 3)}
+    if blocks is not None:
+        rec['blocks'] = blocks
+    rec.update(extra)
+    with _lock:
+        samples = _recent.get(name)
+        if samples is None:
+            samples = _recent[name] = deque(maxlen=RECENT_SAMPLES)
+        samples.append(ms)
+        _buffer.append(rec)
+        full = len(_buffer) >= FLUSH_EVERY
+    if full:
+        from background_writer import get_writer
+        get_writer().submit(('perf_trace',), flush)
+
+
+class _Span:
+    __slots__ = ('name', '_t0', '_blocks')
+
+    def __init__(self, name):
+        self.name = name
+        self._t0 = None
+
+    def __enter__(self):
+        if _enabled:
+            self._blocks = sys.getallocatedblocks()
+            self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._t0 is not None:
+            ms = (time.perf_counter() - self._t0) * 1000
+            record(self.name, ms, sys.getallocatedblocks() - self._blocks)
+        return False
+
+
+def span(name):
+    """
+    Times a block: `with perf_trace.span('load_bank'): ...`. The duration and the
+    change in allocated memory blocks (sys.getallocatedblocks) are recorded.
+    Costs one flag check when tracing is off.
+    """
+    return _Span(name)
+
+
+def traced(name):
+    """Decorator form of span(); the tracing flag is checked on every call."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _on_frame(dt):
+    global _frame_start
+    now = time.perf_counter()
+    if _frame_start is None:
+        _frame_start = now
+        return
+    _frames.append(dt * 1000)
+    with _lock:
+        samples = _recent.get('frame')
+        if samples is None:
+            samples = _recent['frame'] = deque(maxlen=RECENT_SAMPLES)
+        samples.append(dt * 1000)
+    if now - _frame_start >= FRAME_WINDOW:
+        stats = percentiles(_frames)
+        record_window = {'t': round(time.time(), 3), 'name': 'frame_window', 'n': len(_frames),
+                         'p50': stats['p50'], 'p95': stats['p95'], 'max': stats['max']}
+        with _lock:
+            _buffer.append(record_window)
+        _frames.clear()
+        _frame_start = now
+
+
+def start_frame_sampling():
+    """Samples the time between frames while tracing is on (needs a running Kivy clock)."""
+    global _frame_event, _frame_start
+    if _frame_event is not None or 'kivy.app' not in sys.modules:
+        return
+    from kivy.clock import Clock
+    _frame_start = None
+    _frame_event = Clock.schedule_interval(_on_frame, 0)
+
+
+def stop_frame_sampling():
+    global _frame_event
+    if _frame_event is not None:
+        _frame_event.cancel()
+        _frame_event = None
+        _frames.clear()
+
+
+def percentiles(samples):
+    """{'n', 'p50', 'p95', 'max'} of a list of millisecond samples."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    if not n:
+        return {'n': 0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+
+    def pick(q):
+        return round(ordered[min(n - 1, int(q * (n - 1) + 0.5))], 2)
+    return {'n': n, 'p50': pick(0.5), 'p95': pick(0.95), 'max': round(ordered[-1], 2)}
+
+
+def summary():
+    """Percentiles of the recent samples of every traced phase, by name."""
+    with _lock:
+        recent = {name: list(samples) for name, samples in _recent.items()}
+    return {name: percentiles(samples) for name, samples in sorted(recent.items())}
+
+
+def trace_path():
+    from utils import get_storage_path
+    return get_storage_path(TRACE_FILE)
+
+
+def flush(path=None):
+    """Appends the buffered records to the trace file, rotating it when it is too large."""
+    with _lock:
+        if not _buffer:
+            return
+        records = list(_buffer)
+        _buffer.clear()
+    path = path or trace_path()
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) > MAX_FILE_BYTES:
+            os.replace(path, path + '.1')
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(r, separators=(',', ':')) + '\n' for r in records))
+    except Exception as e:
+        print(f"Could not write performance trace: {e}")
+
+
+def reset():
+    """Drops the recent samples shown by the overlay (the trace file is kept)."""
+    with _lock:
+        _recent.clear()
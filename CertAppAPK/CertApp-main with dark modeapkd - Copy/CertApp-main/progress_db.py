@@ -0,0 +1,406 @@
+# File: progress_db.py
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from utils import get_storage_path, load_json, question_id
+from background_writer import get_writer
+import perf_trace
+
+DB_FILE = 'progress.db'
+SCHEMA_VERSION = 2
+# Bump when register_questions stores more per question, so known banks are re-indexed.
+QUESTION_INDEX_VERSION = 2
+# JSON-era progress files, imported once by import_legacy
+LEGACY_ASKED_FILE = 'asked_questions.json'
+LEGACY_HISTORY_FILE = 'score_history.json'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS questions (
+    id TEXT PRIMARY KEY,
+    bank TEXT,
+    topic TEXT,
+    question TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_questions_bank ON questions(bank, topic);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bank TEXT,
+    started REAL NOT NULL,
+    finished REAL,
+    date TEXT,
+    correct INTEGER DEFAULT 0,
+    total INTEGER DEFAULT 0,
+    score INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_finished ON sessions(finished);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER REFERENCES sessions(id),
+    question_id TEXT NOT NULL,
+    selected TEXT,
+    correct INTEGER NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_question_ts ON attempts(question_id, ts);
+CREATE INDEX IF NOT EXISTS idx_attempts_missed ON attempts(ts, question_id) WHERE correct = 0;
+CREATE INDEX IF NOT EXISTS idx_attempts_session ON attempts(session_id);
+CREATE TABLE IF NOT EXISTS question_stats (
+    question_id TEXT PRIMARY KEY,
+    asked INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    last_ts REAL,
+    last_ok INTEGER,
+    reps INTEGER,
+    ease REAL,
+    interval REAL,
+    due REAL
+);
+CREATE INDEX IF NOT EXISTS idx_question_stats_due ON question_stats(due);
+"""
+
+# Columns added after version 1, with their SQL types.
+_STATS_UPGRADE_COLUMNS = (('reps', 'INTEGER'), ('ease', 'REAL'), ('interval', 'REAL'), ('due', 'REAL'))
+
+# One open repository per database file for the lifetime of the process.
+_repositories = {}
+
+
+def _encode_selection(selection):
+    if selection is None:
+        return None
+    if isinstance(selection, (set, frozenset)):
+        return ''.join(sorted(selection))
+    if isinstance(selection, (list, tuple)):
+        return '|'.join(str(s) for s in selection)
+    return str(selection)
+
+
+class ProgressRepository:
+    """
+    SQLite store for questions, sessions, attempts and per-question statistics.
+    Answers are buffered and written in batches (one transaction per batch) with
+    the database in WAL mode; call flush() before the app may be killed.
+    With a `writer` (background_writer.BackgroundWriter) full batches and finished
+    sessions are committed on the writer thread instead of the caller's.
+    Queuing an answer only takes a short lock on the pending lists; the transaction
+    runs under a separate connection lock, so a submit never waits on a flush.
+    question_stats(), recent_sessions() and analytics_version() read the connection
+    and add the still queued answers and sessions in memory instead of flushing.
+    """
+
+    def __init__(self, db_path, batch_size=20, writer=None):
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.writer = writer
+        self._pending = []
+        self._finished = []
+        # Guards the pending lists only; held briefly, never during database I/O
+        self._lock = threading.Lock()
+        # Guards the connection; a flush holds it for its whole transaction
+        self._conn_lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._upgrade_schema()
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+
+    def _upgrade_schema(self):
+        """Adds columns introduced after version 1 to an existing question_stats table."""
+        existing = {r['name'] for r in self.conn.execute('PRAGMA table_info(question_stats)')}
+        if not existing:
+            return
+        with self.conn:
+            for name, sql_type in _STATS_UPGRADE_COLUMNS:
+                if name not in existing:
+                    self.conn.execute(f'ALTER TABLE question_stats ADD COLUMN {name} {sql_type}')
+
+    # ---- meta ----
+
+    def get_meta(self, key, default=None):
+        with self._conn_lock:
+            row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else default
+
+    def set_meta(self, key, value):
+        with self._conn_lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)', (key, str(value)))
+
+    # ---- questions ----
+
+    def register_questions(self, bank, questions, digest=None):
+        """Indexes a bank's question ids and topics; skipped when the bank digest is unchanged."""
+        if digest:
+            digest = f"{digest}/{QUESTION_INDEX_VERSION}"
+        if digest and self.get_meta(f'bank_digest:{bank}') == digest:
+            return
+        rows = [(question_id(q), bank, q.get('topic'), q.get('question', '')) for q in questions]
+        with self._conn_lock, self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO questions(id, bank, topic, question) VALUES (?, ?, ?, ?)', rows)
+            if digest:
+                self.conn.execute('INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)', (f'bank_digest:{bank}', digest))
+
+    # ---- sessions & attempts ----
+
+    def start_session(self, bank=None, started=None):
+        with self._conn_lock, self.conn:
+            cur = self.conn.execute('INSERT INTO sessions(bank, started) VALUES (?, ?)', (bank, started or time.time()))
+        return cur.lastrowid
+
+    def record_answer(self, session_id, question, selection, is_correct, ts=None, schedule=None):
+        """
+        Queues one answer; the batch is written once batch_size answers are pending.
+        `schedule` is the (reps, ease, interval, due) tuple from the scheduler, if any.
+        """
+        row = (session_id, question_id(question), _encode_selection(selection),
+               1 if is_correct else 0, ts if ts is not None else time.time(),
+               schedule or (None, None, None, None))
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._request_flush()
+
+    def _request_flush(self):
+        """Flushes now, or on the writer thread (repeated requests coalesce into one)."""
+        if self.writer is None:
+            self.flush()
+        else:
+            self.writer.submit(('progress', self.db_path), self.flush)
+
+    def flush(self):
+        """Writes all queued answers, their stats updates and finished sessions in a single transaction."""
+        with self._conn_lock:
+            # Swapped out under the connection lock, so readers never see a batch in neither place
+            with self._lock:
+                if not self._pending and not self._finished:
+                    return
+                batch, self._pending = self._pending, []
+                finished, self._finished = self._finished, []
+            with perf_trace.span('progress_flush'), self.conn:
+                if batch:
+                    self._write_answers(batch)
+                for session_id, ts, entry, total in finished:
+                    self._write_finished(session_id, ts, entry, total)
+
+    def _write_answers(self, batch):
+        self.conn.executemany(
+            'INSERT INTO attempts(session_id, question_id, selected, correct, ts) VALUES (?, ?, ?, ?, ?)',
+            [row[:5] for row in batch])
+        self.conn.executemany(
+            'INSERT INTO question_stats(question_id, asked, correct, last_ts, last_ok, reps, ease, interval, due) '
+            'VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(question_id) DO UPDATE SET asked = asked + 1, correct = correct + excluded.correct, '
+            'last_ts = excluded.last_ts, last_ok = excluded.last_ok, '
+            'reps = COALESCE(excluded.reps, reps), ease = COALESCE(excluded.ease, ease), '
+            'interval = COALESCE(excluded.interval, interval), due = COALESCE(excluded.due, due)',
+            [(qid, ok, ts, ok) + tuple(schedule) for _, qid, _, ok, ts, schedule in batch])
+
+    def _write_finished(self, session_id, finished, entry, total):
+        if total <= 0:
+            self.conn.execute('DELETE FROM sessions WHERE id = ? AND NOT EXISTS '
+                              '(SELECT 1 FROM attempts WHERE session_id = ?)', (session_id, session_id))
+            return
+        self.conn.execute('UPDATE sessions SET finished = ?, date = ?, correct = ?, total = ?, score = ? WHERE id = ?',
+                          (finished, entry['date'], entry['correct'], total, entry['score'], session_id))
+
+    def finish_session(self, session_id, correct, total, finished=None):
+        """
+        Closes a session with its score and returns the history entry.
+        Sessions without questions are dropped, matching the old zero-total filter.
+        The entry is returned at once; it is committed together with the session's
+        remaining answers.
+        """
+        finished = finished or time.time()
+        entry = None
+        if total > 0:
+            entry = {"date": datetime.fromtimestamp(finished).strftime("%Y-%m-%d %H:%M:%S"),
+                     "correct": correct, "total": total, "score": int(correct / total * 100)}
+        with self._lock:
+            self._finished.append((session_id, finished, entry, total))
+        self._request_flush()
+        return entry
+
+    # ---- queries ----
+
+    def recent_sessions(self, n=10):
+        """Newest finished attempts first, as {'date','correct','total','score'} dicts."""
+        with self._conn_lock:
+            rows = self.conn.execute('SELECT id, finished, date, correct, total, score FROM sessions '
+                                     'WHERE finished IS NOT NULL AND total > 0 '
+                                     'ORDER BY finished DESC, id DESC LIMIT ?', (n,)).fetchall()
+            with self._lock:
+                queued = [(finished, session_id, entry) for session_id, finished, entry, total in self._finished
+                          if total > 0]
+        stored = [(r['finished'], r['id'], {k: r[k] for k in ('date', 'correct', 'total', 'score')}) for r in rows]
+        return [dict(entry) for _, _, entry in sorted(stored + queued, key=lambda s: s[:2], reverse=True)[:n]]
+
+    def session_answer_count(self, session_id):
+        """Number of answers stored for a session."""
+        with self._conn_lock:
+            self.flush()
+            row = self.conn.execute('SELECT COUNT(*) AS n FROM attempts WHERE session_id = ?', (session_id,)).fetchone()
+        return row['n']
+
+    def question_stats(self):
+        """{question id: stats row}, including answers still queued for the next flush."""
+        with self._conn_lock:
+            rows = self.conn.execute('SELECT question_id, asked, correct, last_ts, last_ok, reps, ease, interval, due '
+                                     'FROM question_stats').fetchall()
+            with self._lock:
+                batch = list(self._pending)
+        stats = {r['question_id']: dict(r) for r in rows}
+        for _, qid, _, ok, ts, schedule in batch:
+            # Same update as the upsert in _write_answers
+            entry = stats.get(qid)
+            if entry is None:
+                entry = stats[qid] = dict(question_id=qid, asked=0, correct=0, reps=None, ease=None, interval=None, due=None)
+            entry.update(asked=entry['asked'] + 1, correct=entry['correct'] + ok, last_ts=ts, last_ok=ok)
+            for name, value in zip(('reps', 'ease', 'interval', 'due'), schedule):
+                if value is not None:
+                    entry[name] = value
+        return stats
+
+    def missed_questions(self, min_misses=2, days=30, now=None):
+        """Question ids answered wrong at least `min_misses` times in the last `days` days."""
+        since = (now or time.time()) - days * 86400
+        with self._conn_lock:
+            self.flush()
+            rows = self.conn.execute('SELECT question_id FROM attempts WHERE correct = 0 AND ts >= ? '
+                                     'GROUP BY question_id HAVING COUNT(*) >= ?', (since, min_misses)).fetchall()
+        return [r['question_id'] for r in rows]
+
+    def analytics_version(self):
+        """
+        Changes whenever an answer is stored or a session finishes (cache key for analytics).
+        Queued answers and sessions are counted as if flushed, so a flush leaves it unchanged.
+        """
+        with self._conn_lock:
+            row = self.conn.execute('SELECT (SELECT MAX(id) FROM attempts) AS a, '
+                                    '(SELECT COUNT(*) FROM sessions WHERE finished IS NOT NULL) AS s').fetchone()
+            with self._lock:
+                answers = len(self._pending)
+                sessions = sum(1 for *_, total in self._finished if total > 0)
+        return ((row['a'] or 0) + answers, row['s'] + sessions)
+
+    def attempt_rows(self):
+        """Every stored answer as a (session_id, ts, correct, question_id) tuple, in insertion order."""
+        with self._conn_lock:
+            self.flush()
+            cur = self.conn.cursor()
+            cur.row_factory = None  # plain tuples: much cheaper than Row for tens of thousands of rows
+            return cur.execute('SELECT session_id, ts, correct, question_id FROM attempts ORDER BY id').fetchall()
+
+    def question_topics(self):
+        """{question id: topic} for every registered question."""
+        with self._conn_lock:
+            rows = self.conn.execute('SELECT id, topic FROM questions').fetchall()
+        return {r['id']: r['topic'] for r in rows}
+
+    def session_scores(self):
+        """Scores of all finished sessions, oldest first."""
+        with self._conn_lock:
+            self.flush()
+            rows = self.conn.execute('SELECT score FROM sessions WHERE finished IS NOT NULL AND total > 0 '
+                                     'ORDER BY finished, id').fetchall()
+        return [r['score'] for r in rows]
+
+    def question_texts(self, ids):
+        """{question id: question text} for the given ids (known questions only)."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        with self._conn_lock:
+            rows = self.conn.execute(f"SELECT id, question FROM questions WHERE id IN ({','.join('?' * len(ids))})",
+                                     ids).fetchall()
+        return {r['id']: r['question'] for r in rows}
+
+    def reset_learned(self):
+        """Forgets every answered question (attempts and stats); score history is kept."""
+        with self._conn_lock:
+            with self._lock:
+                self._pending = []
+            self.flush()  # still records finished sessions
+            with self.conn:
+                n = self.conn.execute('DELETE FROM question_stats').rowcount
+                self.conn.execute('DELETE FROM attempts')
+        return n
+
+    # ---- legacy import ----
+
+    def import_legacy(self):
+        """
+        Imports the JSON-era files once: asked_questions.json (a copy of every
+        question asked, one per answer) and score_history.json (one entry per quiz).
+        They are removed after the import commits; a meta flag keeps the import
+        from ever running twice.
+        """
+        if self.get_meta('legacy_imported'):
+            return
+        paths = [get_storage_path(name) for name in (LEGACY_ASKED_FILE, LEGACY_HISTORY_FILE)]
+        asked, history = [load_json(path) if os.path.exists(path) else [] for path in paths]
+        asked_counts = Counter(question_id(q) for q in asked if isinstance(q, dict))
+        rows = [h for h in history if isinstance(h, dict) and h.get('total', 0) > 0]
+        with self._conn_lock, self.conn:
+            self.conn.executemany('INSERT OR IGNORE INTO question_stats(question_id, asked, correct) VALUES (?, ?, 0)',
+                                  asked_counts.items())
+            for h in rows:
+                try:
+                    finished = datetime.strptime(h['date'], "%Y-%m-%d %H:%M:%S").timestamp()
+                except (KeyError, ValueError):
+                    finished = 0
+                self.conn.execute('INSERT INTO sessions(started, finished, date, correct, total, score) VALUES (?, ?, ?, ?, ?, ?)',
+                                  (finished, finished, h.get('date'), h.get('correct', 0), h['total'], h.get('score', 0)))
+            self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('legacy_imported', ?)", (str(int(time.time())),))
+        for path in paths:
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    print(f"Error removing imported '{os.path.basename(path)}': {e}")
+
+    def close(self):
+        with self._conn_lock:
+            self.flush()
+            self.conn.close()
+
+
+def get_repository():
+    """Returns the app's shared repository, importing legacy JSON progress on first open."""
+    path = get_storage_path(DB_FILE)
+    repo = _repositories.get(path)
+    if repo is None:
+        repo = ProgressRepository(path, writer=get_writer())
+        try:
+            repo.import_legacy()
+        except Exception as e:
+            print(f"Error importing legacy progress files: {e}")
+        _repositories[path] = repo
+    return repo
+
+
+def flush_all(timeout=None):
+    """
+    Writes pending answers of every open repository and waits for the background
+    writer (used on pause/stop). Returns False if `timeout` seconds were not enough;
+    the writes then finish in the background.
+    """
+    for repo in _repositories.values():
+        try:
+            repo._request_flush()
+        except Exception as e:
+            print(f"Error flushing progress: {e}")
+    if get_writer().flush(timeout):
+        return True
+    print(f"Progress writes still pending after {timeout} s")
+    return False
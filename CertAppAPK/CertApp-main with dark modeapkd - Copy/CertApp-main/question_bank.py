@@ -0,0 +1,295 @@
+# File: question_bank.py
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from utils import iter_questions, get_storage_path, find_duplicate_questions
+from answer_keys import compile_answer_key, compile_answer_keys, key_code_array
+from explanation_markup import content_key, compile_explanation, compile_explanations
+from background_writer import get_writer
+import perf_trace
+
+# Bump whenever the pickled payload layout changes so stale caches are rebuilt.
+CACHE_VERSION = 6
+CACHE_DIR = 'bank_cache'
+
+# Parsed banks kept for the lifetime of the process, keyed by absolute source path.
+_loaded_banks = {}
+_banks_lock = threading.Lock()
+# One lock per source path: a bank is compiled (and its cache and index written) by one thread at a time
+_compile_locks = {}
+
+
+class QuestionBank:
+    """
+    A parsed question bank plus the signature of the source file it was built from.
+    The signature (size, mtime, sha1) decides whether a cached copy is still valid.
+    `by_id` maps each stable question id to its question for O(1) lookups and
+    `keys` to its precompiled AnswerKey (stored in the cache, not rebuilt on load).
+    `key_codes` holds every question's key code as an int64 array, in file order,
+    and `rows` maps an id to its position there (see answer_keys.grade_many).
+    `topics` maps each topic name to the indices of its questions, in file order.
+    `explanations` maps an explanation's content key to its prepared markup chunks.
+    """
+
+    def __init__(self, questions, size, mtime_ns, digest, keys=None, explanations=None):
+        self.questions = questions
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.by_id = {}
+        self.rows = {}
+        self.topics = {}
+        for i, q in enumerate(questions):
+            self.by_id.setdefault(q['id'], q)
+            self.rows.setdefault(q['id'], i)
+            topic = q.get('topic')
+            if topic is not None:
+                self.topics.setdefault(topic, []).append(i)
+        self.keys = keys if keys is not None else compile_answer_keys(questions)
+        self.explanations = explanations if explanations is not None else compile_explanations(questions)
+        self.key_codes = key_code_array(self.answer_key(q) for q in questions)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __contains__(self, qid):
+        return qid in self.by_id
+
+    def get(self, qid):
+        return self.by_id.get(qid)
+
+    def answer_key(self, q):
+        key = self.keys.get(q['id'])
+        return key if key is not None else compile_answer_key(q)
+
+    def explanation_chunks(self, q):
+        text = q.get('explanation') or ''
+        chunks = self.explanations.get(content_key(text))
+        return chunks if chunks is not None else compile_explanation(text)
+
+    def to_payload(self):
+        return {'questions': self.questions, 'keys': self.keys, 'explanations': self.explanations}
+
+    @classmethod
+    def from_payload(cls, payload, header):
+        return cls(payload['questions'], header['size'], header['mtime_ns'], header['sha1'], payload['keys'],
+                   payload['explanations'])
+
+
+def file_digest(filepath):
+    """SHA-1 of a file's bytes, read in chunks."""
+    h = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _compile_lock(filepath):
+    key = os.path.abspath(filepath)
+    with _banks_lock:
+        lock = _compile_locks.get(key)
+        if lock is None:
+            lock = _compile_locks[key] = threading.Lock()
+    return lock
+
+
+def _remember(filepath, bank):
+    with _banks_lock:
+        _loaded_banks[os.path.abspath(filepath)] = bank
+
+
+def cache_path_for(filepath):
+    """Returns the compiled cache location for a source bank file."""
+    source = os.path.abspath(filepath)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    tag = hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+    return get_storage_path(os.path.join(CACHE_DIR, f"{stem}-{tag}.bank"))
+
+
+def _header_matches(header, size, mtime_ns, filepath):
+    """
+    Size and mtime are checked first; only when the mtime moved (e.g. the APK was
+    re-extracted) is the source re-hashed to confirm the content really changed.
+    """
+    if not isinstance(header, dict) or header.get('version') != CACHE_VERSION:
+        return False
+    if header.get('size') != size:
+        return False
+    if header.get('mtime_ns') == mtime_ns:
+        return True
+    return header.get('sha1') == file_digest(filepath)
+
+
+def _read_cache(cache_file, filepath, size, mtime_ns):
+    """The cache is two pickles back to back: a small header, then the payload."""
+    try:
+        with open(cache_file, 'rb') as f:
+            header = pickle.load(f)
+            if not _header_matches(header, size, mtime_ns, filepath):
+                return None
+            with perf_trace.span('bank_unpickle'):
+                return QuestionBank.from_payload(pickle.load(f), header)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable bank cache '{cache_file}': {e}")
+        return None
+
+
+def _write_cache(cache_file, bank):
+    header = {'version': CACHE_VERSION, 'size': bank.size, 'mtime_ns': bank.mtime_ns, 'sha1': bank.digest}
+    directory = os.path.dirname(cache_file) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(cache_file) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(bank.to_payload(), f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, cache_file)
+    except Exception as e:
+        print(f"Could not write bank cache '{cache_file}': {e}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def report_duplicates(questions, source=''):
+    """Prints duplicate and colliding question ids. Returns True if the bank is clean."""
+    duplicates, collisions = find_duplicate_questions(questions)
+    for idxs in duplicates:
+        print(f"Duplicate question in '{source}' at positions {', '.join(str(i + 1) for i in idxs)}: "
+              f"{questions[idxs[0]].get('question', '')[:60]!r}")
+    for idxs in collisions:
+        print(f"Question id '{questions[idxs[0]]['id']}' in '{source}' is shared by different questions "
+              f"at positions {', '.join(str(i + 1) for i in idxs)}")
+    return not duplicates and not collisions
+
+
+@perf_trace.traced('bank_compile')
+def compile_bank(filepath, questions=None):
+    """
+    Parses a JSON bank (streaming, unless the already parsed `questions` are given)
+    and writes its compiled cache and search index. Returns the QuestionBank.
+    Callers hold the path's compile lock (see load_bank and BankStream).
+    """
+    st = os.stat(filepath)
+    if questions is None:
+        questions = list(iter_questions(filepath))
+    report_duplicates(questions, filepath)
+    bank = QuestionBank(questions, st.st_size, st.st_mtime_ns, file_digest(filepath))
+    _write_cache(cache_path_for(filepath), bank)
+    from search_index import write_index
+    write_index(filepath, bank)
+    return bank
+
+
+def cached_bank(filepath):
+    """
+    Returns the bank from memory or from a valid compiled cache, or None when the
+    source would have to be parsed. Never parses the JSON itself.
+    """
+    if not filepath or not os.path.exists(filepath):
+        return None
+    st = os.stat(filepath)
+
+    bank = _loaded_banks.get(os.path.abspath(filepath))
+    if bank is not None and bank.size == st.st_size and bank.mtime_ns == st.st_mtime_ns:
+        return bank
+
+    cache_file = cache_path_for(filepath)
+    bank = _read_cache(cache_file, filepath, st.st_size, st.st_mtime_ns)
+    if bank is None:
+        return None
+    if bank.mtime_ns != st.st_mtime_ns:
+        # Same content under a new mtime: restamp so the next start skips the re-hash.
+        bank.mtime_ns = st.st_mtime_ns
+        get_writer().submit(('bank_cache', cache_file), lambda: _write_cache(cache_file, bank))
+    _remember(filepath, bank)
+    return bank
+
+
+def load_bank(filepath):
+    """
+    Returns the QuestionBank for a JSON bank file.
+    Order of lookup: in-memory copy, compiled cache on disk, then a full JSON parse
+    (which also refreshes the cache). Missing files give an empty bank.
+    While a BankStream is compiling the same file, waits for it and reuses its bank.
+    """
+    if not filepath or not os.path.exists(filepath):
+        return QuestionBank([], 0, 0, '')
+    bank = cached_bank(filepath)
+    if bank is None:
+        with _compile_lock(filepath):
+            bank = cached_bank(filepath)
+            if bank is None:
+                bank = compile_bank(filepath)
+                _remember(filepath, bank)
+    return bank
+
+
+class BankStream:
+    """
+    Compiles a bank on a worker thread. Parsed questions are appended to
+    `questions` as they stream in, so a quiz can start on the first ones while the
+    rest of the file is still being read. `on_done(bank)` is called from the worker
+    thread once the full bank is compiled and cached. The path's compile lock is
+    held throughout, so load_bank() on the same file waits for this bank, and a
+    stream that waited for another compile reuses its bank instead of parsing again.
+    """
+
+    def __init__(self, filepath, on_done=None):
+        self.filepath = filepath
+        self.questions = []
+        self.bank = None
+        self.error = None
+        self._on_done = on_done
+        self._thread = threading.Thread(target=self._run, name='bank-stream', daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self):
+        return self.bank is not None or self.error is not None
+
+    def _run(self):
+        try:
+            with _compile_lock(self.filepath):
+                bank = cached_bank(self.filepath)  # compiled by another thread while this one waited
+                if bank is not None:
+                    self.questions.extend(bank.questions)
+                else:
+                    with perf_trace.span('bank_stream'):
+                        for q in iter_questions(self.filepath):
+                            self.questions.append(q)
+                        bank = compile_bank(self.filepath, self.questions)
+                    _remember(self.filepath, bank)
+            self.bank = bank
+        except Exception as e:
+            print(f"Error loading question bank '{self.filepath}': {e}")
+            self.error = e
+        if self._on_done is not None:
+            self._on_done(self.bank)
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+
+def clear_memory_cache():
+    """Drops every in-memory bank; the on-disk caches are kept."""
+    with _banks_lock:
+        _loaded_banks.clear()
+
+
+if __name__ == '__main__':
+    # Usage: python question_bank.py data/sc-200.json [...]  -- checks banks for duplicate ids
+    clean = True
+    for path in sys.argv[1:]:
+        questions = list(iter_questions(path))
+        ok = report_duplicates(questions, path)
+        print(f"{path}: {len(questions)} questions, {'no duplicates' if ok else 'duplicates found'}")
+        clean = clean and ok
+    sys.exit(0 if clean else 1)
@@ -0,0 +1,226 @@
+# File: question_view.py
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.image import Image as KivyImage
+from kivy.uix.togglebutton import ToggleButton
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.core.window import Window
+from kivy.properties import NumericProperty
+
+OPTION_BTN_HEIGHT = 56
+# Plain option lists longer than this (e.g. 8-option drag_and_drop items) go into a RecycleView
+LONG_OPTION_LIST = 6
+
+
+class OptionToggle(RecycleDataViewBehavior, ToggleButton):
+    """Recycled option row. Selection lives in the view's data, not in the widget."""
+    index = NumericProperty(0)
+    owner = None  # the QuestionView, passed in through the row data
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.index = index
+        return super().refresh_view_attrs(rv, index, data)
+
+    def on_release(self):
+        if self.owner is not None:
+            self.owner.set_long_option(self.index, self.state == 'down')
+
+
+class QuestionView(BoxLayout):
+    """
+    Question page built once and reused for every question.
+    `show()` rebinds texts, re-parents as many pooled ToggleButtons as the question
+    needs (growing the pool only when a question has more options than seen so far)
+    and resets their state. Long plain option lists are shown in a RecycleView.
+    """
+
+    def __init__(self, on_submit, on_exit, **kwargs):
+        super().__init__(orientation='vertical', **kwargs)
+        self._pool = []
+        self._active = []
+        self._long_selected = set()
+        self.is_yes_no_multi = False
+        self.n_groups = 0
+
+        # --- Scrollable Question Area ---
+        question_area = BoxLayout(orientation='vertical', size_hint=(1, 0.55))
+        self.scroll = ScrollView(size_hint=(1, 1), bar_width=8, scroll_type=['bars', 'content'], do_scroll_x=True, do_scroll_y=True)
+        self.vbox = BoxLayout(orientation='vertical', size_hint_x=None, size_hint_y=None, padding=[12, 18, 12, 10])
+        self.vbox.bind(minimum_height=self.vbox.setter('height'), minimum_width=self.vbox.setter('width'))
+
+        self.counter_label = Label(font_size=18, size_hint_y=None, height=32, color=(1,1,1,1))
+        self.vbox.add_widget(self.counter_label)
+
+        self.question_label = Label(font_size=22, size_hint_y=None, size_hint_x=None, halign='left', valign='top', color=(1,1,1,1), text_size=(None, None))
+        self.question_label.bind(texture_size=self._update_label_size)
+        self.vbox.add_widget(self.question_label)
+
+        self.image = KivyImage(size_hint=(1, None), height=180)
+
+        self.scroll.add_widget(self.vbox)
+        question_area.add_widget(self.scroll)
+        self.add_widget(question_area)
+
+        # --- Options & Actions Footer ---
+        footer = BoxLayout(orientation='vertical', size_hint=(1, 0.45), spacing=10, padding=[20, 8, 20, 12])
+        self.options_box = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
+        self.options_box.bind(minimum_height=self.options_box.setter('height'))
+        footer.add_widget(self.options_box)
+
+        self.long_options = RecycleView(size_hint=(1, 1), bar_width=8)
+        self.long_options.viewclass = OptionToggle
+        layout = RecycleBoxLayout(orientation='vertical', default_size=(None, OPTION_BTN_HEIGHT), default_size_hint=(1, None), size_hint_y=None, spacing=6)
+        layout.bind(minimum_height=layout.setter('height'))
+        self.long_options.add_widget(layout)
+        self._footer = footer
+
+        submit_btn = Button(text="Submit", size_hint_y=None, height=OPTION_BTN_HEIGHT, font_size=20, background_color=(0.16, 0.62, 0.28, 1))
+        submit_btn.bind(on_press=on_submit)
+        exit_btn = Button(text="Exit", size_hint_y=None, height=OPTION_BTN_HEIGHT, font_size=20, background_color=(0.45, 0.12, 0.16, 1))
+        exit_btn.bind(on_press=on_exit)
+        self._actions = (submit_btn, exit_btn)
+        for btn in self._actions:
+            footer.add_widget(btn)
+        self.add_widget(footer)
+
+    def _update_label_size(self, instance, value):
+        instance.width = max(max(350, int(Window.width * 0.9)), instance.texture_size[0] + 32)
+        instance.height = instance.texture_size[1] + 16
+
+    def _pooled_button(self, i):
+        while len(self._pool) <= i:
+            self._pool.append(ToggleButton(size_hint_y=None, height=OPTION_BTN_HEIGHT, font_size=20, color=(1,1,1,1)))
+        return self._pool[i]
+
+    def _use_long_list(self, use):
+        """Swaps the pooled-button box and the RecycleView in the footer."""
+        current, wanted = (self.options_box, self.long_options) if use else (self.long_options, self.options_box)
+        if current.parent is self._footer:
+            self._footer.remove_widget(current)
+        if wanted.parent is None:
+            self._footer.add_widget(wanted, index=len(self._actions))
+
+    def show(self, q, index, total, is_yes_no_multi, n_groups, image_texture=None):
+        """Rebinds the view to question `q` (0-based `index` of `total`)."""
+        self.is_yes_no_multi = is_yes_no_multi
+        self.n_groups = n_groups
+        self.counter_label.text = f"Question {index + 1} of {total}"
+        self.question_label.text = q['question']
+
+        if image_texture is not None:
+            self.image.texture = image_texture
+            if self.image.parent is None:
+                self.vbox.add_widget(self.image)
+        elif self.image.parent is not None:
+            self.vbox.remove_widget(self.image)
+
+        options = q.get('options', [])
+        self.options_box.clear_widgets()
+        self._active = []
+        if is_yes_no_multi:
+            # Yes/No groups for each expected answer
+            for i in range(n_groups):
+                for opt in options:
+                    self._activate(f"{i+1}:{opt}", f"yn_{i}")
+            self._use_long_list(False)
+        elif len(options) > LONG_OPTION_LIST:
+            self._long_selected = set()
+            self.long_options.data = [{'text': f"{chr(65 + idx)}. {opt}", 'state': 'normal', 'font_size': 20, 'owner': self}
+                                      for idx, opt in enumerate(options)]
+            self.long_options.scroll_y = 1
+            self._use_long_list(True)
+        else:
+            for idx, opt in enumerate(options):
+                self._activate(f"{chr(65 + idx)}. {opt}", None)
+            self._use_long_list(False)
+        self.scroll.scroll_y = 1
+        self.scroll.scroll_x = 0
+
+    def _activate(self, text, group):
+        btn = self._pooled_button(len(self._active))
+        btn.group = group
+        btn.state = 'normal'
+        btn.text = text
+        self._active.append(btn)
+        self.options_box.add_widget(btn)
+
+    def set_long_option(self, index, selected):
+        """Called by recycled rows; keeps selection in the data so it survives recycling."""
+        self.long_options.data[index]['state'] = 'down' if selected else 'normal'
+        if selected:
+            self._long_selected.add(index)
+        else:
+            self._long_selected.discard(index)
+
+    def selected_letters(self):
+        """Letters of the selected options for a plain multiple-choice question."""
+        if self.long_options.parent is not None:
+            indices = self._long_selected
+        else:
+            indices = [i for i, b in enumerate(self._active) if b.state == 'down']
+        return {chr(65 + i) for i in indices}
+
+    def yes_no_selection(self):
+        """The chosen Yes/No text per group, '' for groups left empty."""
+        selected = []
+        for i in range(self.n_groups):
+            group = f"yn_{i}"
+            choice = None
+            for b in self._active:
+                if b.group == group and b.state == 'down':
+                    choice = b.text.split(':', 1)[1]
+                    break
+            selected.append(choice or '')
+        return selected
+
+
+class ResultView(BoxLayout):
+    """Results page built once; `show()` only updates the image and score text."""
+
+    def __init__(self, on_history, on_restart, on_exit, on_choose_bank=None, **kwargs):
+        super().__init__(orientation='vertical', **kwargs)
+
+        # Scrollable result area
+        result_area = BoxLayout(orientation='vertical', size_hint=(1, 0.58), padding=20)
+        scroll = ScrollView(size_hint=(1, 1))
+        self.vbox = BoxLayout(orientation='vertical', size_hint_y=None)
+        self.vbox.bind(minimum_height=self.vbox.setter('height'))
+        self.image = KivyImage(size_hint=(1, None), height=180)
+        self.score_label = Label(font_size=22, size_hint_y=None, height=60, color=(1,1,1,1))
+        self.vbox.add_widget(self.score_label)
+        scroll.add_widget(self.vbox)
+        result_area.add_widget(scroll)
+        self.add_widget(result_area)
+
+        # Footer buttons
+        footer = BoxLayout(orientation='vertical', size_hint=(1, 0.42), spacing=10, padding=[20, 8, 20, 12])
+        btn_history = Button(text="View History", size_hint_y=None, height=56, font_size=20, background_color=(0.19, 0.38, 0.77, 1))
+        btn_history.bind(on_press=on_history)
+        footer.add_widget(btn_history)
+
+        btn_restart = Button(text="Restart Quiz", size_hint_y=None, height=56, font_size=20, background_color=(0.17, 0.52, 0.72, 1))
+        btn_restart.bind(on_press=on_restart)
+        footer.add_widget(btn_restart)
+
+        if on_choose_bank is not None:
+            btn_bank = Button(text="Choose Exam", size_hint_y=None, height=56, font_size=20, background_color=(0.35, 0.28, 0.62, 1))
+            btn_bank.bind(on_press=on_choose_bank)
+            footer.add_widget(btn_bank)
+
+        btn_exit = Button(text="Exit", size_hint_y=None, height=56, font_size=20, background_color=(0.45, 0.12, 0.16, 1))
+        btn_exit.bind(on_press=on_exit)
+        footer.add_widget(btn_exit)
+        self.add_widget(footer)
+
+    def show(self, text, image_texture=None):
+        self.score_label.text = text
+        if image_texture is not None:
+            self.image.texture = image_texture
+            if self.image.parent is None:
+                self.vbox.add_widget(self.image, index=1)
+        elif self.image.parent is not None:
+            self.vbox.remove_widget(self.image)
@@ -3,43 +3,181 @@ from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
-from kivy.uix.image import Image as KivyImage
-from kivy.uix.togglebutton import ToggleButton
 from kivy.uix.popup import Popup
 from kivy.uix.textinput import TextInput
 from kivy.uix.scrollview import ScrollView
 from kivy.core.window import Window
-from kivy.properties import ListProperty, NumericProperty
-from kivy.resources import resource_find
-from utils import load_json, save_json, get_storage_path, normalize_mc_answer_to_letters, format_correct_answer, is_mc_selection_correct
-import re
-import webbrowser
-from datetime import datetime
+from kivy.clock import Clock, mainthread
+from answer_keys import YES_NO
+from quiz_session import QuizSession
+from question_bank import cached_bank, BankStream
+from explanation_markup import compile_explanation, escape
+from resource_bundle import resolve_image
+from session_checkpoint import get_checkpoint
+from progress_db import get_repository
+from bank_catalog import get_catalog
+from scheduler import Scheduler
+from topic_sampler import sample_topics, parse_quotas
+import startup_profiler
+import perf_trace
 import os
 import random
 
+# Shown on the results page for a passing (>= 70%) and a failing score
+RESULT_IMAGES = ("Images/meow.jpg", "Images/tryharder.jpg")
+
 
 class QuizScreen(Screen):
-    questions = ListProperty([])
-    current_index = NumericProperty(0)
-    correct_count = NumericProperty(0)
-    asked_questions = ListProperty([])
-    question_limit = NumericProperty(0)
+    """
+    Kivy view over a QuizSession: loads the bank, asks for the quiz length and
+    renders the session's current question, answer feedback and result page.
+    """
+    session = None
+    # Built on first use and reused for every question / result page
+    question_view = None
+    result_view = None
+    scheduler = None
+    bank = None
+    bank_digest = None
+    # Source file of the bank being quizzed; set by the bank picker
+    bank_path = None
+    # Content SHA-1 of that file (the catalog's bank id); progress and checkpoints are keyed by it
+    bank_id = None
+    # Questions for the next quiz instead of asking for a length (set by the search screen)
+    pending_questions = None
 
     def on_enter(self):
-        questions_path = resource_find('data/sc-200.json')
-        if not questions_path:
+        startup_profiler.mark('first_on_enter')
+        # Let a lightweight placeholder reach the screen before touching the bank
+        self.clear_widgets()
+        self.add_widget(Label(text="Loading questions...", font_size=20))
+        Clock.schedule_once(self._load_bank)
+
+    def _load_bank(self, dt=None):
+        self.repo = get_repository()
+        if not perf_trace.enabled() and self.repo.get_meta('trace_enabled') == '1':
+            perf_trace.set_enabled(True)
+        questions_path = self._choose_bank_path()
+        if questions_path is None:
+            return
+
+        bank = cached_bank(questions_path)
+        self.bank_id = bank.digest if bank is not None else get_catalog().bank_id(questions_path)
+        if bank is None:
+            # Cold start: parse in the background and let the quiz begin on the first questions
+            self._stream = BankStream(questions_path, on_done=self._on_bank_streamed)
+        else:
+            self._stream = None
+            if not self._use_bank(bank):
+                return
+        if self.pending_questions:
+            questions, self.pending_questions = self.pending_questions, None
+            self._start_when_ready(None, questions=questions)
+            return
+        state = get_checkpoint().load()
+        if state is not None and state.get('bank') == self.bank_id:
+            self._offer_resume(state)
+            return
+        self._ask_question_limit()
+
+    def _choose_bank_path(self):
+        """
+        The picked bank, else the one used last time, else the only bank in the
+        catalog. With several banks and nothing picked yet, opens the bank picker
+        and returns None.
+        """
+        for path in (self.bank_path, self.repo.get_meta('last_bank')):
+            if path and os.path.exists(path):
+                self.bank_path = path
+                self.repo.set_meta('last_bank', path)
+                return path
+        banks = get_catalog().refresh()
+        if len(banks) == 1:
+            self.bank_path = banks[0]['path']
+            self.repo.set_meta('last_bank', self.bank_path)
+            return self.bank_path
+        if banks:
+            self.manager.current = 'bank_picker'
+        else:
             self.clear_widgets()
             self.add_widget(Label(text="Questions file not found!", font_size=20))
-            return
+        return None
+
+    def choose_bank(self, instance=None):
+        self.manager.current = 'bank_picker'
 
-        self.questions = load_json(questions_path)
-        if not self.questions:
+    def _use_bank(self, bank):
+        if not bank.questions:
             self.clear_widgets()
             self.add_widget(Label(text="No questions loaded!", font_size=20))
-            return
+            return False
+        self.repo.register_questions(self.bank_id, bank.questions, bank.digest)
+        # The scheduler lives across restarts and is fed by on_submit, so it is only
+        # rebuilt from the stored stats when the bank itself changed.
+        self.bank = bank
+        if self.scheduler is None or self.bank_digest != bank.digest:
+            previous = self.scheduler
+            self.scheduler = Scheduler(bank.questions, self.repo.question_stats())
+            self.bank_digest = bank.digest
+            # A quiz started early on the partial scheduler continues on the full one.
+            # question_stats() includes queued answers, so the ones given so far are already in it.
+            session = self.session
+            if session is not None and session.scheduler is previous and not session.finished:
+                session.scheduler = self.scheduler
+        return True
+
+    @mainthread
+    def _on_bank_streamed(self, bank):
+        if bank is not None and bank.questions:
+            self._use_bank(bank)
+
+    def _offer_resume(self, state):
+        """Asks whether to continue the quiz left unfinished last time."""
+        answered, total = len(state['answers']), len(state['ids'])
+        correct = sum(1 for a in state['answers'] if a['ok'])
+        content = BoxLayout(orientation='vertical', spacing=10, padding=20)
+        content.add_widget(Label(text=f"Resume your unfinished quiz?\n{answered} of {total} answered, {correct} correct",
+                                 halign='center'))
+        btn_box = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        btn_resume = Button(text="Resume")
+        btn_new = Button(text="New Quiz")
+        btn_box.add_widget(btn_resume)
+        btn_box.add_widget(btn_new)
+        content.add_widget(btn_box)
+        popup = Popup(title="Unfinished Quiz", content=content, size_hint=(0.8, 0.4), auto_dismiss=False)
+        btn_resume.bind(on_press=lambda *a: (popup.dismiss(), self._resume_when_ready(state, True)))
+        btn_new.bind(on_press=lambda *a: (popup.dismiss(), self._resume_when_ready(state, False)))
+        popup.open()
 
-        random.shuffle(self.questions)  # Randomize order
+    def _resume_when_ready(self, state, resume):
+        """
+        Rebuilds the saved session once the bank is loaded. Resuming shows its next
+        question; otherwise the abandoned session is closed with its score so far
+        and a new quiz is offered.
+        """
+        stream = self._stream
+        if stream is not None:
+            if not stream.done:
+                self.clear_widgets()
+                self.add_widget(Label(text="Loading questions...", font_size=20))
+                Clock.schedule_once(lambda dt: self._resume_when_ready(state, resume), 0.1)
+                return
+            if stream.bank is not None and stream.bank is not self.bank and not self._use_bank(stream.bank):
+                return
+        if self.bank is None or not self.bank.questions:
+            self.clear_widgets()
+            self.add_widget(Label(text="No questions loaded!", font_size=20))
+            return
+        checkpoint = get_checkpoint()
+        session = QuizSession.resume(state, self.scheduler, self.bank, repo=self.repo, checkpoint=checkpoint)
+        if session is None:
+            checkpoint.clear()
+        elif resume:
+            self.session = session
+            self.display_question()
+            return
+        else:
+            session.finish()
         self._ask_question_limit()
 
     def _ask_question_limit(self):
@@ -47,227 +185,212 @@ class QuizScreen(Screen):
         content.add_widget(Label(text="How many questions?", size_hint_y=None, height=30))
         txt = TextInput(multiline=False, input_filter='int')
         content.add_widget(txt)
+        topics = self._topic_names()
+        quota_txt = None
+        if len(topics) > 1:
+            content.add_widget(Label(text=f"Questions per topic (optional, {len(topics)} topics)", size_hint_y=None, height=30))
+            quota_txt = TextInput(multiline=False, hint_text=f"e.g. {topics[-1]}=10, 1=5 (rest proportional)")
+            content.add_widget(quota_txt)
         btn_box = BoxLayout(size_hint_y=None, height=40, spacing=10)
         btn_start = Button(text="Start")
+        btn_search = Button(text="Search")
         btn_cancel = Button(text="Cancel")
         btn_box.add_widget(btn_start)
+        btn_box.add_widget(btn_search)
         btn_box.add_widget(btn_cancel)
         content.add_widget(btn_box)
-        popup = Popup(title="Quiz Length", content=content, size_hint=(0.8, 0.4), auto_dismiss=False)
-        btn_start.bind(on_press=lambda *a: self._begin_quiz(txt.text, popup))
+        popup = Popup(title="Quiz Length", content=content, size_hint=(0.8, 0.55 if quota_txt else 0.4), auto_dismiss=False)
+        btn_start.bind(on_press=lambda *a: self._begin_quiz(txt.text, popup, quota_txt.text if quota_txt else ''))
+        btn_search.bind(on_press=lambda *a: (popup.dismiss(), self.goto_search(None)))
         btn_cancel.bind(on_press=lambda *a: (popup.dismiss(), self.exit_quiz(None)))
         popup.open()
 
-    def _begin_quiz(self, value, popup):
+    def _topic_names(self):
+        """Topics of the fully loaded bank, in file order ([] while it is still streaming)."""
+        if self.bank is None or (self._stream is not None and self._stream.bank is not self.bank):
+            return []
+        return list(self.bank.topics)
+
+    def _begin_quiz(self, value, popup, quota_text=''):
         popup.dismiss()
         try:
-            self.question_limit = int(value) if value.strip() else len(self.questions)
+            limit = int(value) if value.strip() else None
         except ValueError:
-            self.question_limit = len(self.questions)
-        self.questions = self.questions[:self.question_limit]
-        self.current_index = 0
-        self.correct_count = 0
-        self.asked_questions = []
+            limit = None
+        self._start_when_ready(limit, parse_quotas(quota_text, self._topic_names()))
+
+    def _sample_by_topic(self, limit, quotas, rng=None):
+        """Draws the session's questions with the given topic quotas, preferring due ones."""
+        bank, scheduler = self.bank, self.scheduler
+        k = limit if limit is not None else len(bank)
+        indices = sample_topics(bank.topics, k, quotas, rng=rng, rank=lambda i: scheduler.state(bank.questions[i]['id']).due)
+        return [bank.questions[i] for i in indices]
+
+    def _start_when_ready(self, limit, quotas=None, questions=None):
+        """
+        Starts the quiz once `limit` questions are available (None = whole bank).
+        `questions` (e.g. search matches) are asked instead of the scheduler's pick.
+        While a cold bank is still streaming in, an early start picks from the
+        questions parsed so far; the full scheduler replaces it when loading ends.
+        """
+        stream = self._stream
+        if stream is not None and not stream.done:
+            ready = len(stream.questions)
+            if limit is None or ready < limit:
+                self.clear_widgets()
+                self.add_widget(Label(text=f"Loading questions... ({ready} ready)", font_size=20))
+                Clock.schedule_once(lambda dt: self._start_when_ready(limit, quotas, questions), 0.1)
+                return
+            self.scheduler = Scheduler(stream.questions[:ready], self.repo.question_stats())
+            self.bank_digest = None
+        elif stream is not None:
+            if stream.bank is None or not stream.bank.questions:
+                self.clear_widgets()
+                self.add_widget(Label(text="No questions loaded!", font_size=20))
+                return
+            # _on_bank_streamed may still be queued behind this poll on the main thread
+            if stream.bank is not self.bank and not self._use_bank(stream.bank):
+                return
+
+        # The seed of the draw is kept with the session checkpoint
+        seed = random.randrange(1 << 31)
+        if questions is None and quotas and self._topic_names():
+            questions = self._sample_by_topic(limit, quotas, random.Random(seed))
+        self.session = QuizSession(self.scheduler, limit, bank=self.bank, repo=self.repo, bank_name=self.bank_id,
+                                   questions=questions, checkpoint=get_checkpoint(), seed=seed)
         self.display_question()
 
+    def _show_view(self, view):
+        """Makes `view` the only child of the screen (no-op if it already is)."""
+        if view.parent is not self:
+            self.clear_widgets()
+            self.add_widget(view)
+
+    @perf_trace.traced('display_question')
     def display_question(self):
-        self.clear_widgets()
-        if self.current_index >= len(self.questions):
+        session = self.session
+        q = session.current
+        if q is None:
             self.show_result()
             return
 
-        q = self.questions[self.current_index]
-        main_layout = BoxLayout(orientation='vertical')
-
-        # --- Scrollable Question Area ---
-        question_area = BoxLayout(orientation='vertical', size_hint=(1, 0.55))
-        scroll = ScrollView(size_hint=(1, 1), bar_width=8, scroll_type=['bars', 'content'], do_scroll_x=True, do_scroll_y=True)
-        vbox = BoxLayout(orientation='vertical', size_hint_x=None, size_hint_y=None, padding=[12, 18, 12, 10])
-        vbox.bind(minimum_height=vbox.setter('height'), minimum_width=vbox.setter('width'))
-
-        vbox.add_widget(Label(text=f"Question {self.current_index + 1} of {len(self.questions)}", font_size=18, size_hint_y=None, height=32, color=(1,1,1,1)))
-
-        min_width = max(350, int(Window.width * 0.9))
-        question_label = Label(text=q['question'], font_size=22, size_hint_y=None, size_hint_x=None, halign='left', valign='top', color=(1,1,1,1), text_size=(None, None))
-        def update_label_size(instance, value):
-            instance.width = max(min_width, instance.texture_size[0] + 32)
-            instance.height = instance.texture_size[1] + 16
-        question_label.bind(texture_size=update_label_size)
-        vbox.add_widget(question_label)
-
-        # Add image if present
-        img_path = q.get('image') or q.get('Image')
-        if img_path:
-            resolved_img = resource_find(img_path)
-            if resolved_img and os.path.exists(resolved_img):
-                vbox.add_widget(KivyImage(source=resolved_img, size_hint=(1, None), height=180))
-            else:
-                print(f"Image not found: {img_path}")
-
-        scroll.add_widget(vbox)
-        question_area.add_widget(scroll)
-        main_layout.add_widget(question_area)
-
-        # --- Options & Actions Footer ---
-        footer = BoxLayout(orientation='vertical', size_hint=(1, 0.45), spacing=10, padding=[20, 8, 20, 12])
-        self.option_buttons = []
-        option_btn_height = 56
-
-        correct = q.get('answer') or q.get('answers')
-        if not isinstance(correct, list):
-            correct = [correct]
-
-        options = q.get('options', [])
-        options_lower = [o.strip().lower() for o in options]
-        self.is_yes_no_multi = (len(options_lower) == 2 and sorted(options_lower) == ['no', 'yes'] and len(correct) > 1)
-
-        if self.is_yes_no_multi:
-            # Create Yes/No groups for each expected answer
-            for i in range(len(correct)):
-                for opt in options:
-                    btn = ToggleButton(text=f"{i+1}:{opt}", group=f"yn_{i}", size_hint_y=None, height=option_btn_height, font_size=20)
-                    self.option_buttons.append(btn)
-                    footer.add_widget(btn)
+        from image_cache import get_image_cache
+        if self.question_view is None:
+            from question_view import QuestionView
+            self.question_view = QuestionView(on_submit=self.on_submit, on_exit=self.exit_quiz)
+
+        key = session.answer_key(q)
+        images = get_image_cache()
+        texture = images.texture(self._resolve_image(q))
+        self.question_view.show(q, session.index, len(session), key.kind == YES_NO, key.groups, texture)
+        self._show_view(self.question_view)
+        if not startup_profiler.marked('first_question_rendered'):
+            Clock.schedule_once(lambda dt: startup_profiler.mark('first_question_rendered'))
+
+        # Decode what comes next while this question is on screen
+        if session.index + 1 < len(session):
+            images.prefetch(self._resolve_image(session.questions[session.index + 1], report_missing=False))
         else:
-            for idx, opt in enumerate(options):
-                letter = chr(65 + idx)
-                btn = ToggleButton(text=f"{letter}. {opt}", size_hint_y=None, height=option_btn_height, font_size=20, color=(1,1,1,1))
-                self.option_buttons.append(btn)
-                footer.add_widget(btn)
-
-        submit_btn = Button(text="Submit", size_hint_y=None, height=option_btn_height, font_size=20, background_color=(0.16, 0.62, 0.28, 1))
-        submit_btn.bind(on_press=self.on_submit)
-        footer.add_widget(submit_btn)
-
-        exit_btn = Button(text="Exit", size_hint_y=None, height=option_btn_height, font_size=20, background_color=(0.45, 0.12, 0.16, 1))
-        exit_btn.bind(on_press=self.exit_quiz)
-        footer.add_widget(exit_btn)
-
-        main_layout.add_widget(footer)
-        self.add_widget(main_layout)
+            for result_img in RESULT_IMAGES:
+                images.prefetch(resolve_image(result_img))
 
+    def _resolve_image(self, q, report_missing=True):
+        """Returns the image source of the question (bundled or a file path), or None."""
+        img_path = q.get('image') or q.get('Image')
+        if not img_path:
+            return None
+        resolved_img = resolve_image(img_path)
+        if resolved_img:
+            return resolved_img
+        if report_missing:
+            print(f"Image not found: {img_path}")
+        return None
+
+    @perf_trace.traced('on_submit')
     def on_submit(self, instance):
-        q = self.questions[self.current_index]
-        correct = q.get('answer') or q.get('answers')
-        if not isinstance(correct, list):
-            correct = [correct]
-
-        options = q.get('options', [])
-
-        if getattr(self, 'is_yes_no_multi', False):
-            selected = []
-            for i in range(len(correct)):
-                group = f"yn_{i}"
-                choice = None
-                for b in self.option_buttons:
-                    if b.group == group and b.state == 'down':
-                        choice = b.text.split(':', 1)[1]
-                        break
-                selected.append(choice or '')
-            explanation = q.get('explanation', '')
-            url_pattern = r'(https?://\S+)'
-            explanation = re.sub(url_pattern, r'[ref=\1]\1[/ref]', explanation)
-            selected_norm = [s.strip().lower() for s in selected]
-            correct_norm = [c.strip().lower() for c in correct]
-            is_correct = selected_norm == correct_norm
-            if is_correct:
-                result_text = "Correct!\n" + explanation
-                self.correct_count += 1
-            else:
-                correct_text = ', '.join(correct)
-                result_text = f"Wrong.\nCorrect answer(s): {correct_text}\n{explanation}"
+        if self.question_view.is_yes_no_multi:
+            selection = self.question_view.yes_no_selection()
         else:
-            # Convert user's selected options to letters by index
-            selected_indices = [i for i, b in enumerate(self.option_buttons) if b.state == 'down']
-            selected_letters = {chr(65 + i) for i in selected_indices}
-            is_correct, correct_display = is_mc_selection_correct(options, correct, selected_letters)
-
-            explanation = q.get('explanation', '')
-            url_pattern = r'(https?://\S+)'
-            explanation = re.sub(url_pattern, r'[ref=\1]\1[/ref]', explanation)
-
-            if is_correct:
-                result_text = "Correct!\n" + explanation
-                self.correct_count += 1
-            else:
-                result_text = f"Wrong.\nCorrect answer(s): {correct_display}\n{explanation}"
-
-        self.asked_questions.append(q)
-        save_json(get_storage_path('asked_questions.json'), self.asked_questions)
-
-        result_label = Label(text=result_text, font_size=20, color=(1,1,1,1), markup=True, halign='left', valign='top', size_hint=(None, None), width=Window.width * 0.7, text_size=(Window.width * 0.7, None), padding=(10, 10))
-        result_label.bind(texture_size=lambda inst, val: setattr(inst, 'height', val[1]))
-        result_label.bind(on_ref_press=lambda inst, url: webbrowser.open(url))
+            # Letters of the selected options by index
+            selection = self.question_view.selected_letters()
+        result = self.session.submit(selection)
+
+        q = result.question
+        chunks = self.bank.explanation_chunks(q) if self.bank is not None else compile_explanation(q.get('explanation'))
+        if result.is_correct:
+            header = "Correct!"
+        else:
+            header = f"Wrong.\nCorrect answer(s): {escape(result.key.display)}"
 
+        width = Window.width * 0.7
+        box = BoxLayout(orientation='vertical', size_hint=(None, None), width=width)
+        box.bind(minimum_height=box.setter('height'))
         scroll = ScrollView(size_hint=(1, 1), bar_width=8)
-        scroll.add_widget(result_label)
+        scroll.add_widget(box)
+
+        def add_label(text):
+            label = Label(text=text, font_size=20, color=(1,1,1,1), markup=True, halign='left', valign='top', size_hint=(None, None), width=width, text_size=(width, None), padding=(10, 10))
+            label.bind(texture_size=lambda inst, val: setattr(inst, 'height', val[1]))
+            label.bind(on_ref_press=lambda inst, url: self._open_url(url))
+            box.add_widget(label)
+
+        # The markup was prepared with the bank; long explanations get one Label per
+        # chunk, the first shown at once and the rest added one per frame.
+        add_label(header + ("\n" + chunks[0] if chunks and chunks[0] else ""))
+        remaining = list(chunks[1:])
+
+        def add_next(dt):
+            if not remaining:
+                return False
+            add_label(remaining.pop(0))
+            return bool(remaining)
+        adding = Clock.schedule_interval(add_next, 0) if remaining else None
 
         popup = Popup(title="Result", content=scroll, size_hint=(0.85, 0.55))
+        if adding is not None:
+            popup.bind(on_dismiss=lambda *a: adding.cancel())
         popup.bind(on_dismiss=lambda *a: self._next_question())
         popup.open()
 
+    @staticmethod
+    def _open_url(url):
+        import webbrowser
+        webbrowser.open(url)
+
     def _next_question(self):
-        self.current_index += 1
+        self.session.advance()
         self.display_question()
 
+    @perf_trace.traced('show_result')
     def show_result(self):
-        self.clear_widgets()
-        total_questions = len(self.questions)
-        correct_count = self.correct_count
-        main_layout = BoxLayout(orientation='vertical')
-
-        # Scrollable result area
-        result_area = BoxLayout(orientation='vertical', size_hint=(1, 0.58), padding=20)
-        scroll = ScrollView(size_hint=(1, 1))
-        vbox = BoxLayout(orientation='vertical', size_hint_y=None)
-        vbox.bind(minimum_height=vbox.setter('height'))
-
+        session = self.session
+        total_questions = len(session)
+        correct_count = session.correct_count
+        from image_cache import get_image_cache
+        if self.result_view is None:
+            from question_view import ResultView
+            self.result_view = ResultView(on_history=self.goto_history, on_restart=lambda x: self.on_enter(),
+                                          on_exit=self.exit_quiz, on_choose_bank=self.choose_bank)
+
+        session.finish()
         if total_questions > 0:
-            percent_score = int(correct_count / total_questions * 100)
-            score = {"date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "correct": correct_count, "total": total_questions, "score": percent_score}
-            score_file = get_storage_path('score_history.json')
-            history = load_json(score_file)
-            if not isinstance(history, list):
-                history = []
-            history = [h for h in history if h.get('total', 0) > 0]
-            history.append(score)
-            save_json(score_file, history)
-
-            result_img = "Images/meow.jpg" if percent_score >= 70 else "Images/tryharder.jpg"
-            resolved_img = resource_find(result_img)
-            if resolved_img:
-                vbox.add_widget(KivyImage(source=resolved_img, size_hint=(1, None), height=180))
-
-            vbox.add_widget(Label(text=f"Quiz complete!\nScore: {correct_count}/{total_questions} ({percent_score}%)", font_size=22, size_hint_y=None, height=60, color=(1,1,1,1)))
-        else:
-            vbox.add_widget(Label(text="No questions were answered. Quiz history not saved.", font_size=22, size_hint_y=None, height=60, color=(1,1,1,1)))
-
-        scroll.add_widget(vbox)
-        result_area.add_widget(scroll)
-        main_layout.add_widget(result_area)
+            percent_score = session.score
 
-        # Footer buttons
-        footer = BoxLayout(orientation='vertical', size_hint=(1, 0.42), spacing=10, padding=[20, 8, 20, 12])
-        btn_history = Button(text="View History", size_hint_y=None, height=56, font_size=20, background_color=(0.19, 0.38, 0.77, 1))
-        btn_history.bind(on_press=self.goto_history)
-        footer.add_widget(btn_history)
-
-        btn_restart = Button(text="Restart Quiz", size_hint_y=None, height=56, font_size=20, background_color=(0.17, 0.52, 0.72, 1))
-        btn_restart.bind(on_press=lambda x: self.on_enter())
-        footer.add_widget(btn_restart)
-
-        btn_exit = Button(text="Exit", size_hint_y=None, height=56, font_size=20, background_color=(0.45, 0.12, 0.16, 1))
-        btn_exit.bind(on_press=self.exit_quiz)
-        footer.add_widget(btn_exit)
-
-        main_layout.add_widget(footer)
-        self.add_widget(main_layout)
+            result_img = RESULT_IMAGES[0] if percent_score >= 70 else RESULT_IMAGES[1]
+            self.result_view.show(f"Quiz complete!\nScore: {correct_count}/{total_questions} ({percent_score}%)",
+                                  get_image_cache().texture(resolve_image(result_img)))
+        else:
+            self.result_view.show("No questions were answered. Quiz history not saved.")
+        self._show_view(self.result_view)
 
     def goto_history(self, instance):
         self.manager.current = 'history_screen'
 
+    def goto_search(self, instance):
+        self.manager.current = 'search_screen'
+
     def exit_quiz(self, instance):
         from kivy.app import App
-        if self.current_index > 0:
-            self.show_result()
+        # An unfinished quiz stays in its checkpoint and is offered again on the next launch
+        get_checkpoint().sync()
         App.get_running_app().stop()
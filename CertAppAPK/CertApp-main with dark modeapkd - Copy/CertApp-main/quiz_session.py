@@ -0,0 +1,144 @@
+# File: quiz_session.py
+import time
+from collections import namedtuple
+from answer_keys import compile_answer_key, selection_code, grade
+
+# Outcome of one submit(): the question, its AnswerKey, the selection as given and the grade.
+AnswerResult = namedtuple('AnswerResult', 'question key selection is_correct')
+
+
+class QuizSession:
+    """
+    One quiz run, independent of Kivy: picks questions from a Scheduler, grades
+    answers, keeps the score and reports to an optional persistence repository
+    (anything with start_session / record_answer / finish_session, such as
+    progress_db.ProgressRepository). Without a repository nothing is written,
+    which is what simulations and load tests use.
+    `questions` replaces the scheduler's pick (e.g. a topic_sampler draw); answers
+    still feed the scheduler. With a `checkpoint` (session_checkpoint.SessionCheckpoint)
+    the question order and every answer are saved as they happen, and resume()
+    continues the session after the app was killed. `seed` is the seed of the
+    draw, kept with the checkpoint.
+    """
+
+    def __init__(self, scheduler, limit=None, bank=None, repo=None, bank_name=None, clock=time.time, questions=None,
+                 checkpoint=None, seed=None, session_id=None):
+        self.scheduler = scheduler
+        self.bank = bank
+        self.repo = repo
+        self.bank_name = bank_name
+        self.clock = clock
+        self.seed = seed
+        if questions is not None:
+            self.questions = list(questions)
+            self.limit = len(self.questions)
+        else:
+            self.limit = limit if limit is not None else len(scheduler)
+            # Missed questions first, then unseen, then the ones due soonest
+            self.questions = scheduler.next_batch(self.limit)
+        self.index = 0
+        self.correct_count = 0
+        self.results = []
+        self.summary = None
+        if session_id is None and repo is not None:
+            session_id = repo.start_session(bank_name)
+        self.session_id = session_id
+        self.checkpoint = checkpoint
+        if checkpoint is not None:
+            checkpoint.start(self)
+
+    @classmethod
+    def resume(cls, state, scheduler, bank, repo=None, checkpoint=None, clock=time.time):
+        """
+        Continues a session saved by a checkpoint (see SessionCheckpoint.load) in
+        the saved order, without drawing questions again. Answers the repository
+        had not committed when the app died are recorded again. Unanswered
+        questions no longer in `bank` are dropped; returns None if nothing is left.
+        """
+        answers = state['answers']
+        ids = state['ids']
+        answered = [bank.get(qid) or {'id': qid} for qid in ids[:len(answers)]]
+        remaining = [q for q in (bank.get(qid) for qid in ids[len(answers):]) if q is not None]
+        if not answered and not remaining:
+            return None
+        session = cls(scheduler, bank=bank, repo=repo, bank_name=state.get('bank'), clock=clock,
+                      questions=answered + remaining, seed=state.get('seed'), session_id=state.get('session_id'))
+        stored = repo.session_answer_count(session.session_id) if repo is not None else len(answers)
+        for i, (q, a) in enumerate(zip(answered, answers)):
+            if a['ok']:
+                session.correct_count += 1
+            if i >= stored:
+                new_state = scheduler.record(q['id'], bool(a['ok']), a['ts'])
+                repo.record_answer(session.session_id, q, a['sel'], bool(a['ok']), ts=a['ts'],
+                                   schedule=new_state.as_tuple() if new_state else None)
+            if q['id'] in bank:
+                session.results.append(AnswerResult(q, session.answer_key(q), a['sel'], bool(a['ok'])))
+        session.index = len(answers)
+        session.checkpoint = checkpoint
+        if checkpoint is not None:
+            checkpoint.start(session, answers)
+        return session
+
+    def __len__(self):
+        return len(self.questions)
+
+    @property
+    def finished(self):
+        return self.index >= len(self.questions)
+
+    @property
+    def current(self):
+        """The question being asked, or None once every question was shown."""
+        return None if self.finished else self.questions[self.index]
+
+    def answer_key(self, q=None):
+        q = q if q is not None else self.current
+        if self.bank is not None:
+            return self.bank.answer_key(q)
+        return compile_answer_key(q)
+
+    def submit(self, selection):
+        """
+        Grades the current question. `selection` is a set of letters, a list of
+        Yes/No choices, or an already encoded selection code (int).
+        Returns an AnswerResult; call advance() to move on.
+        """
+        q = self.current
+        key = self.answer_key(q)
+        code = selection if isinstance(selection, int) else selection_code(key, selection)
+        is_correct = grade(key, code)
+        if is_correct:
+            self.correct_count += 1
+        now = self.clock()
+        state = self.scheduler.record(q['id'], is_correct, now)
+        if self.repo is not None:
+            self.repo.record_answer(self.session_id, q, selection, is_correct, ts=now,
+                                    schedule=state.as_tuple() if state else None)
+        if self.checkpoint is not None:
+            self.checkpoint.record(self.index, q, selection, is_correct, now)
+        result = AnswerResult(q, key, selection, is_correct)
+        self.results.append(result)
+        return result
+
+    def advance(self):
+        self.index += 1
+        return self.current
+
+    @property
+    def score(self):
+        """Percentage of the session's questions answered correctly."""
+        total = len(self.questions)
+        return int(self.correct_count / total * 100) if total else 0
+
+    def finish(self):
+        """
+        Closes the session (safe to call more than once) and returns the history
+        entry, or None for an empty session.
+        """
+        if self.repo is not None:
+            self.summary = self.repo.finish_session(self.session_id, self.correct_count, len(self.questions))
+        elif self.questions:
+            self.summary = {"correct": self.correct_count, "total": len(self.questions), "score": self.score}
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+        return self.summary
@@ -0,0 +1,247 @@
+# File: resource_bundle.py
+import io
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = 'Images'
+BUNDLE_FILE = 'Images.bundle'
+# Atlas output name: Images.atlas plus one or more Images-<n>.png pages
+ATLAS_NAME = 'Images'
+BUNDLE_SCHEME = 'bundle://'
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg')
+# Images no larger than this (after downscaling) are packed into atlas pages
+ATLAS_MAX_SIDE = 256
+ATLAS_PAGE_SIZE = 1024
+
+MAGIC = b'CQRB'
+# Bump whenever the file layout or the index format changes.
+BUNDLE_VERSION = 1
+# magic, version, index offset, index length
+_HEADER = struct.Struct('<4sIQI')
+
+
+def resource_name(path):
+    """Bundle key of an image path: '/'-separated and relative to the Images folder."""
+    name = str(path).replace('\\', '/')
+    while name.startswith('./'):
+        name = name[2:]
+    if name.startswith(IMAGES_DIR + '/'):
+        name = name[len(IMAGES_DIR) + 1:]
+    return name
+
+
+class ResourceBundle:
+    """
+    Read side of a resource bundle: a header, the member files back to back and a
+    JSON index at the end with each member's (offset, length). The header and index
+    are read once when the bundle is opened; a member is then one seek and one
+    read, with no archive scan. Images packed into a Kivy atlas are listed in the
+    index too and resolve to an atlas:// name instead.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'rb')
+        try:
+            magic, version, index_offset, index_length = _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != MAGIC or version != BUNDLE_VERSION:
+                raise ValueError(f"not a version {BUNDLE_VERSION} resource bundle")
+            self._file.seek(index_offset)
+            index = json.loads(self._file.read(index_length).decode('utf-8'))
+        except Exception:
+            self._file.close()
+            raise
+        self.files = {name: tuple(entry) for name, entry in index.get('files', {}).items()}
+        self.atlas_ids = index.get('atlas_ids', {})
+        atlas = index.get('atlas')
+        # Kivy resolves atlas://<path without .atlas>/<id>
+        self.atlas_base = os.path.splitext(os.path.join(os.path.dirname(os.path.abspath(path)), atlas))[0] if atlas else None
+
+    def __contains__(self, name):
+        return name in self.files or name in self.atlas_ids
+
+    def __len__(self):
+        return len(self.files) + len(self.atlas_ids)
+
+    def resolve(self, name):
+        """Image source for a bundled name: an atlas:// or bundle:// name, or None."""
+        name = resource_name(name)
+        uid = self.atlas_ids.get(name)
+        if uid is not None and self.atlas_base:
+            return f"atlas://{self.atlas_base}/{uid}"
+        if name in self.files:
+            return BUNDLE_SCHEME + name
+        return None
+
+    def read(self, name):
+        """Bytes of a bundled file (a name or its bundle:// source)."""
+        if name.startswith(BUNDLE_SCHEME):
+            name = name[len(BUNDLE_SCHEME):]
+        offset, length = self.files[resource_name(name)]
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def close(self):
+        self._file.close()
+
+
+def write_bundle(path, members, atlas=None, atlas_ids=None):
+    """
+    Writes a bundle from (name, bytes) pairs. `atlas` is the atlas file name
+    (relative to the bundle) and `atlas_ids` maps image names to their atlas ids.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + '.tmp'
+    files = {}
+    with open(tmp, 'wb') as f:
+        f.write(b'\0' * _HEADER.size)
+        for name, data in members:
+            files[resource_name(name)] = (f.tell(), len(data))
+            f.write(data)
+        index = json.dumps({'files': files, 'atlas': atlas, 'atlas_ids': atlas_ids or {}},
+                           ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, BUNDLE_VERSION, index_offset, len(index)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _image_files(src_dir):
+    for root, dirs, names in os.walk(src_dir):
+        dirs.sort()
+        for name in sorted(names):
+            if name.lower().endswith(IMAGE_EXTS):
+                path = os.path.join(root, name)
+                yield resource_name(os.path.relpath(path, src_dir)), path
+
+
+def _prepare(path, display_size):
+    """(encoded bytes, size) of an image no larger than display_size, using Pillow."""
+    from PIL import Image as PILImage
+    with PILImage.open(path) as img:
+        if img.width <= display_size[0] and img.height <= display_size[1]:
+            size = img.size
+            with open(path, 'rb') as f:
+                return f.read(), size
+        img.thumbnail(display_size)
+        out = io.BytesIO()
+        if path.lower().endswith('.png'):
+            img.save(out, format='PNG', optimize=True)
+        else:
+            img.convert('RGB').save(out, format='JPEG', quality=90)
+        return out.getvalue(), img.size
+
+
+def build(src_dir, out_dir, display_size=None, atlas_max_side=ATLAS_MAX_SIDE):
+    """
+    Packs every image under `src_dir` into out_dir/Images.bundle. Images larger than
+    `display_size` are downscaled first; the ones that then fit in atlas_max_side
+    go into Kivy atlas pages (out_dir/Images.atlas), the rest are stored as files.
+    Without Pillow the images are bundled as they are and no atlas is built.
+    Returns (bundled files, atlas images).
+    """
+    if display_size is None:
+        from image_cache import DISPLAY_SIZE
+        display_size = DISPLAY_SIZE
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        PIL = None
+        print("Pillow is not installed: images are bundled unscaled and no atlas is built")
+
+    os.makedirs(out_dir, exist_ok=True)
+    members, small = [], []
+    for name, path in _image_files(src_dir):
+        if PIL is None:
+            with open(path, 'rb') as f:
+                members.append((name, f.read()))
+            continue
+        data, size = _prepare(path, display_size)
+        if max(size) <= atlas_max_side:
+            small.append((name, data))
+        else:
+            members.append((name, data))
+
+    atlas, atlas_ids = None, {}
+    if small:
+        atlas, atlas_ids = _build_atlas(small, out_dir)
+        if atlas is None:
+            members.extend(small)
+    write_bundle(os.path.join(out_dir, BUNDLE_FILE), members, atlas, atlas_ids)
+    return len(members), len(atlas_ids)
+
+
+def _build_atlas(images, out_dir):
+    """Packs (name, bytes) images into atlas pages. Returns (atlas file name, {name: atlas id})."""
+    from kivy.atlas import Atlas
+    workdir = tempfile.mkdtemp(prefix='atlas-')
+    try:
+        # Atlas ids come from file names, so number the images to keep ids unique
+        paths, atlas_ids = [], {}
+        for i, (name, data) in enumerate(images):
+            path = os.path.join(workdir, f"img{i}{os.path.splitext(name)[1].lower()}")
+            with open(path, 'wb') as f:
+                f.write(data)
+            paths.append(path)
+            atlas_ids[name] = f"img{i}"
+        if not Atlas.create(os.path.join(out_dir, ATLAS_NAME), paths, ATLAS_PAGE_SIZE):
+            print("Could not build the image atlas; bundling the images as files")
+            return None, {}
+        return ATLAS_NAME + '.atlas', atlas_ids
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+_bundle = None
+_bundle_checked = False
+
+
+def get_bundle():
+    """The app's Images.bundle, opened on first use, or None if it was not built."""
+    global _bundle, _bundle_checked
+    if not _bundle_checked:
+        _bundle_checked = True
+        path = os.path.join(APP_DIR, BUNDLE_FILE)
+        if os.path.exists(path):
+            try:
+                _bundle = ResourceBundle(path)
+            except Exception as e:
+                print(f"Ignoring unreadable resource bundle '{path}': {e}")
+    return _bundle
+
+
+def resolve_image(name):
+    """
+    Image source for `name`: from the resource bundle's index if present, else the
+    path found by Kivy's resource_find. Returns None if the image does not exist.
+    """
+    if not name:
+        return None
+    bundle = get_bundle()
+    if bundle is not None:
+        source = bundle.resolve(name)
+        if source is not None:
+            return source
+    from kivy.resources import resource_find
+    path = resource_find(name)
+    return path if path and os.path.exists(path) else None
+
+
+if __name__ == '__main__':
+    # Usage: python resource_bundle.py [Images] [output dir]  -- builds Images.bundle and the atlas
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    src = sys.argv[1] if len(sys.argv) > 1 else os.path.join(APP_DIR, IMAGES_DIR)
+    out = sys.argv[2] if len(sys.argv) > 2 else APP_DIR
+    n_files, n_atlas = build(src, out)
+    print(f"{os.path.join(out, BUNDLE_FILE)}: {n_files} images as files, {n_atlas} in the atlas")
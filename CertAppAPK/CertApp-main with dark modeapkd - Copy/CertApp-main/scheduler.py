@@ -0,0 +1,116 @@
+# File: scheduler.py
+import heapq
+import random
+import time
+from utils import question_id
+
+DAY = 86400
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# A missed question comes back after this delay (so it is not asked twice in a row
+# when the quiz is restarted immediately); from then on it ranks ahead of unseen ones.
+RELEARN_DELAY = 10 * 60
+
+
+class ReviewState:
+    """SM-2 state of one question: repetitions, ease factor, interval (days) and due time."""
+    __slots__ = ('reps', 'ease', 'interval', 'due')
+
+    def __init__(self, reps=0, ease=DEFAULT_EASE, interval=0.0, due=0.0):
+        self.reps = reps
+        self.ease = ease
+        self.interval = interval
+        self.due = due
+
+    def as_tuple(self):
+        return self.reps, self.ease, self.interval, self.due
+
+
+def review(state, is_correct, now):
+    """
+    Applies one graded answer using SM-2 with binary grades
+    (correct = quality 4, wrong = quality 2) and returns the updated state.
+    """
+    if is_correct:
+        state.reps += 1
+        if state.reps == 1:
+            state.interval = 1.0
+        elif state.reps == 2:
+            state.interval = 6.0
+        else:
+            state.interval = round(state.interval * state.ease, 2)
+        state.due = now + state.interval * DAY
+    else:
+        state.reps = 0
+        state.interval = 0.0
+        state.ease = max(MIN_EASE, state.ease - 0.32)
+        state.due = now + RELEARN_DELAY
+    return state
+
+
+class Scheduler:
+    """
+    Keeps every question of a bank in a min-heap ordered by due time.
+    Missed questions are due first, then never-seen ones (due "now" at build time,
+    in random order), then reviewed questions by their next interval.
+    `next_batch(k)` pops k entries in O(k log n); stale heap entries left behind by
+    `record` are skipped lazily instead of re-heapifying.
+    """
+
+    def __init__(self, questions, stats=None, now=None, rng=None):
+        now = now if now is not None else time.time()
+        self._rng = rng or random.Random()
+        self._by_id = {}
+        self._states = {}
+        self._heap = []
+        self._out = set()  # handed out by next_batch, not answered yet
+        stats = stats or {}
+        for q in questions:
+            qid = question_id(q)
+            if qid in self._by_id:
+                continue
+            self._by_id[qid] = q
+            s = stats.get(qid)
+            if s and s.get('due') is not None:
+                state = ReviewState(s.get('reps') or 0, s.get('ease') or DEFAULT_EASE, s.get('interval') or 0.0, s['due'])
+            elif s and s.get('last_ok') == 0:
+                # Missed before scheduling existed: review it first
+                state = ReviewState(due=s.get('last_ts') or 0.0)
+            else:
+                state = ReviewState(due=now)
+            self._states[qid] = state
+            self._heap.append((state.due, self._rng.random(), qid))
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def question(self, qid):
+        return self._by_id.get(qid)
+
+    def state(self, qid):
+        return self._states.get(qid)
+
+    def next_batch(self, k):
+        """Returns the k most due questions. Unanswered ones from a previous batch are returned to the pool first."""
+        for qid in self._out:
+            heapq.heappush(self._heap, (self._states[qid].due, self._rng.random(), qid))
+        self._out = set()
+        batch = []
+        while self._heap and len(batch) < k:
+            due, _, qid = heapq.heappop(self._heap)
+            if qid in self._out or self._states[qid].due != due:
+                continue  # superseded by a later record()
+            self._out.add(qid)
+            batch.append(self._by_id[qid])
+        return batch
+
+    def record(self, qid, is_correct, now=None):
+        """Feeds an answer back; returns the new ReviewState for persistence."""
+        state = self._states.get(qid)
+        if state is None:
+            return None
+        review(state, is_correct, now if now is not None else time.time())
+        self._out.discard(qid)
+        heapq.heappush(self._heap, (state.due, self._rng.random(), qid))
+        return state
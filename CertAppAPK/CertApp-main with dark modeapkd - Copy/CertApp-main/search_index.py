@@ -0,0 +1,196 @@
+# File: search_index.py
+import heapq
+import math
+import os
+import pickle
+import re
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+# Bump whenever tokenization or the pickled layout changes so stale indexes are rebuilt.
+INDEX_VERSION = 1
+# Weight of a token by the field it appears in
+FIELD_WEIGHTS = (('question', 3.0), ('options', 2.0), ('explanation', 1.0), ('topic', 1.0))
+# Query tokens shorter than this only match whole terms
+MIN_PREFIX = 2
+# A prefix expands to at most this many terms (the most frequent ones)
+MAX_EXPANSIONS = 64
+# Prefix matches rank a little below exact ones
+PREFIX_FACTOR = 0.8
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset("a an and are as at be by can do for from has have how if in into is it of on or "
+                       "that the this to was what when which will with you your".split())
+
+# Indexes loaded in this process, keyed by bank digest
+_indexes = {}
+
+
+def tokenize(text):
+    """Lower-cased word tokens of `text`, without stopwords and single characters."""
+    return [t for t in _TOKEN_RE.findall(str(text).lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def _field_text(q, field):
+    value = q.get(field)
+    if isinstance(value, list):
+        return ' '.join(str(v) for v in value)
+    return value or ''
+
+
+class SearchIndex:
+    """
+    Inverted index over a bank's questions. Each term maps to parallel arrays of
+    question indices and field-weighted term frequencies; a sorted term list
+    serves prefix lookups by bisection. Queries match every token (the last one
+    may be a prefix of a term) and are ranked by tf-idf.
+    """
+
+    def __init__(self, postings, n_docs):
+        self.postings = postings
+        self.n_docs = n_docs
+        self.terms = sorted(postings)
+
+    @classmethod
+    def build(cls, questions):
+        collected = {}
+        for i, q in enumerate(questions):
+            weights = Counter()
+            for field, w in FIELD_WEIGHTS:
+                for token in tokenize(_field_text(q, field)):
+                    weights[token] += w
+            for token, w in weights.items():
+                entry = collected.get(token)
+                if entry is None:
+                    entry = collected[token] = (array('I'), array('f'))
+                entry[0].append(i)
+                entry[1].append(w)
+        return cls(collected, len(questions))
+
+    def _idf(self, term):
+        return math.log(1 + self.n_docs / len(self.postings[term][0]))
+
+    def expand(self, token):
+        """Terms matched by a query token: itself and, if long enough, terms it prefixes."""
+        if len(token) < MIN_PREFIX:
+            return [token] if token in self.postings else []
+        lo = bisect_left(self.terms, token)
+        hi = bisect_left(self.terms, token + '\uffff', lo)
+        if hi - lo <= MAX_EXPANSIONS:
+            return self.terms[lo:hi]
+        return heapq.nlargest(MAX_EXPANSIONS, self.terms[lo:hi], key=lambda t: len(self.postings[t][0]))
+
+    def _token_scores(self, token):
+        """{question index: weighted tf} for one query token, and the factor to apply."""
+        terms = self.expand(token)
+        if len(terms) == 1:
+            docs, weights = self.postings[terms[0]]
+            return dict(zip(docs, weights)), self._idf(terms[0]) * (1.0 if terms[0] == token else PREFIX_FACTOR)
+        scores = {}
+        for term in terms:
+            docs, weights = self.postings[term]
+            factor = self._idf(term) * (1.0 if term == token else PREFIX_FACTOR)
+            for d, w in zip(docs, weights):
+                s = w * factor
+                if s > scores.get(d, 0.0):
+                    scores[d] = s
+        return scores, 1.0
+
+    def search(self, query, limit=100):
+        """Returns up to `limit` (question index, score) pairs, best first."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        try:
+            import numpy as np
+        except ImportError:
+            return self._search_dicts(tokens, limit)
+        return self._search_numpy(np, tokens, limit)
+
+    def _search_dicts(self, tokens, limit):
+        per_token = [self._token_scores(token) for token in tokens]
+        if not all(scores for scores, _ in per_token):
+            return []
+        per_token.sort(key=lambda item: len(item[0]))  # intersect starting from the rarest token
+        docs = per_token[0][0].keys()
+        for scores, _ in per_token[1:]:
+            docs = docs & scores.keys()
+        ranked = ((d, sum(scores[d] * factor for scores, factor in per_token)) for d in docs)
+        return heapq.nlargest(limit, ranked, key=lambda item: (item[1], -item[0]))
+
+    def _search_numpy(self, np, tokens, limit):
+        """Same ranking as _search_dicts with one dense score vector per query."""
+        total = np.zeros(self.n_docs, dtype=np.float64)
+        matched = np.ones(self.n_docs, dtype=bool)
+        for token in tokens:
+            best = np.zeros(self.n_docs, dtype=np.float64)
+            for term in self.expand(token):
+                docs, weights = self.postings[term]
+                idx = np.frombuffer(docs, dtype=np.uint32)
+                factor = self._idf(term) * (1.0 if term == token else PREFIX_FACTOR)
+                best[idx] = np.maximum(best[idx], np.frombuffer(weights, dtype=np.float32).astype(np.float64) * factor)
+            matched &= best > 0
+            total += best
+        candidates = np.flatnonzero(matched)
+        if candidates.size > limit:
+            # Keep everything tied with the limit-th score so ties break by index, as in _search_dicts
+            cutoff = -np.partition(-total[candidates], limit - 1)[limit - 1]
+            candidates = candidates[total[candidates] >= cutoff]
+        order = np.lexsort((candidates, -total[candidates]))[:limit]
+        return [(int(d), float(total[d])) for d in candidates[order]]
+
+
+def index_path_for(filepath):
+    """The index is kept next to the bank's compiled cache."""
+    from question_bank import cache_path_for
+    return os.path.splitext(cache_path_for(filepath))[0] + '.search'
+
+
+def write_index(filepath, bank, index=None):
+    """Builds (unless given) and stores the search index of a compiled bank."""
+    index = index or SearchIndex.build(bank.questions)
+    path = index_path_for(filepath)
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'sha1': bank.digest}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump({'postings': index.postings, 'n_docs': index.n_docs}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"Could not write search index '{path}': {e}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    _indexes[bank.digest] = index
+    return index
+
+
+def _read_index(path, digest):
+    try:
+        with open(path, 'rb') as f:
+            header = pickle.load(f)
+            if not isinstance(header, dict) or header.get('version') != INDEX_VERSION or header.get('sha1') != digest:
+                return None
+            payload = pickle.load(f)
+        return SearchIndex(payload['postings'], payload['n_docs'])
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable search index '{path}': {e}")
+        return None
+
+
+def index_for(filepath, bank):
+    """The bank's index from memory, then from disk, else freshly built and stored."""
+    index = _indexes.get(bank.digest)
+    if index is None:
+        index = _read_index(index_path_for(filepath), bank.digest)
+        if index is None:
+            return write_index(filepath, bank)
+        _indexes[bank.digest] = index
+    return index
@@ -0,0 +1,131 @@
+# File: search_screen.py
+import threading
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.textinput import TextInput
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.clock import Clock, mainthread
+from question_bank import load_bank
+from search_index import index_for
+
+RESULT_LIMIT = 200
+# Wait this long after the last keystroke before searching
+SEARCH_DELAY = 0.15
+
+
+class SearchScreen(Screen):
+    """
+    Full-text search over the current bank's questions, options and explanations.
+    The matches can be started as a quiz of their own.
+    """
+    bank = None
+    index = None
+    bank_path = None
+    matches = ()
+
+    def on_enter(self):
+        quiz = self.manager.get_screen('quiz_screen')
+        path = quiz.bank_path
+        self.clear_widgets()
+        if not path:
+            self._show_message("Pick an exam first.")
+            return
+        if path != self.bank_path or self.index is None:
+            self._show_message("Preparing search...")
+            threading.Thread(target=self._load, args=(path,), name='search-index', daemon=True).start()
+        else:
+            self._build()
+
+    def _load(self, path):
+        try:
+            bank = load_bank(path)
+            index = index_for(path, bank)
+        except Exception as e:
+            print(f"Error preparing search for '{path}': {e}")
+            bank = index = None
+        self._loaded(path, bank, index)
+
+    @mainthread
+    def _loaded(self, path, bank, index):
+        if bank is None or index is None:
+            self._show_message("Search is not available for this exam.")
+            return
+        self.bank_path, self.bank, self.index = path, bank, index
+        self.matches = ()
+        if self.manager.current == self.name:
+            self._build()
+
+    def _show_message(self, text):
+        self.clear_widgets()
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=10)
+        layout.add_widget(Label(text=text, font_size=20))
+        btn_back = Button(text="Back to Quiz", size_hint=(1, None), height=56)
+        btn_back.bind(on_press=self.goto_quiz)
+        layout.add_widget(btn_back)
+        self.add_widget(layout)
+
+    def _build(self):
+        self.clear_widgets()
+        layout = BoxLayout(orientation='vertical', spacing=8, padding=[16, 16, 16, 12])
+        self.query_input = TextInput(multiline=False, size_hint_y=None, height=48, font_size=18,
+                                     hint_text="Search questions, e.g. sentinel automation rules")
+        self.query_input.bind(text=self._on_query)
+        layout.add_widget(self.query_input)
+        self.status_label = Label(size_hint_y=None, height=28, font_size=16)
+        layout.add_widget(self.status_label)
+
+        self.results = RecycleView(size_hint=(1, 1), bar_width=8)
+        self.results.viewclass = 'Label'
+        box = RecycleBoxLayout(orientation='vertical', default_size=(None, 72), default_size_hint=(1, None), size_hint_y=None, spacing=4)
+        box.bind(minimum_height=box.setter('height'))
+        self.results.add_widget(box)
+        layout.add_widget(self.results)
+
+        footer = BoxLayout(size_hint_y=None, height=56, spacing=10)
+        self.quiz_btn = Button(text="Quiz These", disabled=True, background_color=(0.16, 0.62, 0.28, 1))
+        self.quiz_btn.bind(on_press=self.quiz_matches)
+        btn_back = Button(text="Back to Quiz")
+        btn_back.bind(on_press=self.goto_quiz)
+        footer.add_widget(self.quiz_btn)
+        footer.add_widget(btn_back)
+        layout.add_widget(footer)
+        self.add_widget(layout)
+        self._search_ev = Clock.create_trigger(self._run_search, SEARCH_DELAY)
+        self._run_search()
+
+    def _on_query(self, instance, text):
+        self._search_ev()
+
+    def _run_search(self, *args):
+        query = self.query_input.text.strip()
+        hits = self.index.search(query, RESULT_LIMIT) if query else []
+        self.matches = [self.bank.questions[i] for i, _ in hits]
+        self.results.data = [{'text': self._snippet(q), 'font_size': 16, 'halign': 'left', 'valign': 'middle',
+                              'shorten': True, 'max_lines': 3, 'text_size': (self.width - 48, 72)}
+                             for q in self.matches]
+        self.results.scroll_y = 1
+        if not query:
+            self.status_label.text = f"{len(self.bank)} questions"
+        else:
+            more = "+" if len(hits) == RESULT_LIMIT else ""
+            self.status_label.text = f"{len(hits)}{more} matching questions"
+        self.quiz_btn.disabled = not self.matches
+        self.quiz_btn.text = f"Quiz These ({len(self.matches)})" if self.matches else "Quiz These"
+
+    @staticmethod
+    def _snippet(q):
+        text = ' '.join(str(q.get('question', '')).split())
+        topic = q.get('topic')
+        return f"[{topic}] {text}" if topic else text
+
+    def quiz_matches(self, instance):
+        """Starts a quiz made of the current matches, best ranked first."""
+        quiz = self.manager.get_screen('quiz_screen')
+        quiz.pending_questions = list(self.matches)
+        self.manager.current = 'quiz_screen'
+
+    def goto_quiz(self, instance):
+        self.manager.current = 'quiz_screen'
@@ -0,0 +1,137 @@
+# File: session_checkpoint.py
+import json
+import os
+import time
+from utils import get_storage_path
+
+CHECKPOINT_FILE = 'session_checkpoint.jsonl'
+# Bump whenever the record layout changes so old checkpoints are ignored.
+CHECKPOINT_VERSION = 1
+
+
+def _json_selection(selection):
+    """A selection in a JSON form that progress_db encodes the same way as the original."""
+    if isinstance(selection, (set, frozenset)):
+        return ''.join(sorted(selection))
+    if isinstance(selection, tuple):
+        return list(selection)
+    return selection
+
+
+class SessionCheckpoint:
+    """
+    Crash-safe record of the quiz in progress, so a session survives Android
+    killing the app. The first line holds the session (ordered question ids,
+    session id, seed and the answers so far); each submit appends one small
+    answer record. Lines are flushed to the OS as they are written, so they
+    survive the process being killed; sync() also fsyncs them (on pause).
+    A torn final line from a crash is ignored when loading.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_storage_path(CHECKPOINT_FILE)
+        self._file = None
+
+    def start(self, session, answers=()):
+        """Writes a fresh checkpoint for `session` (a quiz_session.QuizSession)."""
+        self.close()
+        header = {
+            'version': CHECKPOINT_VERSION,
+            'bank': session.bank_name,
+            'digest': session.bank.digest if session.bank is not None else None,
+            'session_id': session.session_id,
+            'seed': session.seed,
+            'started': time.time(),
+            'ids': [q['id'] for q in session.questions],
+            'answers': list(answers),
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(header, separators=(',', ':')) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        except Exception as e:
+            print(f"Error writing session checkpoint: {e}")
+
+    def record(self, index, question, selection, is_correct, ts):
+        """Appends the answer to question number `index`."""
+        if self._file is None:
+            return
+        rec = {'i': index, 'id': question['id'], 'ok': 1 if is_correct else 0,
+               'sel': _json_selection(selection), 'ts': ts}
+        try:
+            self._file.write(json.dumps(rec, separators=(',', ':')) + '\n')
+            self._file.flush()
+        except Exception as e:
+            print(f"Error writing session checkpoint: {e}")
+
+    def sync(self):
+        """Forces the appended records to disk."""
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except Exception as e:
+            print(f"Error syncing session checkpoint: {e}")
+
+    def load(self):
+        """
+        Returns the saved session as the header dict with 'answers' holding every
+        recorded answer in order ({'id', 'ok', 'sel', 'ts'}), or None.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.loads(f.readline())
+                if not isinstance(state, dict) or state.get('version') != CHECKPOINT_VERSION:
+                    return None
+                answers = state['answers']
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        print("Skipping incomplete checkpoint record")
+                        break
+                    if rec.get('i') == len(answers):
+                        answers.append({k: rec.get(k) for k in ('id', 'ok', 'sel', 'ts')})
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable session checkpoint: {e}")
+            return None
+        if len(answers) > len(state['ids']):
+            return None
+        return state
+
+    def close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def clear(self):
+        """Removes the checkpoint once its session is finished or abandoned."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error removing session checkpoint: {e}")
+
+
+_checkpoint = None
+
+
+def get_checkpoint():
+    """Returns the app-wide session checkpoint."""
+    global _checkpoint
+    if _checkpoint is None:
+        _checkpoint = SessionCheckpoint()
+    return _checkpoint
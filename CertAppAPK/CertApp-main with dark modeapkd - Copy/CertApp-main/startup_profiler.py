@@ -0,0 +1,77 @@
+# File: startup_profiler.py
+import json
+import os
+import time
+
+PROFILE_FILE = 'startup_profile.jsonl'
+# The report is written once every one of these phases has been marked (or on stop).
+REPORT_PHASES = ('imports', 'build', 'first_frame', 'first_on_enter', 'first_question_rendered')
+MAX_FILE_BYTES = 256 * 1024
+
+# Measured from the moment this module is imported; main.py imports it first.
+_start = time.perf_counter()
+_phases = {}
+_written = False
+
+
+def mark(phase):
+    """Records the time since process start for `phase` (first call per phase wins)."""
+    if phase in _phases:
+        return
+    _phases[phase] = round((time.perf_counter() - _start) * 1000, 2)
+    if all(p in _phases for p in REPORT_PHASES):
+        write_report()
+
+
+def marked(phase):
+    return phase in _phases
+
+
+def phases():
+    """Milliseconds since start per phase, in the order they were reached."""
+    return dict(_phases)
+
+
+def write_report(path=None):
+    """
+    Appends one JSON line with this launch's phase timings to startup_profile.jsonl.
+    Only the first call per process writes. The file is trimmed to its newer half
+    when it grows past MAX_FILE_BYTES.
+    """
+    global _written
+    if _written or not _phases:
+        return
+    _written = True
+    if path is None:
+        from utils import get_storage_path
+        path = get_storage_path(PROFILE_FILE)
+    record = {"date": time.strftime("%Y-%m-%d %H:%M:%S"), "phases_ms": _phases}
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) > MAX_FILE_BYTES:
+            with open(path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(lines[len(lines) // 2:])
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+    except Exception as e:
+        print(f"Could not write startup profile: {e}")
+
+
+def load_reports(path=None, n=20):
+    """Returns up to the last n recorded launches, newest last (for comparing regressions)."""
+    if path is None:
+        from utils import get_storage_path
+        path = get_storage_path(PROFILE_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()[-n:]
+    reports = []
+    for line in lines:
+        try:
+            reports.append(json.loads(line))
+        except ValueError:
+            continue
+    return reports
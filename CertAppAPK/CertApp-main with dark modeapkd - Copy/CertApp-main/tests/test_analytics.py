@@ -0,0 +1,70 @@
+"""Tests for the analytics statistics and chart rendering
+Run:  pytest -q
+"""
+import pytest
+
+pytest.importorskip('numpy')
+
+import analytics
+import progress_db
+from utils import question_id
+
+QA = {"question": "QA", "options": ["a", "b"], "answer": ["A"], "topic": "Alerts"}
+QB = {"question": "QB", "options": ["a", "b"], "answer": ["A"], "topic": "Hunting"}
+QC = {"question": "QC", "options": ["a", "b"], "answer": ["A"]}
+
+
+def _quiz(repo, start, answers):
+    sid = repo.start_session('demo', started=start)
+    for offset, (q, ok) in enumerate(answers):
+        repo.record_answer(sid, q, {"A"}, ok, ts=start + offset * 20)
+    correct = sum(ok for _, ok in answers)
+    repo.finish_session(sid, correct, len(answers), finished=start + len(answers) * 20)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = progress_db.ProgressRepository(str(tmp_path / 'p.db'))
+    repo.register_questions('demo', [QA, QB, QC])
+    _quiz(repo, 1000, [(QA, True), (QB, False), (QC, True)])
+    _quiz(repo, 5000, [(QB, False), (QA, True), (QB, True)])
+    _quiz(repo, 9000, [(QB, False), (QA, False)])
+    return repo
+
+
+def test_compute_over_history(repo):
+    stats = analytics.compute(repo.attempt_rows(), repo.session_scores(), repo.question_topics())
+    assert stats['attempts'] == 8 and stats['accuracy'] == 50.0
+    assert stats['scores'] == [66, 66, 0]
+    assert stats['rolling'] == [66.0, 66.0, 44.0]
+    # Gaps between quizzes (thousands of seconds) are not counted as answer time
+    assert stats['seconds_per_question'] == 20.0
+    assert [(name, attempts, acc) for name, attempts, acc, _ in stats['topics']] == [
+        ('Hunting', 4, 25.0), ('Alerts', 3, 66.7), (analytics.UNTAGGED, 1, 100.0)]
+    assert stats['missed'] == [(question_id(QB), 4, 75.0), (question_id(QA), 3, 33.3)]
+    assert repo.question_texts([question_id(QB)]) == {question_id(QB): 'QB'}
+
+
+def test_empty_history():
+    stats = analytics.compute([], [])
+    assert stats['attempts'] == 0 and stats['topics'] == [] and stats['rolling'] == []
+
+
+def test_version_changes_only_with_new_data(repo):
+    version = repo.analytics_version()
+    assert repo.analytics_version() == version
+    sid = repo.start_session('demo')
+    repo.record_answer(sid, QA, {"A"}, True)
+    assert repo.analytics_version() != version
+
+
+def test_rolling_mean():
+    assert analytics.rolling_mean([10, 20, 30, 40], window=2).tolist() == [10.0, 15.0, 25.0, 35.0]
+
+
+def test_render_chart_size(repo):
+    pytest.importorskip('matplotlib')
+    stats = analytics.compute(repo.attempt_rows(), repo.session_scores(), repo.question_topics())
+    w, h, pixels = analytics.render_chart(stats, 400, 300)
+    assert (w, h) == (400, 300) and len(pixels) == w * h * 4
+    assert analytics.render_chart(analytics.compute([], []), 400, 300) is None
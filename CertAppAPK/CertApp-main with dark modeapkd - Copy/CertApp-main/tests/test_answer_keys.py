@@ -0,0 +1,58 @@
+"""Tests for precompiled answer keys and batch grading
+Run:  pytest -q
+"""
+import itertools
+import sys
+
+import pytest
+
+from answer_keys import compile_answer_key, selection_code, grade, grade_many, MULTIPLE_CHOICE, YES_NO
+from question_bank import QuestionBank
+from utils import assign_question_ids, is_mc_selection_correct
+
+MC_CASES = [
+    (["Enable X", "Disable Y", "Monitor Z", "Audit W"], ["A", "B"]),
+    (["Enable X", "Disable Y", "Monitor Z", "Audit W"], ["Enable X", "Monitor Z"]),
+    (["A:", "B:", "C:", "D:"], ["A:", "B:", "C:", "D:"]),
+    (["Option 1", "Option 2", "Option 3"], "C."),
+    (["| where x", "| project y", "| take 1"], ["| where x", "| project y"]),
+]
+
+
+def test_keys_grade_like_is_mc_selection_correct():
+    for options, answer in MC_CASES:
+        key = compile_answer_key({"question": "q", "options": options, "answer": answer})
+        correct = answer if isinstance(answer, list) else [answer]
+        letters = [chr(65 + i) for i in range(len(options))]
+        for r in range(len(options) + 1):
+            for chosen in itertools.combinations(letters, r):
+                expected, display = is_mc_selection_correct(options, correct, set(chosen))
+                assert grade(key, selection_code(key, set(chosen))) == expected
+                assert key.display == display
+
+
+def test_yes_no_key_requires_every_group():
+    key = compile_answer_key({"question": "q", "options": ["Yes", "No"], "answer": ["Yes", "No", "Yes"]})
+    assert key.kind == YES_NO and key.groups == 3
+    assert grade(key, selection_code(key, ["Yes", "No", "Yes"]))
+    assert not grade(key, selection_code(key, ["Yes", "", "Yes"]))
+    assert not grade(key, selection_code(key, ["Yes", "Yes", "Yes"]))
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_grade_many_matches_single_grades(numpy, monkeypatch):
+    if numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setitem(sys.modules, 'numpy', None)
+    questions = assign_question_ids([{"question": f"q{i}", "options": o, "answer": a} for i, (o, a) in enumerate(MC_CASES)]
+                                    + [{"question": "yn", "options": ["Yes", "No"], "answer": ["Yes", "No"]}])
+    bank = QuestionBank(questions, 0, 0, '')
+    selections = {YES_NO: (["Yes", "No"], ["Yes", ""]), MULTIPLE_CHOICE: ({"A", "B"}, {"C"})}
+    session = [(q, key, selection) for q in reversed(questions) for key in [bank.answer_key(q)]
+               for selection in selections[key.kind]]
+    keys = [key for _, key, _ in session]
+    codes = [selection_code(key, selection) for _, key, selection in session]
+    rows = [bank.rows[q['id']] for q, _, _ in session]
+    assert grade_many(bank.key_codes, rows, codes) == [grade(key, code) for key, code in zip(keys, codes)]
+    assert any(grade_many(bank.key_codes, rows, codes)) and grade_many(bank.key_codes, [], []) == []
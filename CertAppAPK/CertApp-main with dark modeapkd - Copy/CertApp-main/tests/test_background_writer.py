@@ -0,0 +1,83 @@
+"""Tests for the background writer and atomic JSON saves
+Run:  pytest -q
+"""
+import json
+import os
+import threading
+
+import progress_db
+from background_writer import BackgroundWriter
+from utils import save_json, question_id
+
+
+def test_queued_saves_to_one_path_coalesce(tmp_path):
+    writer = BackgroundWriter()
+    gate = threading.Event()
+    writer.submit('block', gate.wait)  # keeps the worker busy while we queue
+    path = tmp_path / 'asked.json'
+    for i in range(5):
+        writer.save_json(str(path), [i])
+    assert writer.pending() == 2  # the blocker plus one coalesced save
+    assert writer.flush(timeout=0.05) is False
+    gate.set()
+    assert writer.flush(timeout=5)
+    assert json.loads(path.read_text()) == [4]
+
+
+def test_failed_job_does_not_stop_the_writer(tmp_path, capsys):
+    writer = BackgroundWriter()
+    writer.submit('bad', lambda: 1 / 0)
+    writer.save_json(str(tmp_path / 'ok.json'), {"ok": True})
+    assert writer.flush(timeout=5)
+    assert json.loads((tmp_path / 'ok.json').read_text()) == {"ok": True}
+    assert "Error in background write" in capsys.readouterr().out
+
+
+def test_save_json_replaces_atomically(tmp_path):
+    path = tmp_path / 'data.json'
+    save_json(str(path), {"v": 1})
+    try:
+        save_json(str(path), {"v": object()})  # not serializable: fails mid-write
+    except TypeError:
+        pass
+    assert json.loads(path.read_text()) == {"v": 1}
+    assert os.listdir(tmp_path) == ['data.json']
+
+
+def test_repository_commits_batches_on_the_writer_thread(tmp_path):
+    writer = BackgroundWriter()
+    repo = progress_db.ProgressRepository(str(tmp_path / 'p.db'), batch_size=2, writer=writer)
+    q = {"question": "Q1", "options": ["a", "b"], "answer": ["A"]}
+    sid = repo.start_session('demo')
+    repo.record_answer(sid, q, {"A"}, True, ts=100)
+    repo.record_answer(sid, q, {"B"}, False, ts=101)
+    assert repo.finish_session(sid, 1, 2, finished=200)['score'] == 50
+    assert writer.flush(timeout=5)
+    assert repo.conn.execute('SELECT COUNT(*) FROM attempts').fetchone()[0] == 2
+    assert repo.recent_sessions(1)[0]['total'] == 2
+    assert repo.question_stats()[question_id(q)]['asked'] == 2
+    repo.close()
+
+
+def test_queuing_answers_does_not_wait_for_a_running_flush(tmp_path):
+    writer = BackgroundWriter()
+    repo = progress_db.ProgressRepository(str(tmp_path / 'p.db'), batch_size=1, writer=writer)
+    q = {"question": "Q1", "options": ["a", "b"], "answer": ["A"]}
+    sid = repo.start_session('demo')
+    started, release = threading.Event(), threading.Event()
+    write_answers = repo._write_answers
+
+    def slow_write(batch):
+        started.set()
+        release.wait(5)
+        write_answers(batch)
+    repo._write_answers = slow_write
+    repo.record_answer(sid, q, {"A"}, True, ts=100)
+    assert started.wait(5)  # the writer thread is now inside the transaction
+    done = threading.Event()
+    threading.Thread(target=lambda: (repo.record_answer(sid, q, {"B"}, False, ts=101), done.set())).start()
+    assert done.wait(1)
+    release.set()
+    assert writer.flush(timeout=5)
+    assert repo.question_stats()[question_id(q)]['asked'] == 2
+    repo.close()
@@ -0,0 +1,81 @@
+"""Tests for the bank catalog and its manifest
+Run:  pytest -q
+"""
+import json
+import os
+
+import pytest
+
+import bank_catalog
+import utils
+from background_writer import get_writer
+from question_bank import file_digest
+from utils import scan_topics
+
+BANK = {"Tópico 1": [{"question": f"Q{i} é", "options": ["a", "b"], "answer": ["A"]} for i in range(3)],
+        "note": "not a topic",
+        "Topic 2": [{"question": "Last", "options": ["a", "b"], "answer": ["B"]}]}
+
+
+def write(path, data, crlf=False):
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    path.write_bytes((text.replace('\n', '\r\n') if crlf else text).encode('utf-8'))
+
+
+def test_topics_are_counted_without_loading_questions(tmp_path):
+    path = tmp_path / 'bank.json'
+    write(path, BANK, crlf=True)
+    assert scan_topics(str(path), chunk_size=7) == [("Tópico 1", 3), ("Topic 2", 1)]
+
+    write(path, BANK["Topic 2"])
+    assert scan_topics(str(path)) == [(None, 1)]
+
+
+@pytest.fixture
+def catalog_dirs(tmp_path):
+    data, extra = tmp_path / 'data', tmp_path / 'questions'
+    data.mkdir()
+    extra.mkdir()
+    write(data / 'sc-200.json', BANK)
+    write(extra / 'sc-200.json', BANK)  # identical copy, listed once
+    write(extra / 'az-500.json', {"Topic 1": BANK["Topic 2"]})
+    return data, extra, tmp_path / 'manifest.json'
+
+
+def test_manifest_is_built_once_and_lists_banks_without_parsing(catalog_dirs, monkeypatch):
+    data, extra, manifest = catalog_dirs
+    banks = bank_catalog.BankCatalog((data, extra), str(manifest)).refresh()
+    assert [(b['title'], b['count']) for b in banks] == [('AZ-500', 1), ('SC-200', 4)]
+    assert banks[1]['path'] == str(data / 'sc-200.json')
+    assert banks[1]['id'] == file_digest(data / 'sc-200.json')
+    assert get_writer().flush(timeout=5)
+
+    monkeypatch.setattr(bank_catalog, 'scan_topics', lambda path: pytest.fail("bank parsed despite manifest"))
+    monkeypatch.setattr(bank_catalog, 'file_digest', lambda path: pytest.fail("bank hashed despite manifest"))
+    again = bank_catalog.BankCatalog((data, extra), str(manifest))
+    assert again.refresh() == banks
+    assert again.get(banks[1]['id'])['topics'][0] == {'name': "Tópico 1", 'count': 3}
+    assert again.bank_id(str(data / 'sc-200.json')) == banks[1]['id']
+
+
+def test_only_changed_banks_are_rescanned(catalog_dirs, monkeypatch):
+    data, extra, manifest = catalog_dirs
+    catalog = bank_catalog.BankCatalog((data, extra), str(manifest))
+    catalog.refresh()
+    scanned = []
+    monkeypatch.setattr(bank_catalog, 'scan_topics', lambda path: scanned.append(path) or utils.scan_topics(path))
+
+    st = os.stat(data / 'sc-200.json')
+    os.utime(data / 'sc-200.json', ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # touched only
+    write(extra / 'az-500.json', BANK)  # now the same content as sc-200
+    banks = catalog.refresh()
+    assert scanned == [str(extra / 'az-500.json')]
+    assert [b['title'] for b in banks] == ['SC-200']
+
+
+def test_same_named_banks_in_different_folders_get_different_ids(catalog_dirs):
+    data, extra, manifest = catalog_dirs
+    write(extra / 'sc-200.json', {"Other": BANK["Tópico 1"]})  # same name, different exam
+    banks = bank_catalog.BankCatalog((data, extra), str(manifest)).refresh()
+    ids = {b['path']: b['id'] for b in banks}
+    assert ids[str(data / 'sc-200.json')] != ids[str(extra / 'sc-200.json')]
@@ -0,0 +1,51 @@
+"""Tests for the explanation Markdown to Kivy markup compiler
+Run:  pytest -q
+"""
+import json
+
+import pytest
+
+import question_bank as qb
+from explanation_markup import to_markup, split_chunks, content_key, compile_explanation
+
+
+def test_inline_markdown_and_escaping():
+    assert to_markup("**Bold** and *it* with [x] & y") == "[b]Bold[/b] and [i]it[/i] with &bl;x&br; &amp; y"
+    assert to_markup("Use **`KQL`** here") == "Use [b][font=RobotoMono-Regular][color=ffd479]KQL[/color][/font][/b] here"
+    assert to_markup("`a*b*c` 3*4*5") == "[font=RobotoMono-Regular][color=ffd479]a*b*c[/color][/font] 3*4*5"
+
+
+def test_lists_headings_and_links():
+    text = "# Why\n- first\n2) second: see https://learn.microsoft.com/x?a=1&b=2."
+    assert to_markup(text).split('\n') == [
+        "[b]Why[/b]",
+        "  • first",
+        "  2. second: see [ref=https://learn.microsoft.com/x?a=1&b=2][color=6cb4ff][u]"
+        "https://learn.microsoft.com/x?a=1&amp;b=2[/u][/color][/ref].",
+    ]
+
+
+def test_chunks_split_between_lines_only():
+    markup = to_markup('\n'.join(f"- **line {i}** " + 'x' * 50 for i in range(100)))
+    chunks = split_chunks(markup, 500)
+    assert len(chunks) > 1
+    assert '\n'.join(chunks) == markup
+    assert all(c.count('[b]') == c.count('[/b]') for c in chunks)
+    assert compile_explanation('') == ('',)
+
+
+def test_markup_is_compiled_into_the_bank_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(qb, 'get_storage_path', lambda name: str(tmp_path / name))
+    qb.clear_memory_cache()
+    questions = [{"question": "Q1", "options": ["A", "B"], "answer": "A", "explanation": "**Because** A"},
+                 {"question": "Q2", "options": ["A", "B"], "answer": "B", "explanation": "**Because** A"}]
+    path = tmp_path / 'bank.json'
+    path.write_text(json.dumps({"Topic 1": questions}))
+    bank = qb.load_bank(str(path))
+    assert bank.explanations == {content_key("**Because** A"): ("[b]Because[/b] A",)}
+
+    qb.clear_memory_cache()
+    monkeypatch.setattr(qb, 'compile_explanation', lambda text: pytest.fail("markup recompiled"))
+    monkeypatch.setattr(qb, 'compile_explanations', lambda qs: pytest.fail("markup recompiled"))
+    cached = qb.load_bank(str(path))
+    assert cached.explanation_chunks(cached.questions[1]) == ("[b]Because[/b] A",)
@@ -0,0 +1,41 @@
+"""Tests for the streaming question-file loader
+Run:  pytest -q
+"""
+import json
+
+from utils import iter_json_items, iter_questions, load_json
+
+NESTED = {"question": "Pick {one} }{ of these", "options": ["a {b}", "c"], "answer": ["A"],
+          "meta": {"k": {"z": 1}}, "points": 12345}
+
+
+def test_topic_dict_streams_items_with_topics(tmp_path):
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps({"Topic 1": [NESTED, {"question": "Q2"}], "Topic 2": [{"question": "Q3"}]}, indent=2))
+    items = list(iter_json_items(str(path), chunk_size=7))
+    assert [(t, q['question']) for t, q in items] == [("Topic 1", NESTED['question']), ("Topic 1", "Q2"), ("Topic 2", "Q3")]
+    assert items[0][1]['points'] == 12345
+
+
+def test_concatenated_objects_with_nested_braces_and_a_broken_one(tmp_path):
+    path = tmp_path / "legacy.json"
+    path.write_text(json.dumps(NESTED, indent=2) + "\n" + json.dumps({"question": "B"}) + "\n{broken\n"
+                    + json.dumps({"question": "C"}))
+    assert [q['question'] for q in iter_questions(str(path), chunk_size=5)] == [NESTED['question'], "B", "C"]
+
+
+def test_load_json_keeps_arrays_and_stamps_ids(tmp_path):
+    path = tmp_path / "list.json"
+    path.write_text(json.dumps([{"date": "x", "total": 3}, dict(NESTED)]))
+    items = load_json(str(path))
+    assert items[0] == {"date": "x", "total": 3}
+    assert items[1]['id'] == load_json(str(path))[1]['id']
+
+
+def test_numbers_split_at_a_chunk_boundary(tmp_path):
+    path = tmp_path / "legacy.json"
+    text = json.dumps({"question": "A", "points": 12.5}) + "\n" + json.dumps({"question": "B", "weight": -1.5e-3})
+    path.write_text(text)
+    for size in range(1, len(text) + 1):
+        items = list(iter_questions(str(path), chunk_size=size))
+        assert [(q['question'], q.get('points', q.get('weight'))) for q in items] == [("A", 12.5), ("B", -1.5e-3)]
@@ -0,0 +1,72 @@
+"""Tests for the performance tracing API
+Run:  pytest -q
+"""
+import json
+
+import pytest
+
+import perf_trace
+import progress_db
+import question_bank as qb
+
+
+@pytest.fixture
+def tracing(monkeypatch):
+    monkeypatch.setattr(perf_trace, '_enabled', True)
+    monkeypatch.setattr(perf_trace, '_recent', {})
+    monkeypatch.setattr(perf_trace, '_buffer', [])
+    return perf_trace
+
+
+def test_nothing_is_recorded_while_tracing_is_off(monkeypatch):
+    monkeypatch.setattr(perf_trace, '_enabled', False)
+    monkeypatch.setattr(perf_trace, '_recent', {})
+    with perf_trace.span('work'):
+        pass
+    assert perf_trace.traced('fn')(lambda: 3)() == 3
+    assert perf_trace.summary() == {}
+
+
+def test_spans_and_wrapped_functions_record_samples(tracing, tmp_path, monkeypatch):
+    with tracing.span('work'):
+        [object() for _ in range(100)]
+    monkeypatch.setattr(qb, 'get_storage_path', lambda name: str(tmp_path / name))
+    qb.clear_memory_cache()
+    path = tmp_path / 'bank.json'
+    path.write_text(json.dumps([{"question": "Q", "options": ["a"], "answer": ["A"]}]))
+    bank = qb.load_bank(str(path))  # parsed and compiled
+    qb.clear_memory_cache()
+    qb.load_bank(str(path))  # read back from the compiled cache
+    qb.clear_memory_cache()
+    repo = progress_db.ProgressRepository(str(tmp_path / 'p.db'))
+    repo.record_answer(repo.start_session(), bank.questions[0], {"A"}, True)
+    repo.flush()
+    repo.flush()  # nothing pending: not traced
+
+    stats = tracing.summary()
+    assert stats['work']['n'] == 1 and stats['bank_compile']['n'] == 1 and stats['bank_unpickle']['n'] == 1
+    assert stats['progress_flush']['n'] == 1
+    assert stats['bank_compile']['p50'] <= stats['bank_compile']['max']
+    assert {'t', 'name', 'ms', 'blocks'} <= set(tracing._buffer[0])
+
+
+def test_percentiles():
+    stats = perf_trace.percentiles([float(i) for i in range(1, 101)])
+    assert (stats['n'], stats['p50'], stats['p95'], stats['max']) == (100, 51.0, 95.0, 100.0)
+    assert perf_trace.percentiles([])['n'] == 0
+
+
+def test_trace_file_is_appended_and_rotated(tracing, tmp_path, monkeypatch):
+    path = str(tmp_path / 'perf_trace.jsonl')
+    monkeypatch.setattr(perf_trace, 'MAX_FILE_BYTES', 200)
+    for i in range(5):
+        tracing.record('step', float(i))
+    tracing.flush(path)
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line)['ms'] for line in f] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    tracing.record('step', 5.0)
+    tracing.flush(path)
+    assert (tmp_path / 'perf_trace.jsonl.1').exists()
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line)['ms'] for line in f] == [5.0]
@@ -0,0 +1,85 @@
+"""Tests for the SQLite progress repository
+Run:  pytest -q
+"""
+import json
+import types
+
+import pytest
+
+import progress_db
+from utils import question_id
+
+Q1 = {"question": "Q1", "options": ["a", "b"], "answer": ["A"]}
+Q2 = {"question": "Q2", "options": ["a", "b"], "answer": ["B"]}
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(progress_db, 'get_storage_path', lambda name: str(tmp_path / name))
+    monkeypatch.setattr(progress_db, '_repositories', {})
+    return tmp_path
+
+
+def test_batched_answers_update_stats_and_history(storage):
+    repo = progress_db.ProgressRepository(str(storage / 'p.db'), batch_size=3)
+    sid = repo.start_session('sc-200')
+    repo.record_answer(sid, Q1, {"A"}, True, ts=100)
+    repo.record_answer(sid, Q2, {"A"}, False, ts=101)
+    assert repo.conn.execute('SELECT COUNT(*) FROM attempts').fetchone()[0] == 0  # still batched
+    entry = repo.finish_session(sid, 1, 2)
+    assert entry['score'] == 50
+    assert repo.recent_sessions(10)[0]['total'] == 2
+    stats = repo.question_stats()
+    assert stats[question_id(Q2)]['asked'] == 1 and stats[question_id(Q2)]['correct'] == 0
+
+
+def test_reads_include_queued_answers_without_flushing(storage):
+    repo = progress_db.ProgressRepository(str(storage / 'p.db'))
+    old = repo.start_session('sc-200', started=1)
+    repo.record_answer(old, Q1, {"A"}, True, ts=5, schedule=(1, 2.5, 1.0, 86405))
+    repo.finish_session(old, 1, 1, finished=30)
+    repo.writer = types.SimpleNamespace(submit=lambda key, job: None)  # flush requests are dropped
+    sid = repo.start_session('sc-200', started=50)
+    repo.record_answer(sid, Q1, {"B"}, False, ts=100)
+    repo.record_answer(sid, Q2, {"A"}, False, ts=101, schedule=(0, 2.3, 1.0, 86501))
+    repo.finish_session(sid, 0, 2, finished=200)
+    version, stats, recent = repo.analytics_version(), repo.question_stats(), repo.recent_sessions(5)
+    assert repo.conn.execute('SELECT COUNT(*) FROM attempts').fetchone()[0] == 1  # nothing else was flushed
+    assert [(r['total'], r['score']) for r in recent] == [(2, 0), (1, 100)]
+    assert {qid: (s['asked'], s['correct'], s['last_ts'], s['reps']) for qid, s in stats.items()} == {
+        question_id(Q1): (2, 1, 100, 1), question_id(Q2): (1, 0, 101, 0)}
+    repo.flush()
+    assert (repo.question_stats(), repo.recent_sessions(5), repo.analytics_version()) == (stats, recent, version)
+
+
+def test_missed_questions_window_and_reset(storage):
+    repo = progress_db.ProgressRepository(str(storage / 'p.db'))
+    sid = repo.start_session()
+    now = 100 * 86400
+    for ts in (now - 40 * 86400, now - 2, now - 1):
+        repo.record_answer(sid, Q1, {"B"}, False, ts=ts)
+    repo.record_answer(sid, Q2, {"A"}, False, ts=now - 1)
+    assert repo.missed_questions(min_misses=2, days=30, now=now) == [question_id(Q1)]
+    assert repo.reset_learned() == 2
+    assert repo.question_stats() == {}
+    assert repo.missed_questions(min_misses=1, now=now) == []
+
+
+def test_zero_total_session_is_dropped(storage):
+    repo = progress_db.ProgressRepository(str(storage / 'p.db'))
+    assert repo.finish_session(repo.start_session(), 0, 0) is None
+    assert repo.recent_sessions() == []
+
+
+def test_legacy_json_files_are_imported_once(storage):
+    (storage / 'asked_questions.json').write_text(json.dumps([Q1, Q2, Q1]))
+    (storage / 'score_history.json').write_text(json.dumps(
+        [{"date": "2024-01-01 10:00:00", "correct": 3, "total": 4, "score": 75}, {"total": 0}]))
+    repo = progress_db.get_repository()
+    assert repo.recent_sessions() == [{"date": "2024-01-01 10:00:00", "correct": 3, "total": 4, "score": 75}]
+    stats = repo.question_stats()
+    assert (stats[question_id(Q1)]['asked'], stats[question_id(Q2)]['asked'], stats[question_id(Q1)]['correct']) == (2, 1, 0)
+    assert not (storage / 'asked_questions.json').exists()
+    assert not (storage / 'score_history.json').exists()
+    repo.import_legacy()
+    assert len(repo.recent_sessions()) == 1
@@ -0,0 +1,110 @@
+"""Tests for the compiled question-bank cache
+Run:  pytest -q
+"""
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import question_bank as qb
+from utils import assign_question_ids, find_duplicate_questions
+
+
+@pytest.fixture
+def bank_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(qb, 'get_storage_path', lambda name: str(tmp_path / 'storage' / name))
+    qb.clear_memory_cache()
+    path = tmp_path / 'bank.json'
+    path.write_text(json.dumps({"Topic 1": [{"question": "Q1", "options": ["a", "b"], "answer": ["A"]}],
+                                "Topic 2": [{"question": "Q2", "options": ["a", "b"], "answer": ["B"]}]}))
+    yield path
+    qb.clear_memory_cache()
+
+
+def test_first_load_compiles_cache_and_flattens(bank_file):
+    bank = qb.load_bank(str(bank_file))
+    assert [q['question'] for q in bank.questions] == ["Q1", "Q2"]
+    assert os.path.exists(qb.cache_path_for(str(bank_file)))
+
+
+def test_later_loads_use_memory_then_disk_cache(bank_file, monkeypatch):
+    first = qb.load_bank(str(bank_file))
+    assert qb.load_bank(str(bank_file)) is first
+
+    qb.clear_memory_cache()
+    monkeypatch.setattr(qb, 'iter_questions', lambda path: pytest.fail("JSON re-parsed despite valid cache"))
+    assert qb.load_bank(str(bank_file)).questions == first.questions
+
+
+def test_touched_but_unchanged_source_keeps_cache(bank_file, monkeypatch):
+    qb.load_bank(str(bank_file))
+    qb.clear_memory_cache()
+    st = os.stat(bank_file)
+    os.utime(bank_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    monkeypatch.setattr(qb, 'iter_questions', lambda path: pytest.fail("JSON re-parsed for identical content"))
+    assert len(qb.load_bank(str(bank_file))) == 2
+
+
+def test_changed_source_invalidates_cache(bank_file):
+    qb.load_bank(str(bank_file))
+    bank_file.write_text(json.dumps([{"question": "Only", "options": ["a"], "answer": "A"}]))
+    assert [q['question'] for q in qb.load_bank(str(bank_file)).questions] == ["Only"]
+
+
+def test_questions_get_stable_ids_and_index(bank_file):
+    bank = qb.load_bank(str(bank_file))
+    ids = [q['id'] for q in bank.questions]
+    assert len(set(ids)) == 2
+    assert bank.get(ids[1])['question'] == "Q2"
+    qb.clear_memory_cache()
+    bank_file.write_text(bank_file.read_text() + "\n")  # same content, new file
+    assert [q['id'] for q in qb.load_bank(str(bank_file)).questions] == ids
+
+
+def test_load_bank_waits_for_a_stream_of_the_same_file(bank_file, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    parse, compile_bank = qb.iter_questions, qb.compile_bank
+
+    def slow_parse(path):
+        started.set()
+        for q in parse(path):
+            release.wait(5)
+            yield q
+    compiled, loaded = [], []
+    monkeypatch.setattr(qb, 'iter_questions', slow_parse)
+    monkeypatch.setattr(qb, 'compile_bank', lambda path, questions=None: compiled.append(path) or compile_bank(path, questions))
+
+    stream = qb.BankStream(str(bank_file))
+    started.wait(5)
+    loader = threading.Thread(target=lambda: loaded.append(qb.load_bank(str(bank_file))))
+    loader.start()
+    time.sleep(0.05)  # let the loader reach the compile lock
+    release.set()
+    stream.join(5)
+    loader.join(5)
+    assert len(compiled) == 1 and loaded == [stream.bank]
+    cache_dir = os.path.dirname(qb.cache_path_for(str(bank_file)))
+    assert not [name for name in os.listdir(cache_dir) if name.endswith('.tmp')]
+
+
+def test_stream_reuses_a_bank_compiled_while_it_waited(bank_file, monkeypatch):
+    compile_bank, compiled = qb.compile_bank, []
+    monkeypatch.setattr(qb, 'compile_bank', lambda path, questions=None: compiled.append(path) or compile_bank(path, questions))
+    with qb._compile_lock(str(bank_file)):
+        stream = qb.BankStream(str(bank_file))  # blocks on the lock held here
+        bank = qb.compile_bank(str(bank_file))
+        qb._remember(str(bank_file), bank)
+    stream.join(5)
+    assert len(compiled) == 1 and stream.bank is bank and stream.questions == bank.questions
+
+
+def test_duplicates_and_collisions_are_detected():
+    same = {"question": "Q", "options": ["a"], "answer": "A"}
+    questions = [dict(same), dict(same),
+                 {"id": "x1", "question": "R", "options": ["a"], "answer": "A"},
+                 {"id": "x1", "question": "S", "options": ["a"], "answer": "A"}]
+    duplicates, collisions = find_duplicate_questions(assign_question_ids(questions))
+    assert duplicates == [[0, 1]]
+    assert collisions == [[2, 3]]
@@ -6,7 +6,7 @@ import builtins
 import types
 import pytest
 
-import quiz_app as qa
+import utils as qa
 
 
 def test_normalize_accepts_letters_and_texts():
@@ -20,6 +20,25 @@ def test_normalize_accepts_letters_and_texts():
     assert qa.normalize_mc_answer_to_letters(options, ["Enable X", "Disable Y"]) == {"A", "B"}
 
 
+def test_option_text_takes_precedence_over_a_leading_letter():
+    options = ["Enable X", "Disable Y", "Monitor Z", "Audit W"]
+    # "Disable Y" starts with D and "Audit W" with A, which are option letters too
+    assert qa.normalize_mc_answer_to_letters(options, ["Disable Y"]) == {"B"}
+    assert qa.normalize_mc_answer_to_letters(options, ["Audit W", "C"]) == {"C", "D"}
+
+
+def test_letter_tokens_accepted_by_the_old_first_token_fallback():
+    options = ["Option 1", "Option 2", "Option 3", "Option 4"]
+    for raw, letter in [("a", "A"), ("b:", "B"), ("C.", "C"), ("D.:", "D"), ("A: Option 1", "A"), ("B) text", "B")]:
+        assert qa.normalize_mc_answer_to_letters(options, [raw]) == {letter}
+
+
+def test_words_starting_with_a_letter_are_not_letters():
+    options = ["Option 1", "Option 2", "Option 3", "Option 4"]
+    assert qa.normalize_mc_answer_to_letters(options, ["Block sign-ins"]) == set()
+    assert qa.normalize_mc_answer_to_letters(options, ["E"]) == set()  # beyond the last option
+
+
 def test_selection_correct_when_all_four_required():
     options = ["A:", "B:", "C:", "D:"]  # when JSON stores options as letter-like strings
     correct = ["A:", "B:", "C:", "D:"]
@@ -0,0 +1,74 @@
+"""Tests for starting a quiz while the bank is still streaming in
+Run:  pytest -q
+"""
+import json
+import os
+import types
+
+import pytest
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+pytest.importorskip('kivy')
+
+from kivy.clock import Clock  # noqa: E402
+
+import progress_db  # noqa: E402
+import question_bank as qb  # noqa: E402
+import search_index  # noqa: E402
+import quiz_screen  # noqa: E402
+from session_checkpoint import SessionCheckpoint  # noqa: E402
+
+QUESTIONS = [{"question": f"Q{i}", "options": ["a", "b"], "answer": ["A"]} for i in range(6)]
+
+
+@pytest.fixture
+def screen(tmp_path, monkeypatch):
+    for mod in (qb, search_index):
+        monkeypatch.setattr(mod, 'get_storage_path', lambda name: str(tmp_path / 'storage' / name), raising=False)
+    monkeypatch.setattr(quiz_screen, 'get_checkpoint', lambda: SessionCheckpoint(str(tmp_path / 'cp.jsonl')))
+    qb.clear_memory_cache()
+    path = tmp_path / 'bank.json'
+    path.write_text(json.dumps(QUESTIONS))
+    screen = quiz_screen.QuizScreen(name='quiz_screen')
+    screen.repo = progress_db.ProgressRepository(str(tmp_path / 'p.db'))
+    screen.bank_id = 'bank'
+    screen.bank_path = str(path)
+    screen.display_question = lambda: None
+    yield screen
+    qb.clear_memory_cache()
+
+
+def test_poll_applies_the_streamed_bank_before_the_mainthread_callback(screen):
+    stream = qb.BankStream(screen.bank_path, on_done=screen._on_bank_streamed)
+    stream.join()
+    screen._stream = stream
+    # The stream is done but its @mainthread callback has not run yet (no Clock tick)
+    screen._start_when_ready(None)
+    assert screen.bank is stream.bank
+    assert screen.session.scheduler is screen.scheduler and len(screen.session) == len(QUESTIONS)
+
+    scheduler = screen.scheduler
+    Clock.tick()  # the queued callback sees the same bank and keeps the scheduler
+    assert screen.scheduler is scheduler
+
+
+def test_early_session_moves_to_the_full_scheduler(screen):
+    bank = qb.load_bank(screen.bank_path)
+    screen._stream = types.SimpleNamespace(done=False, questions=bank.questions[:3], bank=None)
+    screen._start_when_ready(2)
+    session = screen.session
+    first = session.current
+    session.submit({"A"})
+    session.advance()
+
+    screen._stream.done, screen._stream.bank = True, bank
+    screen._use_bank(bank)  # what _on_bank_streamed does once loading ends
+    assert session.scheduler is screen.scheduler and len(screen.scheduler) == len(QUESTIONS)
+    assert screen.scheduler.state(first['id']).reps == 1
+
+    second = session.current
+    session.submit({"A"})
+    assert screen.scheduler.state(second['id']).reps == 1
+    # Both answered questions are due later, so a restart draws the unseen ones first
+    assert {q['id'] for q in screen.scheduler.next_batch(4)}.isdisjoint({first['id'], second['id']})
@@ -0,0 +1,76 @@
+"""Tests for the headless QuizSession engine
+Run:  pytest -q
+"""
+import os
+import random
+import subprocess
+import sys
+
+from answer_keys import compile_answer_key, selection_code
+from quiz_session import QuizSession
+from scheduler import Scheduler
+from utils import assign_question_ids
+
+QUESTIONS = assign_question_ids(
+    [{"question": f"Q{i}", "options": ["a", "b", "c"], "answer": ["A"]} for i in range(8)]
+    + [{"question": "YN", "options": ["Yes", "No"], "answer": ["Yes", "No"]}])
+
+
+class FakeRepo:
+    def __init__(self):
+        self.calls = []
+
+    def start_session(self, bank):
+        self.calls.append(('start', bank))
+        return 7
+
+    def record_answer(self, session_id, question, selection, is_correct, ts=None, schedule=None):
+        self.calls.append(('answer', session_id, question['id'], is_correct))
+
+    def finish_session(self, session_id, correct, total):
+        self.calls.append(('finish', session_id, correct, total))
+        return {"correct": correct, "total": total}
+
+
+def test_session_grades_scores_and_persists():
+    repo = FakeRepo()
+    session = QuizSession(Scheduler(QUESTIONS, rng=random.Random(0)), limit=4, repo=repo, bank_name='demo')
+    assert len(session) == 4
+    while not session.finished:
+        q = session.current
+        right = compile_answer_key(q).kind == 0 and session.index % 2 == 0
+        session.submit({"A"} if right else {"B"})
+        session.advance()
+    assert session.finish() == {"correct": session.correct_count, "total": 4}
+    assert repo.calls[0] == ('start', 'demo')
+    assert [c[0] for c in repo.calls].count('answer') == 4
+    assert repo.calls[-1][0] == 'finish'
+
+
+def test_simulated_sessions_accept_precomputed_codes():
+    scheduler = Scheduler(QUESTIONS, rng=random.Random(1))
+    for _ in range(50):
+        session = QuizSession(scheduler)
+        while not session.finished:
+            key = session.answer_key()
+            session.submit(key.code)
+            session.advance()
+        assert session.score == 100
+    yn = compile_answer_key(QUESTIONS[-1])
+    assert selection_code(yn, ["Yes", "No"]) == yn.code
+
+
+def test_engine_imports_without_kivy():
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, quiz_session, utils; print(any(m.split('.')[0] == 'kivy' for m in sys.modules))"
+    out = subprocess.run([sys.executable, '-c', code], cwd=here, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == 'False'
+
+
+def test_given_questions_replace_the_schedulers_pick():
+    scheduler = Scheduler(QUESTIONS, rng=random.Random(2))
+    picked = [QUESTIONS[3], QUESTIONS[5]]
+    session = QuizSession(scheduler, limit=8, questions=picked)
+    assert session.questions == picked and session.limit == 2
+    session.submit({"A"})
+    assert scheduler.state(QUESTIONS[3]['id']).reps == 1
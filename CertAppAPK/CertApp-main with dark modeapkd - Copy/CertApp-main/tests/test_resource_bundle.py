@@ -0,0 +1,66 @@
+"""Tests for the indexed image bundle and its build step
+Run:  pytest -q
+"""
+import io
+import os
+
+import pytest
+
+import resource_bundle
+from resource_bundle import ResourceBundle, build, resource_name, write_bundle
+
+
+def test_names_are_relative_to_the_images_folder():
+    assert resource_name("Images/meow.jpg") == "meow.jpg"
+    assert resource_name(".\\Images\\sub\\a.png") == "sub/a.png"
+    assert resource_name("other/a.png") == "other/a.png"
+
+
+def test_members_are_read_through_the_offset_table(tmp_path):
+    path = str(tmp_path / "Images.bundle")
+    write_bundle(path, [("Images/a.png", b"first"), ("b.jpg", b"second" * 100)],
+                 atlas="Images.atlas", atlas_ids={"small.png": "img0"})
+    bundle = ResourceBundle(path)
+    assert bundle.read("a.png") == b"first"
+    assert bundle.read(bundle.resolve("Images/b.jpg")) == b"second" * 100
+    assert bundle.resolve("b.jpg") == "bundle://b.jpg"
+    assert bundle.resolve("small.png") == f"atlas://{os.path.join(str(tmp_path), 'Images')}/img0"
+    assert bundle.resolve("missing.png") is None
+    assert len(bundle) == 3
+    bundle.close()
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "Images.bundle"
+    path.write_bytes(b"PK\x03\x04" + b"\0" * 64)
+    with pytest.raises(ValueError):
+        ResourceBundle(str(path))
+
+
+def test_build_downscales_and_packs_small_images_into_an_atlas(tmp_path):
+    PILImage = pytest.importorskip("PIL.Image")
+    src = tmp_path / "Images"
+    (src / "sub").mkdir(parents=True)
+    PILImage.new("RGB", (1600, 400), "red").save(src / "big.png")
+    PILImage.new("RGB", (64, 64), "blue").save(src / "sub" / "icon.png")
+    out = tmp_path / "out"
+
+    assert build(str(src), str(out), display_size=(800, 400)) == (1, 1)
+    bundle = ResourceBundle(str(out / resource_bundle.BUNDLE_FILE))
+    with PILImage.open(io.BytesIO(bundle.read("big.png"))) as img:
+        assert img.size == (800, 200)
+    assert bundle.resolve("Images/sub/icon.png").startswith("atlas://")
+    assert (out / "Images.atlas").exists()
+    bundle.close()
+
+
+def test_resolver_falls_back_to_resource_find(tmp_path, monkeypatch):
+    path = str(tmp_path / "Images.bundle")
+    write_bundle(path, [("a.png", b"x")])
+    monkeypatch.setattr(resource_bundle, "_bundle", ResourceBundle(path))
+    monkeypatch.setattr(resource_bundle, "_bundle_checked", True)
+    assert resource_bundle.resolve_image("Images/a.png") == "bundle://a.png"
+    image = tmp_path / "b.png"
+    image.write_bytes(b"y")
+    assert resource_bundle.resolve_image(str(image)) == str(image)
+    assert resource_bundle.resolve_image("nope.png") is None
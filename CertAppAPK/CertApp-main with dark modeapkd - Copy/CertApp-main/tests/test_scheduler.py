@@ -0,0 +1,39 @@
+"""Tests for the spaced-repetition scheduler
+Run:  pytest -q
+"""
+import random
+
+from scheduler import Scheduler, DAY
+from utils import question_id
+
+QUESTIONS = [{"question": f"Q{i}", "options": ["a", "b"], "answer": ["A"]} for i in range(20)]
+IDS = [question_id(q) for q in QUESTIONS]
+
+
+def test_missed_questions_come_before_unseen_and_learned():
+    now = 1000 * DAY
+    stats = {
+        IDS[0]: {'last_ok': 1, 'reps': 1, 'ease': 2.5, 'interval': 1.0, 'due': now + DAY},
+        IDS[1]: {'last_ok': 0, 'reps': 0, 'ease': 2.18, 'interval': 0.0, 'due': now - 60},
+        IDS[2]: {'last_ok': 0, 'last_ts': now - 5 * DAY},  # legacy stats without schedule columns
+    }
+    s = Scheduler(QUESTIONS, stats, now=now, rng=random.Random(1))
+    batch = [question_id(q) for q in s.next_batch(len(QUESTIONS))]
+    assert batch[:2] == [IDS[2], IDS[1]]
+    assert batch[-1] == IDS[0]
+
+
+def test_record_reschedules_and_unanswered_return_to_pool():
+    s = Scheduler(QUESTIONS, now=0, rng=random.Random(2))
+    first = [question_id(q) for q in s.next_batch(5)]
+    assert len(set(first)) == 5
+    ok = s.record(first[0], True, now=0)
+    assert ok.interval == 1.0 and ok.due == DAY
+    missed = s.record(first[1], False, now=0)
+    assert missed.ease < 2.5
+
+    # Abandoned questions are handed out again; the correctly answered one is not due yet
+    second = [question_id(q) for q in s.next_batch(len(QUESTIONS))]
+    assert set(first[2:]) <= set(second)
+    assert second[-1] == first[0]
+    assert len(second) == len(QUESTIONS)
@@ -0,0 +1,55 @@
+"""Tests for the inverted search index
+Run:  pytest -q
+"""
+import json
+
+import pytest
+
+import question_bank as qb
+import search_index
+from search_index import SearchIndex, tokenize
+
+QUESTIONS = [
+    {"question": "Configure Sentinel automation rules for incidents", "options": ["Playbook", "Rule"], "explanation": ""},
+    {"question": "Which table stores sign-in logs?", "options": ["SigninLogs", "AuditLogs"],
+     "explanation": "Sentinel automation can also use it"},
+    {"question": "Create an analytics rule", "options": ["Scheduled", "NRT"], "explanation": "Automated response"},
+]
+
+
+def test_tokenize_drops_stopwords_and_lowercases():
+    assert tokenize("Which table is the Sign-in log?") == ["table", "sign", "log"]
+
+
+def test_all_tokens_must_match_and_fields_are_weighted():
+    index = SearchIndex.build(QUESTIONS)
+    assert [d for d, _ in index.search("sentinel automation")] == [0, 1]  # question text outranks explanation
+    assert index.search("sentinel nrt") == []
+    assert index.search("the") == []
+
+
+def test_prefix_matching_and_backends_agree():
+    index = SearchIndex.build(QUESTIONS)
+    hits = [d for d, _ in index.search("autom")]
+    assert hits[0] == 0 and sorted(hits) == [0, 1, 2]
+    assert [d for d, _ in index.search("a")] == []  # too short for prefix matching
+    tokens = ["autom", "rul"]
+    fallback = index._search_dicts(tokens, 10)
+    assert [d for d, _ in fallback] == [0, 2]
+    np = pytest.importorskip("numpy")
+    assert [d for d, _ in index._search_numpy(np, tokens, 10)] == [d for d, _ in fallback]
+
+
+def test_index_is_stored_with_the_compiled_bank(tmp_path, monkeypatch):
+    monkeypatch.setattr(qb, 'get_storage_path', lambda name: str(tmp_path / name))
+    monkeypatch.setattr(search_index, '_indexes', {})
+    qb.clear_memory_cache()
+    path = tmp_path / 'bank.json'
+    path.write_text(json.dumps({"Topic 1": QUESTIONS}))
+    bank = qb.load_bank(str(path))
+    assert (tmp_path / search_index.index_path_for(str(path))).exists()
+
+    search_index._indexes.clear()
+    monkeypatch.setattr(SearchIndex, 'build', classmethod(lambda cls, qs: pytest.fail("index rebuilt")))
+    index = search_index.index_for(str(path), bank)
+    assert [d for d, _ in index.search("signinlogs")] == [1]
@@ -0,0 +1,76 @@
+"""Tests for session checkpoints and resuming a killed quiz
+Run:  pytest -q
+"""
+import random
+
+import progress_db
+from question_bank import QuestionBank
+from quiz_session import QuizSession
+from scheduler import Scheduler
+from session_checkpoint import SessionCheckpoint
+from utils import assign_question_ids
+
+QUESTIONS = assign_question_ids(
+    [{"question": f"Q{i}", "options": ["a", "b", "c"], "answer": ["A"]} for i in range(6)])
+
+
+def _answer(session, letters):
+    session.submit(set(letters))
+    session.advance()
+
+
+def test_checkpoint_records_order_and_answers(tmp_path):
+    bank = QuestionBank(QUESTIONS, 0, 0, 'digest')
+    checkpoint = SessionCheckpoint(str(tmp_path / 'cp.jsonl'))
+    session = QuizSession(Scheduler(QUESTIONS, rng=random.Random(1)), 4, bank=bank, bank_name='demo',
+                          checkpoint=checkpoint, seed=42)
+    _answer(session, 'A')
+    _answer(session, 'BC')
+    with open(checkpoint.path, 'a', encoding='utf-8') as f:
+        f.write('{"i": 2, "id"')  # torn write from a crash
+
+    state = SessionCheckpoint(checkpoint.path).load()
+    assert state['bank'] == 'demo' and state['seed'] == 42
+    assert state['ids'] == [q['id'] for q in session.questions]
+    assert [(a['ok'], a['sel']) for a in state['answers']] == [(1, 'A'), (0, 'BC')]
+
+    session.finish()
+    assert SessionCheckpoint(checkpoint.path).load() is None
+
+
+def test_resume_after_kill_replays_uncommitted_answers(tmp_path):
+    db = str(tmp_path / 'p.db')
+    bank = QuestionBank(QUESTIONS, 0, 0, 'digest')
+    checkpoint = SessionCheckpoint(str(tmp_path / 'cp.jsonl'))
+    repo = progress_db.ProgressRepository(db, batch_size=2)
+    session = QuizSession(Scheduler(QUESTIONS, rng=random.Random(1)), 5, bank=bank, repo=repo, bank_name='demo',
+                          checkpoint=checkpoint)
+    order = [q['id'] for q in session.questions]
+    for letters in ('A', 'A', 'B'):
+        _answer(session, letters)
+    repo.conn.close()  # killed: the third answer was still waiting for its batch
+
+    repo = progress_db.ProgressRepository(db)
+    state = SessionCheckpoint(checkpoint.path).load()
+    resumed = QuizSession.resume(state, Scheduler(QUESTIONS, repo.question_stats()), bank, repo=repo,
+                                 checkpoint=SessionCheckpoint(checkpoint.path))
+    assert [q['id'] for q in resumed.questions] == order
+    assert (resumed.index, resumed.correct_count, resumed.session_id) == (3, 2, session.session_id)
+    assert repo.session_answer_count(resumed.session_id) == 3
+    assert repo.question_stats()[order[2]]['correct'] == 0
+
+    _answer(resumed, 'A')
+    _answer(resumed, 'A')
+    assert resumed.finish()['correct'] == 4
+    assert repo.recent_sessions(1)[0]['total'] == 5
+    assert SessionCheckpoint(checkpoint.path).load() is None
+
+
+def test_resume_drops_questions_missing_from_the_bank(tmp_path):
+    checkpoint = SessionCheckpoint(str(tmp_path / 'cp.jsonl'))
+    session = QuizSession(Scheduler(QUESTIONS, rng=random.Random(1)), 3, bank=QuestionBank(QUESTIONS, 0, 0, 'd'),
+                          checkpoint=checkpoint)
+    _answer(session, 'A')
+    kept = [q for q in QUESTIONS if q['id'] != session.questions[2]['id']]
+    resumed = QuizSession.resume(checkpoint.load(), Scheduler(kept), QuestionBank(kept, 0, 0, 'd2'))
+    assert len(resumed) == 2 and resumed.index == 1 and resumed.correct_count == 1
@@ -0,0 +1,28 @@
+"""Tests for the startup timing report
+Run:  pytest -q
+"""
+import importlib
+
+import startup_profiler
+
+
+def test_report_written_once_all_phases_are_marked(tmp_path, monkeypatch):
+    prof = importlib.reload(startup_profiler)
+    path = tmp_path / 'startup_profile.jsonl'
+    monkeypatch.setattr(prof, 'write_report', lambda path=str(path), _w=prof.write_report: _w(path))
+
+    for phase in prof.REPORT_PHASES[:-1]:
+        prof.mark(phase)
+    assert not path.exists()
+    prof.mark('first_on_enter')  # repeated marks keep the first time
+    prof.mark(prof.REPORT_PHASES[-1])
+
+    reports = prof.load_reports(str(path))
+    assert len(reports) == 1
+    timings = reports[0]['phases_ms']
+    assert list(timings) == list(prof.REPORT_PHASES)
+    assert timings['imports'] <= timings['first_question_rendered']
+
+    # Only one line per launch, even if on_stop writes again
+    prof.write_report(str(path))
+    assert len(prof.load_reports(str(path))) == 1
@@ -0,0 +1,23 @@
+"""Tests for the synthetic bank generator used by the benchmarks
+Run:  pytest -q
+"""
+from answer_keys import compile_answer_key, YES_NO
+from benchmarks.synthetic import generate_bank, write_bank
+from utils import load_json
+
+
+def test_generated_items_cover_every_kind_and_have_gradeable_keys():
+    bank = generate_bank(400, seed=3)
+    questions = [q for items in bank.values() for q in items]
+    assert len(questions) == 400
+    keys = [compile_answer_key(q) for q in questions]
+    assert all(k.code != -1 for k in keys)
+    assert any(k.kind == YES_NO for k in keys)
+    assert any(q['type'] == 'drag_and_drop' for q in questions)
+    assert any('image' in q for q in questions)
+    assert generate_bank(50, seed=3) == generate_bank(50, seed=3)
+
+
+def test_written_bank_loads_with_unique_ids(tmp_path):
+    questions = load_json(write_bank(str(tmp_path / 'bank.json'), 250))
+    assert len({q['id'] for q in questions}) == 250
@@ -0,0 +1,49 @@
+"""Tests for topic-aware question sampling
+Run:  pytest -q
+"""
+import json
+import random
+
+import question_bank as qb
+from topic_sampler import allocate, sample_topics, parse_quotas
+
+SIZES = {"T1": 50, "T2": 30, "T3": 20, "T4": 4}
+
+
+def test_quota_then_rest_proportional():
+    plan = allocate(SIZES, 30, quotas={"T3": 10})
+    assert plan["T3"] == 10 and sum(plan.values()) == 30
+    assert plan["T1"] > plan["T2"] > plan["T4"]
+
+
+def test_full_topics_hand_their_share_to_others():
+    assert allocate({"A": 2, "B": 100}, 10, weights={"A": 9, "B": 1}) == {"A": 2, "B": 8}
+    assert allocate(SIZES, 500) == SIZES
+    assert allocate(SIZES, 5, quotas={"T4": 99}) == {"T4": 4, "T1": 1}
+
+
+def test_sample_is_unique_within_topics_and_can_prefer_due():
+    topics = {"A": list(range(0, 1000)), "B": list(range(1000, 1100))}
+    picked = sample_topics(topics, 20, quotas={"B": 5}, rng=random.Random(0))
+    assert len(picked) == len(set(picked)) == 20
+    assert sum(i >= 1000 for i in picked) == 5
+
+    due = sample_topics({"A": list(range(100))}, 5, rng=random.Random(1), rank=lambda i: i, oversample=20)
+    assert sorted(due) == [0, 1, 2, 3, 4]
+
+
+def test_parse_quotas_by_name_or_position(capsys):
+    names = ["Topic 1", "Topic 2", "Topic 3"]
+    assert parse_quotas("topic 3=10, 1:5; nope=2", names) == {"Topic 3": 10, "Topic 1": 5}
+    assert "unknown topic" in capsys.readouterr().out
+
+
+def test_bank_keeps_topic_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(qb, 'get_storage_path', lambda name: str(tmp_path / name))
+    qb.clear_memory_cache()
+    path = tmp_path / 'bank.json'
+    path.write_text(json.dumps({"T1": [{"question": "a"}, {"question": "b"}], "T2": [{"question": "c", "topic": "Own"}]}))
+    bank = qb.load_bank(str(path))
+    assert bank.topics == {"T1": [0, 1], "Own": [2]}
+    qb.clear_memory_cache()
+    assert qb.load_bank(str(path)).topics == bank.topics  # from the compiled cache
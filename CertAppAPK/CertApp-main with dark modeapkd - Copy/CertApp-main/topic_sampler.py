@@ -0,0 +1,91 @@
+# File: topic_sampler.py
+import random
+import re
+
+
+def allocate(sizes, k, quotas=None, weights=None):
+    """
+    Splits k questions over topics. `sizes` maps topic -> questions available.
+    Topics in `quotas` get that many (capped by their size); the rest of k is
+    shared by the other topics in proportion to `weights` (default: their sizes)
+    by largest remainder, re-sharing whatever a full topic cannot take.
+    Returns {topic: count}. Cost depends on the number of topics, not questions.
+    """
+    quotas = quotas or {}
+    counts = {t: min(max(int(n), 0), sizes.get(t, 0)) for t, n in quotas.items() if t in sizes}
+    remaining = k - sum(counts.values())
+    weight = weights or sizes
+
+    def room(t):
+        return sizes[t] - counts.get(t, 0)
+
+    free = [t for t in sizes if t not in quotas and room(t) > 0 and weight.get(t, 0) > 0]
+    while remaining > 0 and free:
+        total = sum(weight[t] for t in free)
+        shares = {t: remaining * weight[t] / total for t in free}
+        give = {t: min(int(shares[t]), room(t)) for t in free}
+        left = remaining - sum(give.values())
+        for t in sorted(free, key=lambda t: shares[t] - int(shares[t]), reverse=True):
+            if left <= 0:
+                break
+            if give[t] < room(t):
+                give[t] += 1
+                left -= 1
+        given = sum(give.values())
+        if not given:
+            break
+        for t, n in give.items():
+            counts[t] = counts.get(t, 0) + n
+        remaining -= given
+        free = [t for t in free if room(t) > 0]
+    return {t: n for t, n in counts.items() if n > 0}
+
+
+def sample_topics(topics, k, quotas=None, weights=None, rng=None, rank=None, oversample=3):
+    """
+    Draws up to k question indices from `topics` ({topic: [question indices]})
+    following allocate(). Each topic is drawn with random.sample over its index
+    list, so the cost grows with k, not with the bank. With `rank` (index -> sort
+    key, e.g. the scheduler's due time) up to `oversample` times as many candidates
+    are drawn per topic and the lowest ranked are kept, favouring due questions
+    without scanning whole topics. The result is shuffled.
+    """
+    rng = rng or random.Random()
+    plan = allocate({t: len(idx) for t, idx in topics.items()}, k, quotas, weights)
+    picked = []
+    for topic, n in plan.items():
+        indices = topics[topic]
+        if rank is None:
+            picked.extend(rng.sample(indices, n))
+        else:
+            candidates = rng.sample(indices, min(len(indices), n * oversample))
+            candidates.sort(key=rank)
+            picked.extend(candidates[:n])
+    rng.shuffle(picked)
+    return picked
+
+
+def parse_quotas(text, topic_names):
+    """
+    Parses quotas typed by the user, such as "Topic 3=10, 2:5". A topic is named
+    in full (case-insensitive) or by its 1-based position in `topic_names`.
+    Unknown topics are reported and ignored. Returns {topic: count}.
+    """
+    quotas = {}
+    by_name = {str(t).strip().lower(): t for t in topic_names}
+    for part in re.split(r'[,;\n]+', text or ''):
+        if not part.strip():
+            continue
+        m = re.match(r'^\s*(.+?)\s*[=:]\s*(\d+)\s*$', part)
+        if not m:
+            print(f"Ignoring topic quota '{part.strip()}' (use Topic=count)")
+            continue
+        name, count = m.group(1), int(m.group(2))
+        topic = by_name.get(name.lower())
+        if topic is None and name.isdigit() and 1 <= int(name) <= len(topic_names):
+            topic = topic_names[int(name) - 1]
+        if topic is None:
+            print(f"Ignoring quota for unknown topic '{name}'")
+            continue
+        quotas[topic] = count
+    return quotas
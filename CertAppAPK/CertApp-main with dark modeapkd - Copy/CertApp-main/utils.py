@@ -1,9 +1,9 @@
 # File: utils.py
 import os
-import json
 import re
+import json
+import hashlib
 from typing import Iterable, List, Set, Tuple
-from kivy.resources import resource_find, resource_add_path
 
 
 def get_storage_path(filename):
@@ -26,40 +26,295 @@ def load_json(filepath):
     - Standard JSON arrays or dicts (topic->list). Dicts are flattened into one list.
     - Newline-separated JSON dicts (legacy/incorrect files).
     Returns a list of question objects (even if only one or none).
+    Question objects are stamped with a stable 'id' (see question_id).
+    """
+    return assign_question_ids([item for _, item in iter_json_items(filepath)])
+
+
+# Fields of a question object that hold lists; a top-level key with any other
+# list-of-objects value is treated as a topic and streamed item by item.
+_QUESTION_LIST_FIELDS = ('options', 'answer', 'answers')
+_WHITESPACE = ' \t\r\n'
+# Characters a JSON number can continue with after a chunk boundary (12|.5, 1|e-3)
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+_decoder = json.JSONDecoder()
+
+
+class _JsonStream:
+    """
+    A text file read in fixed-size chunks for incremental `raw_decode` parsing.
+    Only the unconsumed tail of the buffer is kept, so memory stays around one
+    chunk plus the largest single value.
+    """
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        data = self.f.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += data
+        return True
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it ('' at the end)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, ch):
+        found = self.peek()
+        if found != ch:
+            raise ValueError(f"expected {ch!r}, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decodes one complete JSON value, reading more of the file as needed."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number whose tail runs to the buffer edge may continue in the next chunk
+            if (isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                    and _NUMBER_TAIL.match(self.buf, end).end() == len(self.buf) and self._fill()):
+                continue
+            self.pos = end
+            return obj
+
+    def skip_to_next_line_object(self):
+        """After a parse error, resumes at the next object that starts a line."""
+        while True:
+            i = self.buf.find('\n{', self.pos + 1)
+            if i >= 0:
+                self.pos = i + 1
+                return True
+            self.pos = max(self.pos, len(self.buf) - 1)
+            if not self._fill():
+                return False
+
+
+def _iter_array_rest(stream):
+    """Yields the values of an array whose '[' was already consumed."""
+    if stream.peek() == ']':
+        stream.pos += 1
+        return
+    while True:
+        yield stream.value()
+        ch = stream.peek()
+        stream.pos += 1
+        if ch == ']':
+            return
+        if ch != ',':
+            raise ValueError(f"expected ',' or ']' in array, found {ch!r}")
+
+
+def _iter_object(stream):
+    """
+    Parses a top-level object. Arrays of objects under non-question keys are
+    streamed as (topic, item) pairs as soon as each item is complete. Everything
+    else is collected; at the end the object is either one question (it has a
+    'question' key) or a topic dict whose remaining values are flattened.
+    """
+    stream.expect('{')
+    collected = {}
+    if stream.peek() == '}':
+        stream.pos += 1
+        return
+    while True:
+        key = stream.value()
+        stream.expect(':')
+        if stream.peek() == '[':
+            stream.pos += 1
+            if stream.peek() == '{' and key not in _QUESTION_LIST_FIELDS:
+                for item in _iter_array_rest(stream):
+                    yield key, item
+            else:
+                collected[key] = list(_iter_array_rest(stream))
+        else:
+            collected[key] = stream.value()
+        ch = stream.peek()
+        stream.pos += 1
+        if ch == '}':
+            break
+        if ch != ',':
+            raise ValueError(f"expected ',' or '}}' in object, found {ch!r}")
+    if 'question' in collected:
+        yield None, collected
+        return
+    for key, value in collected.items():
+        if isinstance(value, list):
+            for item in value:
+                yield key, item
+        else:
+            yield key, value
+
+
+def iter_json_items(filepath, chunk_size=1 << 16):
+    """
+    Streams the items of a question file as (topic, item) pairs without reading
+    the whole file at once. Handles JSON arrays, topic dicts ({"Topic 1": [...]}),
+    and concatenated/newline-separated objects (legacy files). `topic` is None
+    when the file has no topic names. Unparseable objects are reported and skipped.
     """
     if not os.path.exists(filepath):
-        return []
+        return
     with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read().strip()
+        stream = _JsonStream(f, chunk_size)
+        count = 0
+        while True:
+            ch = stream.peek()
+            if not ch:
+                return
+            try:
+                if ch == '[':
+                    stream.pos += 1
+                    for item in _iter_array_rest(stream):
+                        count += 1
+                        yield None, item
+                elif ch == '{':
+                    for topic, item in _iter_object(stream):
+                        count += 1
+                        yield topic, item
+                else:
+                    item = stream.value()
+                    count += 1
+                    yield None, item
+            except ValueError as e:
+                print(f"Error parsing JSON object #{count+1} in '{filepath}': {e}")
+                if not stream.skip_to_next_line_object():
+                    return
+
+
+def scan_topics(filepath, chunk_size=1 << 16):
+    """
+    Lists the topics of a question file as (topic, question count) pairs without
+    keeping any question in memory. Files that are not a topic dict give a single
+    (None, count) entry.
+    """
+    topics = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f, chunk_size)
         try:
-            data = json.loads(content)
-            if isinstance(data, dict):
-                flattened = []
-                for value in data.values():
-                    if isinstance(value, list):
-                        flattened.extend(value)
+            if stream.peek() == '{':
+                stream.pos += 1
+                while stream.peek() not in ('}', ''):
+                    key = stream.value()
+                    if key == 'question':
+                        break  # a bare question object, not a topic dict
+                    stream.expect(':')
+                    if stream.peek() == '[' and key not in _QUESTION_LIST_FIELDS:
+                        stream.pos += 1
+                        count = sum(1 for item in _iter_array_rest(stream)
+                                    if isinstance(item, dict) and 'question' in item)
+                        topics.append((key, count))
                     else:
-                        flattened.append(value)
-                return flattened
-            return data if isinstance(data, list) else [data]
-        except Exception:
-            # Handle legacy files with newline-separated dicts
-            pattern = r'\{.*?\}(?=\s*\{|\s*$)'
-            items = re.findall(pattern, content, flags=re.DOTALL)
-            result = []
-            for i, item in enumerate(items):
-                try:
-                    result.append(json.loads(item))
-                except Exception as e:
-                    print(f"Error parsing JSON object #{i+1} in '{filepath}': {e}")
-            return result
+                        stream.value()
+                    if stream.peek() == ',':
+                        stream.pos += 1
+                else:
+                    if stream.peek() == '}':
+                        stream.pos += 1
+                    if not stream.peek():
+                        return topics
+        except ValueError:
+            pass
+    # Arrays, legacy newline-separated objects and damaged files: count by streaming
+    return [(None, sum(1 for _ in iter_questions(filepath, chunk_size)))]
+
+
+def iter_questions(filepath, chunk_size=1 << 16):
+    """
+    Streams question dicts (stamped with ids) from a question file, one at a time.
+    Questions from a topic dict also get a 'topic' (unless they name their own).
+    """
+    for topic, item in iter_json_items(filepath, chunk_size):
+        if isinstance(item, dict) and 'question' in item:
+            assign_question_ids((item,))
+            if topic is not None:
+                item.setdefault('topic', topic)
+            yield item
 
 
 def save_json(filepath, data):
-    """Saves a Python object as pretty-printed UTF-8 JSON. Creates dirs if needed."""
+    """
+    Saves a Python object as pretty-printed UTF-8 JSON. Creates dirs if needed.
+    Writes a temp file, fsyncs it and replaces the original, so a kill mid-write
+    leaves either the old or the new file, never a truncated one.
+    """
     os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    tmp = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def assign_question_ids(items):
+    """Sets 'id' on every question dict that lacks one. Other items are left untouched."""
+    for item in items:
+        if isinstance(item, dict) and 'question' in item and item.get('id') in (None, ''):
+            item['id'] = question_id(item)
+    return items
+
+
+def find_duplicate_questions(questions):
+    """
+    Groups questions that share an id. Returns (duplicates, collisions): lists of
+    index lists where the questions are identical copies, or where the same id is
+    used for different content (e.g. a reused explicit id).
+    """
+    positions = {}
+    for i, q in enumerate(questions):
+        positions.setdefault(question_id(q), []).append(i)
+    duplicates, collisions = [], []
+    for qid, idxs in positions.items():
+        if len(idxs) < 2:
+            continue
+        contents = {_content_hash(questions[i]) for i in idxs}
+        (duplicates if len(contents) == 1 else collisions).append(idxs)
+    return duplicates, collisions
+
+
+def _content_hash(q):
+    answer = q.get('answer') or q.get('answers')
+    payload = json.dumps([q.get('question', ''), q.get('options', []), answer], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def question_id(q):
+    """
+    Returns a stable identifier for a question dict: its explicit 'id' if present,
+    otherwise a short content hash of the question text, options and answer.
+    """
+    explicit = q.get('id')
+    if explicit not in (None, ''):
+        return str(explicit)
+    return _content_hash(q)
 
 
 # ---------------------------
@@ -73,6 +328,8 @@ def _letters_map(n: int):
 def normalize_mc_answer_to_letters(options: List[str], answer: Iterable) -> Set[str]:
     """Normalize an answer spec to a set of letters, e.g., {'A','C'}.
     Accepts answers as letters (A/B/…), letter+punct ("A:"/"A."), or full option text.
+    Exact option text wins over a leading letter, and a letter only counts when it is
+    alone or followed by '.', ':', ')' or a space ("Disable Y" is not letter D).
     """
     if answer is None:
         return set()
@@ -89,19 +346,14 @@ def normalize_mc_answer_to_letters(options: List[str], answer: Iterable) -> Set[
         s = str(raw).strip()
         if not s:
             continue
-        # Case 1: starts with a letter (A/B/…) possibly followed by ':' or '.'
-        first = s[0].upper()
-        if first in letter_to_index:
-            letters.add(first)
-            continue
-        # Case 2: exact option text
+        # Case 1: exact option text (checked first: "Disable Y" is an option, not letter D)
         if s in option_to_letter:
             letters.add(option_to_letter[s])
             continue
-        # Case 3: token like "A:" or "A." at start
-        token = s.split()[0].rstrip('.:').upper()
-        if token in letter_to_index:
-            letters.add(token)
+        # Case 2: a letter alone or followed by punctuation/space ("A", "A:", "A.", "A. text")
+        first = s[0].upper()
+        if first in letter_to_index and (len(s) == 1 or s[1] in '.:) '):
+            letters.add(first)
             continue
     return letters
 